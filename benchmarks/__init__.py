@@ -0,0 +1 @@
+"""Performance benchmarks for foil, run with python -m benchmarks.<name>."""
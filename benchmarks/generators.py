@@ -0,0 +1,138 @@
+"""Deterministic synthetic delimited data for benchmarks.
+
+A DataSpec names a table shape: narrow or wide, quoted or unquoted
+text, and numeric or date heavy columns. The same spec, row count and
+seed always produce byte identical files.
+"""
+
+import csv
+import os
+import random
+import zipfile
+from collections import namedtuple
+from datetime import date, timedelta
+
+from foil.parsers import passthrough, parse_float, parse_int, parse_iso_date
+
+
+WIDTHS = {'narrow': 5, 'wide': 50}
+
+# Column kinds cycled across the table for each content mix.
+CONTENT_KINDS = {
+    'numeric': ('text', 'int', 'float', 'float', 'int'),
+    'date': ('text', 'date', 'date', 'int', 'date'),
+}
+
+CONVERTERS = {
+    'text': passthrough,
+    'int': parse_int,
+    'float': parse_float,
+    'date': parse_iso_date,
+}
+
+START_DATE = date(2000, 1, 1)
+WORDS = ('alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf',
+         'hotel, inc', 'india', 'juliet')
+
+
+class DataSpec(namedtuple('DataSpec', ['width', 'quoting', 'content'])):
+    """Shape of a synthetic table.
+
+    Parameters
+    ----------
+    width: 'narrow' or 'wide'.
+    quoting: 'quoted' quotes every field, 'unquoted' only fields that
+      contain the delimiter.
+    content: 'numeric' or 'date' heavy column mix.
+    """
+
+    __slots__ = ()
+
+    @property
+    def kinds(self) -> list:
+        kinds = CONTENT_KINDS[self.content]
+        return [kinds[i % len(kinds)] for i in range(WIDTHS[self.width])]
+
+    @property
+    def fields(self) -> list:
+        return ['{}_{}'.format(kind, i) for i, kind in enumerate(self.kinds)]
+
+    @property
+    def converters(self) -> list:
+        return [CONVERTERS[kind] for kind in self.kinds]
+
+    @property
+    def dialect(self):
+        return QuotedDialect if self.quoting == 'quoted' else csv.excel
+
+    @property
+    def name(self) -> str:
+        return '-'.join(self)
+
+
+class QuotedDialect(csv.excel):
+    quoting = csv.QUOTE_ALL
+
+
+def generate_rows(spec: DataSpec, row_count: int, seed=0):
+    """Yield rows of text values for a spec."""
+
+    rng = random.Random(seed)
+    makers = [VALUE_MAKERS[kind] for kind in spec.kinds]
+
+    for _ in range(row_count):
+        yield [make_value(rng) for make_value in makers]
+
+
+VALUE_MAKERS = {
+    'text': lambda rng: rng.choice(WORDS),
+    'int': lambda rng: str(rng.randrange(-10 ** 6, 10 ** 6)),
+    'float': lambda rng: '{:.4f}'.format(rng.uniform(-1000, 1000)),
+    'date': lambda rng: (START_DATE + timedelta(days=rng.randrange(10000))).isoformat(),
+}
+
+
+def write_delimited(path, spec: DataSpec, row_count: int, seed=0,
+                    encoding='utf-8'):
+    """Write a header and generated rows to a delimited text file."""
+
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f, dialect=spec.dialect)
+        writer.writerow(spec.fields)
+        writer.writerows(generate_rows(spec, row_count, seed))
+
+    return path
+
+
+def write_zipfile(path, filename, source_path):
+    """Archive a file as a single deflated zip member."""
+
+    with zipfile.ZipFile(path, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(source_path, filename)
+
+    return path
+
+
+def data_file(directory, spec: DataSpec, row_count: int, container='plain',
+              seed=0):
+    """Path to a generated file, written once per directory.
+
+    container: 'plain' for a text file, 'zip' for a zip archive whose
+      single member is named data.csv.
+    """
+
+    text_path = os.path.join(directory, '{}-{}-{}.csv'.format(
+        spec.name, row_count, seed))
+
+    if not os.path.exists(text_path):
+        write_delimited(text_path, spec, row_count, seed)
+
+    if container == 'plain':
+        return text_path
+
+    zip_path = text_path[:-len('.csv')] + '.zip'
+
+    if not os.path.exists(zip_path):
+        write_zipfile(zip_path, 'data.csv', text_path)
+
+    return zip_path
@@ -0,0 +1,76 @@
+"""asv-style benchmark suites for foil.parsers.
+
+BrokenJSONSuite compares parse_broken_json with the YAML based parsing
+it replaced, on generated payloads of unquoted keys. The YAML benchmark
+is skipped when pyyaml is not installed.
+"""
+
+import io
+import random
+
+from benchmarks.readers import row_count
+from foil.parsers import iter_broken_json, parse_broken_json
+
+try:
+    import yaml
+except ImportError:  # pyyaml is not a foil requirement
+    yaml = None
+
+
+WORDS = ('alpha', 'bravo', 'charlie', 'delta', 'echo')
+
+
+def broken_json_record(rng) -> str:
+    return ("{{id:{}, name:'{}', price:{:.2f}, active:true, "
+            "url:'http://example.com:8080/{}', tags:['{}', '{}',],}}").format(
+        rng.randrange(10 ** 6), rng.choice(WORDS), rng.uniform(0, 1000),
+        rng.randrange(1000), rng.choice(WORDS), rng.choice(WORDS))
+
+
+def broken_json_payload(records: int, seed=0) -> str:
+    """Array of records with unquoted keys, single quotes and trailing commas."""
+
+    rng = random.Random(seed)
+
+    return '{{data:[{}],}}'.format(', '.join(
+        broken_json_record(rng) for _ in range(records)))
+
+
+def parse_yaml(json_text):
+    """parse_broken_json as implemented with YAML."""
+
+    return yaml.safe_load(json_text.replace(':', ': '))
+
+
+class BrokenJSONSuite:
+    params = (['parse', 'stream', 'yaml'],)
+    param_names = ['method']
+
+    def setup(self, method):
+        if method == 'yaml' and yaml is None:
+            raise NotImplementedError('pyyaml is not installed')
+
+        # YAML is orders of magnitude slower, keep its payload small.
+        self.rows = row_count() // (100 if method == 'yaml' else 1)
+        self.text = broken_json_payload(self.rows)
+        self.lines = '\n'.join(broken_json_record(random.Random(seed))
+                               for seed in range(self.rows))
+        self.bytes = len(self.text.encode('utf-8'))
+
+    def parse(self, method):
+        if method == 'parse':
+            parse_broken_json(self.text)
+        elif method == 'stream':
+            for _ in iter_broken_json(io.StringIO(self.lines)):
+                pass
+        else:
+            parse_yaml(self.text)
+
+    def time_parse(self, method):
+        self.parse(method)
+
+    def peakmem_parse(self, method):
+        self.parse(method)
+
+
+SUITES = [BrokenJSONSuite]
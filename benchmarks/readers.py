@@ -0,0 +1,211 @@
+"""asv-style benchmark suites for foil.fileio readers.
+
+Each suite class declares params and param_names; setup receives one
+combination of params. Methods prefixed time_ are timed and methods
+prefixed peakmem_ are measured for peak memory. Suites also set rows
+and bytes in setup so runners can report throughput.
+
+Generated files are cached in FOIL_BENCHMARK_DATA, a foil-benchmarks
+temp directory by default, with FOIL_BENCHMARK_ROWS rows.
+"""
+
+import os
+import tempfile
+
+from benchmarks.generators import DataSpec, data_file
+from foil.fileio import (DelimitedReader, DelimitedSubsetReader, MappedTextReader,
+                         TextReader, ZipReader, concatenate_streams)
+
+
+DEFAULT_ROWS = 50000
+ENCODING = 'utf-8'
+
+WIDTHS = ['narrow', 'wide']
+QUOTINGS = ['unquoted', 'quoted']
+CONTENTS = ['numeric', 'date']
+
+SUBSET_INDEX = {'narrow': [0, 3], 'wide': [0, 12, 25, 48]}
+
+
+def row_count() -> int:
+    return int(os.environ.get('FOIL_BENCHMARK_ROWS', DEFAULT_ROWS))
+
+
+def data_directory() -> str:
+    directory = os.environ.get('FOIL_BENCHMARK_DATA') or os.path.join(
+        tempfile.gettempdir(), 'foil-benchmarks')
+    os.makedirs(directory, exist_ok=True)
+
+    return directory
+
+
+def consume(iterable):
+    for _ in iterable:
+        pass
+
+
+class FileSuite:
+    """Suite reading a single generated file."""
+
+    container = 'plain'
+
+    def make_file(self, spec: DataSpec):
+        self.spec = spec
+        self.rows = row_count()
+        self.path = data_file(data_directory(), spec, self.rows, self.container)
+        self.bytes = os.path.getsize(self.path)
+
+
+class TextReaderSuite(FileSuite):
+    params = (WIDTHS, QUOTINGS)
+    param_names = ['width', 'quoting']
+
+    def setup(self, width, quoting):
+        self.make_file(DataSpec(width, quoting, 'numeric'))
+
+    def time_iterate(self, width, quoting):
+        consume(TextReader(self.path, ENCODING))
+
+    def peakmem_iterate(self, width, quoting):
+        consume(TextReader(self.path, ENCODING))
+
+
+class DelimitedReaderSuite(FileSuite):
+    params = (WIDTHS, QUOTINGS, CONTENTS)
+    param_names = ['width', 'quoting', 'content']
+
+    def setup(self, width, quoting, content):
+        self.make_file(DataSpec(width, quoting, content))
+
+    def read(self):
+        spec = self.spec
+
+        with open(self.path, 'r', encoding=ENCODING, newline='') as stream:
+            consume(DelimitedReader(stream, spec.dialect, spec.fields,
+                                    spec.converters))
+
+    def time_read(self, width, quoting, content):
+        self.read()
+
+    def peakmem_read(self, width, quoting, content):
+        self.read()
+
+
+class BatchReaderSuite(FileSuite):
+    """Columnar batches against the Records they replace."""
+
+    params = (WIDTHS, CONTENTS)
+    param_names = ['width', 'content']
+    batch_size = 10000
+
+    def setup(self, width, content):
+        self.make_file(DataSpec(width, 'unquoted', content))
+
+    def reader(self, stream):
+        spec = self.spec
+        return DelimitedReader(stream, spec.dialect, spec.fields, spec.converters)
+
+    def time_records(self, width, content):
+        with open(self.path, 'r', encoding=ENCODING, newline='') as stream:
+            consume(self.reader(stream))
+
+    def time_batches(self, width, content):
+        with open(self.path, 'r', encoding=ENCODING, newline='') as stream:
+            consume(self.reader(stream).iter_batches(self.batch_size))
+
+
+class MappedReaderSuite(FileSuite):
+    """Memory mapped reads against the buffered file reads they replace."""
+
+    params = (WIDTHS, QUOTINGS)
+    param_names = ['width', 'quoting']
+
+    def setup(self, width, quoting):
+        self.make_file(DataSpec(width, quoting, 'numeric'))
+
+    def time_text_reader(self, width, quoting):
+        consume(TextReader(self.path, ENCODING))
+
+    def time_mapped_text_reader(self, width, quoting):
+        consume(MappedTextReader(self.path, ENCODING))
+
+    def time_from_file(self, width, quoting):
+        spec = self.spec
+        consume(DelimitedReader.from_file(self.path, ENCODING, spec.dialect,
+                                          spec.fields, spec.converters))
+
+    def time_from_mmap(self, width, quoting):
+        spec = self.spec
+        consume(DelimitedReader.from_mmap(self.path, ENCODING, spec.dialect,
+                                          spec.fields, spec.converters))
+
+
+class DelimitedSubsetReaderSuite(FileSuite):
+    params = (WIDTHS, QUOTINGS)
+    param_names = ['width', 'quoting']
+
+    def setup(self, width, quoting):
+        self.make_file(DataSpec(width, quoting, 'numeric'))
+        self.field_index = SUBSET_INDEX[width]
+
+    def read(self):
+        spec = self.spec
+        fields = [spec.fields[i] for i in self.field_index]
+        converters = [spec.converters[i] for i in self.field_index]
+
+        with open(self.path, 'r', encoding=ENCODING, newline='') as stream:
+            consume(DelimitedSubsetReader(stream, spec.dialect, fields,
+                                          converters, self.field_index))
+
+    def time_read(self, width, quoting):
+        self.read()
+
+    def peakmem_read(self, width, quoting):
+        self.read()
+
+
+class ZipReaderSuite(FileSuite):
+    container = 'zip'
+    params = (WIDTHS, QUOTINGS)
+    param_names = ['width', 'quoting']
+
+    def setup(self, width, quoting):
+        self.make_file(DataSpec(width, quoting, 'numeric'))
+
+    def time_readlines(self, width, quoting):
+        consume(ZipReader(self.path, 'data.csv').readlines(ENCODING))
+
+    def peakmem_readlines(self, width, quoting):
+        consume(ZipReader(self.path, 'data.csv').readlines(ENCODING))
+
+    def time_delimited(self, width, quoting):
+        spec = self.spec
+        consume(DelimitedReader.from_zipfile(self.path, 'data.csv', ENCODING,
+                                             spec.dialect, spec.fields,
+                                             spec.converters))
+
+
+class ConcatenateStreamsSuite:
+    params = ([1, 10],)
+    param_names = ['streams']
+
+    def setup(self, streams):
+        spec = DataSpec('narrow', 'unquoted', 'numeric')
+        self.rows = row_count()
+        self.paths = [data_file(data_directory(), spec, self.rows // streams,
+                                seed=seed) for seed in range(streams)]
+        self.bytes = sum(map(os.path.getsize, self.paths))
+
+    def read(self):
+        consume(concatenate_streams(TextReader(path, ENCODING)
+                                    for path in self.paths))
+
+    def time_concatenate(self, streams):
+        self.read()
+
+    def peakmem_concatenate(self, streams):
+        self.read()
+
+
+SUITES = [TextReaderSuite, DelimitedReaderSuite, BatchReaderSuite, MappedReaderSuite,
+          DelimitedSubsetReaderSuite, ZipReaderSuite, ConcatenateStreamsSuite]
@@ -0,0 +1,65 @@
+"""Benchmark compiled row converters against per-row generator conversion.
+
+Usage
+-----
+python -m benchmarks.row_converters [rows]
+"""
+
+import sys
+import time
+from collections import namedtuple
+
+from foil.compilers import compile_row_converter
+from foil.filters import create_indexer
+from foil.parsers import parse_float, parse_int, passthrough
+
+
+FIELDS = ['name', 'exchange', 'shares', 'price', 'notes']
+CONVERTERS = [passthrough, passthrough, parse_int, parse_float, passthrough]
+WIDE_INDEX = [0, 6, 12, 18, 24]
+
+
+def make_rows(row_count, width=len(FIELDS)):
+    row = ['ABC', 'NYSE', '100', '12.5', 'note'] * (width // len(FIELDS))
+    return [list(row) for _ in range(row_count)]
+
+
+def generator_reader(rows, field_index=None):
+    """Row conversion as previously performed by DelimitedReader.__next__."""
+
+    Record = namedtuple('Record', FIELDS)
+    indexer = create_indexer(field_index) if field_index else None
+
+    for row in rows:
+        row = indexer(row) if indexer else row
+        yield Record._make(type_converter(item) for type_converter, item
+                           in zip(CONVERTERS, row))
+
+
+def compiled_reader(rows, field_index=None):
+    _, convert_row = compile_row_converter(FIELDS, CONVERTERS, field_index)
+
+    return map(convert_row, rows)
+
+
+def rows_per_second(reader, rows):
+    start = time.perf_counter()
+    for _ in reader:
+        pass
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main(row_count=200000):
+    cases = [('all fields', make_rows(row_count), None),
+             ('field index', make_rows(row_count, width=25), WIDE_INDEX)]
+
+    for name, rows, field_index in cases:
+        before = rows_per_second(generator_reader(rows, field_index), rows)
+        after = rows_per_second(compiled_reader(rows, field_index), rows)
+
+        print('{:<12} generator {:>12,.0f} rows/sec  compiled {:>12,.0f} rows/sec'
+              '  speedup {:.2f}x'.format(name, before, after, after / before))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
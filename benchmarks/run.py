@@ -0,0 +1,183 @@
+"""Run asv-style benchmark suites and report results as JSON.
+
+Each result holds the best time over repeats, throughput in rows and
+bytes per second, and peak memory allocated by Python as measured by
+tracemalloc. Results from two foil versions are compared by key.
+
+Usage
+-----
+python -m benchmarks.run [--rows N] [--repeat N] [--match TEXT]
+                         [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from foil._version import __version__
+
+
+def iter_params(suite):
+    params = getattr(suite, 'params', ())
+
+    if params and not isinstance(params[0], (list, tuple)):
+        params = (params,)
+
+    return itertools.product(*params)
+
+
+def time_call(method, params, repeat) -> float:
+    """Best wall clock seconds of repeat calls."""
+
+    timings = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        method(*params)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def peak_memory(method, params) -> int:
+    """Peak bytes allocated during a call, as traced by tracemalloc."""
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        method(*params)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(suite, repeat=3, match=None):
+    """Yield a result dict per benchmark and combination of params."""
+
+    methods = sorted(name for name in dir(suite)
+                     if name.startswith(('time_', 'peakmem_')))
+
+    for params in iter_params(suite):
+        instance = suite()
+
+        try:
+            instance.setup(*params)
+        except NotImplementedError:  # asv convention for skipped params
+            continue
+        results = {}
+
+        for name in methods:
+            kind, benchmark = name.split('_', 1)
+            key = '{}.{}'.format(suite.__name__, benchmark)
+
+            if match and match not in key:
+                continue
+
+            result = results.setdefault(key, {
+                'benchmark': key,
+                'params': dict(zip(getattr(suite, 'param_names', ()), params)),
+            })
+            method = getattr(instance, name)
+
+            if kind == 'time':
+                seconds = time_call(method, params, repeat)
+                result['seconds'] = seconds
+                result['rows_per_second'] = getattr(instance, 'rows', 0) / seconds
+                result['bytes_per_second'] = getattr(instance, 'bytes', 0) / seconds
+            else:
+                result['peak_memory'] = peak_memory(method, params)
+
+        if hasattr(instance, 'teardown'):
+            instance.teardown(*params)
+
+        yield from results.values()
+
+
+def run(suites, repeat=3, match=None) -> dict:
+    return {
+        'foil_version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'rows': int(os.environ.get('FOIL_BENCHMARK_ROWS', 0)) or None,
+        'results': [result for suite in suites
+                    for result in run_suite(suite, repeat, match)],
+    }
+
+
+def result_key(result) -> tuple:
+    return result['benchmark'], tuple(sorted(result['params'].items()))
+
+
+def compare(baseline: dict, current: dict):
+    """Yield (benchmark, params, throughput ratio, memory ratio) of shared results."""
+
+    previous = {result_key(result): result for result in baseline['results']}
+
+    for result in current['results']:
+        before = previous.get(result_key(result))
+
+        if before is None:
+            continue
+
+        yield (result['benchmark'], result['params'],
+               _ratio(result.get('rows_per_second'), before.get('rows_per_second')),
+               _ratio(result.get('peak_memory'), before.get('peak_memory')))
+
+
+def format_result(result) -> str:
+    params = ' '.join('{}={}'.format(k, v) for k, v in result['params'].items())
+
+    return '{:<40} {:<36} {:>12,.0f} rows/s {:>8.1f} MB/s {:>8.1f} MB peak'.format(
+        result['benchmark'], params, result.get('rows_per_second', 0),
+        result.get('bytes_per_second', 0) / 1e6, result.get('peak_memory', 0) / 1e6)
+
+
+def main(argv=None):
+    from benchmarks import parsers, readers
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('--rows', type=int, help='rows per generated file')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--match', help='run benchmarks whose name contains text')
+    parser.add_argument('--output', help='write JSON results to path')
+    parser.add_argument('--compare', help='baseline JSON results to compare with')
+    args = parser.parse_args(argv)
+
+    if args.rows:
+        os.environ['FOIL_BENCHMARK_ROWS'] = str(args.rows)
+
+    results = run(readers.SUITES + parsers.SUITES, args.repeat, args.match)
+
+    for result in results['results']:
+        print(format_result(result))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        print('\nthroughput and peak memory relative to {}'.format(
+            baseline.get('foil_version')))
+        for benchmark, params, throughput, memory in compare(baseline, results):
+            print('{:<40} {:<36} {:>6.2f}x {:>6.2f}x'.format(
+                benchmark, ' '.join('{}={}'.format(*item) for item in params.items()),
+                throughput or 0, memory or 0))
+
+
+def _ratio(value, baseline):
+    return value / baseline if value and baseline else None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
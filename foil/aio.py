@@ -0,0 +1,187 @@
+"""Asyncio iterators over foil readers.
+
+Opening, decompressing and parsing run in an executor a batch of
+records at a time, so the event loop only hands out records that are
+already parsed. A producer task keeps at most read_ahead batches queued
+ahead of the consumer.
+
+Example
+-------
+async with AsyncDelimitedReader.from_file(path, 'utf-8', dialect,
+                                          fields, converters) as reader:
+    async for record in reader:
+        ...
+"""
+
+import asyncio
+from functools import partial
+from itertools import islice
+
+from foil.fileio import DelimitedReader, DelimitedSubsetReader
+
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_READ_AHEAD = 2
+
+_END = object()
+
+
+class AsyncReader:
+    """Async iterator over records of a synchronous reader.
+
+    Parameters
+    ----------
+    make_reader: callable returning the synchronous reader. It is called
+      in the executor, so files are also opened off the event loop.
+    batch_size: records read per executor call.
+    read_ahead: batches queued ahead of the consumer.
+    executor: concurrent.futures executor, the loop default executor if None.
+    """
+
+    def __init__(self, make_reader, batch_size=DEFAULT_BATCH_SIZE,
+                 read_ahead=DEFAULT_READ_AHEAD, executor=None):
+        self.make_reader = make_reader
+        self.batch_size = batch_size
+        self.read_ahead = read_ahead
+        self.executor = executor
+        self.queue = None
+        self.producer = None
+        self.batch = iter(())
+        self.done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        record = next(self.batch, _END)
+
+        while record is _END:
+            self.batch = iter(await self.next_batch())
+            record = next(self.batch, _END)
+
+        return record
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def next_batch(self) -> list:
+        """Next list of records read, raising StopAsyncIteration when exhausted."""
+
+        if self.done:
+            raise StopAsyncIteration
+
+        if self.producer is None:
+            self.queue = asyncio.Queue(self.read_ahead)
+            self.producer = asyncio.ensure_future(self._produce())
+
+        batch = await self.queue.get()
+
+        if batch is _END:
+            self.done = True
+            raise StopAsyncIteration
+
+        if isinstance(batch, BaseException):
+            self.done = True
+            raise batch
+
+        return batch
+
+    async def aclose(self):
+        """Stop reading ahead and close the reader."""
+
+        self.done = True
+
+        if self.producer is not None and not self.producer.done():
+            self.producer.cancel()
+            try:
+                await self.producer
+            except asyncio.CancelledError:
+                pass
+
+    async def _produce(self):
+        loop = asyncio.get_event_loop()
+        run = partial(loop.run_in_executor, self.executor)
+        reader = None
+
+        try:
+            reader = await run(self.make_reader)
+
+            while True:
+                batch = await run(_read_batch, reader, self.batch_size)
+
+                if not batch:
+                    break
+
+                await self.queue.put(batch)
+
+            await self.queue.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self.queue.put(exc)
+        finally:
+            if reader is not None:
+                await run(_close, reader)
+
+
+class AsyncDelimitedReader(AsyncReader):
+    """Async iterator over delimited text Records.
+
+    Factory methods mirror DelimitedReader; given a field_index they
+    read through DelimitedSubsetReader. Remaining options are passed to
+    the synchronous reader.
+    """
+
+    @classmethod
+    def from_file(cls, path, encoding, dialect, fields, converters,
+                  field_index=None, batch_size=DEFAULT_BATCH_SIZE,
+                  read_ahead=DEFAULT_READ_AHEAD, executor=None, **options):
+        """Read delimited text from a text file."""
+
+        return cls(_reader_factory('from_file', (path,), encoding, dialect, fields,
+                                   converters, field_index, options),
+                   batch_size, read_ahead, executor)
+
+    @classmethod
+    def from_compressed(cls, path, encoding, dialect, fields, converters,
+                        field_index=None, batch_size=DEFAULT_BATCH_SIZE,
+                        read_ahead=DEFAULT_READ_AHEAD, executor=None, **options):
+        """Read delimited text from a gzip, bz2, xz or uncompressed file."""
+
+        return cls(_reader_factory('from_compressed', (path,), encoding, dialect,
+                                   fields, converters, field_index, options),
+                   batch_size, read_ahead, executor)
+
+    @classmethod
+    def from_zipfile(cls, path, filename, encoding, dialect, fields, converters,
+                     field_index=None, batch_size=DEFAULT_BATCH_SIZE,
+                     read_ahead=DEFAULT_READ_AHEAD, executor=None, **options):
+        """Read delimited text from zipfile."""
+
+        return cls(_reader_factory('from_zipfile', (path, filename), encoding,
+                                   dialect, fields, converters, field_index, options),
+                   batch_size, read_ahead, executor)
+
+
+def _reader_factory(factory, source, encoding, dialect, fields, converters,
+                    field_index, options):
+    if field_index is None:
+        return partial(getattr(DelimitedReader, factory), *source, encoding,
+                       dialect, fields, converters, **options)
+    else:
+        return partial(getattr(DelimitedSubsetReader, factory), *source, encoding,
+                       dialect, fields, converters, field_index, **options)
+
+
+def _read_batch(reader, batch_size) -> list:
+    return list(islice(reader, batch_size))
+
+
+def _close(reader):
+    close = getattr(reader, 'close', None)
+
+    if close is not None:
+        close()
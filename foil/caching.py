@@ -0,0 +1,284 @@
+"""Persistent cache of parsed delimited records.
+
+Parsed rows are pickled in chunks to a cache file keyed by the source
+fingerprint and the reading schema. A source is fingerprinted by path,
+size and mtime for files, and by archive path, member name, size and
+CRC for zip members. Later reads of an unchanged source stream the
+unpickled rows instead of parsing the text again.
+
+Cache files are written to a temporary name and renamed once the
+source is read to the end, so partially read sources are never cached.
+The least recently used files are evicted once the cache directory
+exceeds its disk budget.
+"""
+
+import csv
+import os
+import pickle
+from functools import partial
+from hashlib import sha256
+from itertools import islice
+from types import ModuleType
+from zipfile import ZipFile
+
+from foil.categorical import Categorical
+from foil.compilers import compile_row_converter
+from foil.dates import DateTimeParser
+from foil.fileio import DelimitedReader, DelimitedSubsetReader
+from foil.filters import AttributeFilter
+from foil.parsers import passthrough
+
+
+DEFAULT_MAX_BYTES = 1 << 30
+CHUNK_ROWS = 10000
+CACHE_SUFFIX = '.records'
+
+# Values described by repr, which holds all of their state.
+SCALAR_TYPES = (str, bytes, int, float, range)
+
+
+def file_fingerprint(path) -> tuple:
+    """Path, size and modification time of a file."""
+
+    stat = os.stat(path)
+
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def zipfile_fingerprint(path, filename) -> tuple:
+    """Archive path, member name, size and CRC of a zip archive member."""
+
+    with ZipFile(path, mode='r') as archive:
+        info = archive.getinfo(filename)
+
+    return os.path.abspath(path), filename, info.file_size, info.CRC
+
+
+def describe(value):
+    """Stable description of a schema value for cache keys.
+
+    Functions are described by qualified name rather than identity, so
+    keys are the same across processes. Lambdas, nested functions,
+    closures and bound methods carry state a name does not identify, so
+    they raise TypeError rather than risk two schemas sharing a key, as
+    do other objects, such as callable instances, whose repr may hold a
+    memory address or leave out state.
+    """
+
+    if isinstance(value, partial):
+        return ('partial', describe(value.func), describe(value.args),
+                describe(sorted(value.keywords.items())))
+    if isinstance(value, Categorical):
+        return ('categorical', describe(value.converter))
+    if isinstance(value, DateTimeParser):
+        return ('datetime_parser', value.pattern.pattern, sorted(
+            (name, str(timezone)) for name, timezone in value.tz_mapper.items()))
+    if isinstance(value, AttributeFilter):
+        return ('filter', describe(value.keys), sorted(map(repr, value.predicates)))
+    if isinstance(value, (list, tuple)):
+        return tuple(map(describe, value))
+    if isinstance(value, type) and issubclass(value, csv.Dialect) or isinstance(
+            value, csv.Dialect):
+        return tuple(repr(getattr(value, attribute)) for attribute in (
+            'delimiter', 'quotechar', 'escapechar', 'doublequote',
+            'skipinitialspace', 'quoting'))
+    if callable(value) and hasattr(value, '__qualname__'):
+        if not _named_by_qualname(value):
+            raise TypeError('{!r} cannot be described by name'.format(value))
+        return '{}.{}'.format(value.__module__, value.__qualname__)
+    if value is None or isinstance(value, SCALAR_TYPES):
+        return repr(value)
+
+    raise TypeError('{!r} cannot be described by value'.format(value))
+
+
+def _named_by_qualname(function) -> bool:
+    qualname = function.__qualname__
+    owner = getattr(function, '__self__', None)
+
+    if '<lambda>' in qualname or '<locals>' in qualname:
+        return False
+    if getattr(function, '__closure__', None):
+        return False
+
+    return owner is None or isinstance(owner, (type, ModuleType))
+
+
+def cache_key(fingerprint, schema) -> str:
+    """Hex digest of a source fingerprint and reading schema."""
+
+    return sha256(repr((fingerprint, describe(schema))).encode('utf-8')).hexdigest()
+
+
+class RecordCache:
+    """Directory of pickled record chunks, evicted least recently used first.
+
+    Parameters
+    ----------
+    directory: cache directory, created when missing.
+    max_bytes: disk budget of the cache directory.
+    chunk_rows: rows pickled per chunk.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES,
+                 chunk_rows=CHUNK_ROWS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def get(self, key):
+        """Iterator of cached rows, None on a cache miss."""
+
+        path = self.path(key)
+
+        try:
+            file = open(path, 'rb')
+        except OSError:
+            return None
+
+        os.utime(path)
+
+        return self._load(file)
+
+    def rows(self, key, make_rows):
+        """Rows of a cached key, read from make_rows() and cached on a miss."""
+
+        rows = self.get(key)
+
+        if rows is None:
+            rows = self._store(key, make_rows())
+
+        return rows
+
+    def evict(self, keep=()):
+        """Remove least recently used files until within the disk budget."""
+
+        entries = []
+
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX) and name[:-len(CACHE_SUFFIX)] not in keep:
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries) + sum(
+            os.path.getsize(self.path(key)) for key in keep if key in self)
+
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+
+    def _load(self, file):
+        with file:
+            while True:
+                try:
+                    chunk = pickle.load(file)
+                except EOFError:
+                    return
+                yield from chunk
+
+    def _store(self, key, rows):
+        path = self.path(key)
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        rows = iter(rows)
+
+        with open(temp_path, 'wb') as file:
+            try:
+                while True:
+                    chunk = list(islice(rows, self.chunk_rows))
+                    if not chunk:
+                        break
+                    pickle.dump(chunk, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield from chunk
+            except BaseException:
+                file.close()
+                os.remove(temp_path)
+                raise
+
+        os.replace(temp_path, path)
+        self.evict(keep=(key,))
+
+
+def read_file_cached(cache: RecordCache, path, encoding, dialect, fields,
+                     converters, field_index=None, **options):
+    """Records of a delimited text file, served from cache when unchanged.
+
+    Options are passed to DelimitedReader, or DelimitedSubsetReader
+    when a field_index is given. Schemas describe cannot key, such as
+    lambda converters, are read without the cache.
+    """
+
+    def make_rows():
+        if field_index is None:
+            reader = DelimitedReader.from_file(path, encoding, dialect, fields,
+                                               converters, **options)
+        else:
+            reader = DelimitedSubsetReader.from_file(path, encoding, dialect, fields,
+                                                     converters, field_index,
+                                                     **options)
+        with reader:
+            yield from map(tuple, reader)
+
+    schema = (encoding, dialect, fields, converters, field_index,
+              sorted(options.items()))
+
+    return _records(_cached_rows(cache, file_fingerprint(path), schema, make_rows),
+                    fields, options.get('record_type', 'namedtuple'))
+
+
+def read_zipfile_cached(cache: RecordCache, path, filename, encoding, dialect,
+                        fields, converters, field_index=None, **options):
+    """Records of a delimited zip archive member, served from cache when unchanged."""
+
+    def make_rows():
+        if field_index is None:
+            reader = DelimitedReader.from_zipfile(path, filename, encoding, dialect,
+                                                  fields, converters, **options)
+        else:
+            reader = DelimitedSubsetReader.from_zipfile(
+                path, filename, encoding, dialect, fields, converters,
+                field_index, **options)
+        with reader:
+            yield from map(tuple, reader)
+
+    schema = (encoding, dialect, fields, converters, field_index,
+              sorted(options.items()))
+    rows = _cached_rows(cache, zipfile_fingerprint(path, filename), schema, make_rows)
+
+    return _records(rows, fields, options.get('record_type', 'namedtuple'))
+
+
+def _cached_rows(cache, fingerprint, schema, make_rows):
+    try:
+        key = cache_key(fingerprint, schema)
+    except TypeError:
+        return make_rows()
+
+    return cache.rows(key, make_rows)
+
+
+def _records(rows, fields, record_type):
+    _, make_record = compile_row_converter(fields, [passthrough] * len(fields),
+                                           record_type=record_type)
+
+    return map(make_record, rows)
@@ -0,0 +1,135 @@
+"""Dictionary encoding of low cardinality fields.
+
+A Categorical wraps a field converter so that each distinct raw value
+is converted once. Rows share one object per distinct value, and each
+value is assigned an integer code in first seen order, so columnar
+batches can hold codes plus a lookup table of categories.
+
+Example
+-------
+exchange = Categorical(parse_quoted_string)
+reader = DelimitedReader(stream, dialect, fields, [exchange, parse_float])
+...
+exchange.stats() -> CategoryStats(count=1000000, cardinality=12, bytes_saved=...)
+"""
+
+import sys
+from array import array
+from collections import namedtuple
+
+from foil.parsers import passthrough
+
+
+# Typecode of category codes, int32 as in Arrow dictionary arrays.
+CODE_TYPECODE = 'i'
+NULL_CODE = -1
+
+CategoryStats = namedtuple('CategoryStats', ['count', 'cardinality', 'bytes_saved'])
+
+
+class Categorical:
+    """Converter sharing one converted object per distinct raw value.
+
+    Parameters
+    ----------
+    converter: casting function applied once per distinct raw value.
+
+    Attributes
+    ----------
+    lookup: raw value to converted object.
+    codes: raw value to integer code.
+    categories: converted objects indexed by code.
+    count: values converted or encoded.
+    """
+
+    # Compiled row converters holding a Categorical are not cached.
+    stateful = True
+
+    def __init__(self, converter=passthrough):
+        self.converter = converter
+        self.lookup = {}
+        self.codes = {}
+        self.categories = []
+        self.count = 0
+
+    def __repr__(self):
+        return 'Categorical({!r})'.format(self.converter)
+
+    def __call__(self, value):
+        self.count += 1
+
+        try:
+            return self.lookup[value]
+        except KeyError:
+            return self.categories[self.add(value)]
+
+    def add(self, value) -> int:
+        """Convert a new raw value and return its code."""
+
+        code = self.codes.get(value)
+
+        if code is None:
+            code = len(self.categories)
+            converted = self.converter(value)
+            self.categories.append(converted)
+            self.lookup[value] = converted
+            self.codes[value] = code
+
+        return code
+
+    def encode(self, values) -> array:
+        """Integer codes of raw values, adding unseen values as categories."""
+
+        values = list(values)
+        self.count += len(values)
+
+        try:
+            return array(CODE_TYPECODE, map(self.codes.__getitem__, values))
+        except KeyError:
+            return array(CODE_TYPECODE, map(self.add, values))
+
+    @property
+    def cardinality(self) -> int:
+        return len(self.categories)
+
+    def stats(self) -> CategoryStats:
+        """Values seen, distinct values and estimated bytes saved.
+
+        Bytes saved estimates the memory of the objects each repeated
+        value would otherwise have had, using the mean size of the
+        categories.
+        """
+
+        cardinality = self.cardinality
+
+        if not cardinality:
+            return CategoryStats(self.count, 0, 0)
+
+        mean_size = sum(map(sys.getsizeof, self.categories)) / cardinality
+        repeats = max(self.count - cardinality, 0)
+
+        return CategoryStats(self.count, cardinality, int(repeats * mean_size))
+
+
+def categorize(fields, converters, categorical_fields) -> list:
+    """Wrap the converters of the named fields in Categorical.
+
+    Converters already wrapped are left as is.
+    """
+
+    categorical_fields = frozenset(categorical_fields)
+    unknown = categorical_fields.difference(fields)
+
+    if unknown:
+        raise ValueError('categorical fields not in fields: {}'.format(sorted(unknown)))
+
+    return [Categorical(converter)
+            if field in categorical_fields and not isinstance(converter, Categorical)
+            else converter for field, converter in zip(fields, converters)]
+
+
+def category_stats(fields, converters) -> dict:
+    """CategoryStats of each field with a Categorical converter."""
+
+    return {field: converter.stats() for field, converter in zip(fields, converters)
+            if isinstance(converter, Categorical)}
@@ -0,0 +1,298 @@
+"""Columnar parsing utilities for batch loading.
+
+Column parsers cast a sequence of raw text values into a typed
+``array.array`` buffer plus a null mask. Masks are byte strings where
+1 marks a null entry, following the masked array convention, and the
+value buffer holds a zero placeholder for each null.
+
+Array buffers expose the buffer protocol, so they can be handed to
+array libraries without copying, e.g.
+``numpy.frombuffer(column.values, dtype='int64')``.
+
+NumPy is optional. When installed, int, float and ISO date columns are
+parsed by NumPy, falling back to the Python parsers for any column
+NumPy rejects, so results do not depend on it.
+"""
+
+from array import array
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from functools import partial
+
+from foil.categorical import NULL_CODE, Categorical
+from foil.dates import DateTimeParser
+from foil.parsers import (boolean_strings, format_bool,
+                          format_iso_date, format_iso_datetime, parse_bool,
+                          parse_float, parse_int, parse_iso_date,
+                          parse_iso_datetime, passthrough)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+Column = namedtuple('Column', ['values', 'mask'])
+
+# Dictionary encoded column: int32 codes into a tuple of categories.
+CategoricalColumn = namedtuple('CategoricalColumn', ['values', 'mask', 'categories'])
+
+NULL_VALUES = frozenset(('', None))
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+EPOCH = datetime(1970, 1, 1)
+
+# Epoch days of the dates Python can represent.
+DAYS_RANGE = (date.min.toordinal() - EPOCH_ORDINAL, date.max.toordinal() - EPOCH_ORDINAL)
+
+# NumPy dtypes matching array typecodes.
+NUMPY_DTYPES = {'q': 'int64', 'd': 'float64'}
+
+
+BOOL_CODES = {k: int(bool(v)) for k, v in boolean_strings.items()}
+
+
+def null_mask(values) -> bytes:
+    """Byte mask flagging empty or missing values."""
+
+    if '' not in values and None not in values:
+        return bytes(len(values))
+
+    return bytes(map(NULL_VALUES.__contains__, values))
+
+
+def fill_nulls(values, mask: bytes, fill):
+    """Replace masked values with a fill value."""
+
+    if 1 not in mask:
+        return values
+
+    return [fill if null else value for value, null in zip(values, mask)]
+
+
+def numpy_parse(values, dtype):
+    """NumPy array of text values cast to dtype, None if NumPy rejects them."""
+
+    if numpy is None:
+        return None
+
+    try:
+        return numpy.array(values, dtype=dtype)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def parse_numeric_column(typecode, cast_function, values) -> Column:
+    dtype = NUMPY_DTYPES[typecode]
+    parsed = numpy_parse(values, dtype)
+
+    # NumPy rejects empty and missing values, so nothing is masked.
+    if parsed is not None:
+        return Column(array(typecode, parsed.tobytes()), bytes(len(values)))
+
+    mask = null_mask(values)
+    filled = fill_nulls(values, mask, '0')
+    parsed = numpy_parse(filled, dtype) if 1 in mask else None
+
+    if parsed is None:
+        return Column(array(typecode, map(cast_function, filled)), mask)
+
+    return Column(array(typecode, parsed.tobytes()), mask)
+
+
+# Numeric Column Parsers
+parse_int_column = partial(parse_numeric_column, 'q', int)
+parse_float_column = partial(parse_numeric_column, 'd', float)
+
+
+def parse_bool_column(values) -> Column:
+    """Boolean column as 0/1 int8 codes."""
+
+    return Column(array('b', map(BOOL_CODES.__getitem__, values)),
+                  null_mask(values))
+
+
+def parse_iso_date_column(values, parse=parse_iso_date) -> Column:
+    """Date column as days since 1970-01-01, matching datetime64[D].
+
+    Memoized parse functions keep their memo rather than parsing with NumPy.
+    """
+
+    days = numpy_parse_days(values) if parse is parse_iso_date else None
+
+    if days is not None:
+        return Column(days, bytes(len(values)))
+
+    mask = null_mask(values)
+    filled = fill_nulls(values, mask, '1970-01-01')
+    days = numpy_parse_days(filled) if parse is parse_iso_date and 1 in mask else None
+
+    if days is None:
+        days = array('q', (parse(value).toordinal() - EPOCH_ORDINAL
+                           for value in filled))
+
+    return Column(days, mask)
+
+
+def numpy_parse_days(values):
+    """Epoch days of YYYY-MM-DD values, None unless NumPy parses them all.
+
+    NumPy also reads signed years, partial dates and year 0, so only
+    10 character unsigned values within the range of date are kept.
+    """
+
+    if numpy is None or None in values:
+        return None
+
+    if set(map(len, values)) != {10} or '+' in ''.join(values):
+        return None
+
+    parsed = numpy_parse(values, 'datetime64[D]')
+
+    if parsed is None:
+        return None
+
+    days = parsed.view('int64')
+
+    if DAYS_RANGE[0] <= days.min() and days.max() <= DAYS_RANGE[1]:
+        return array('q', days.tobytes())
+
+    return None
+
+
+def parse_iso_datetime_column(values, parser=None) -> Column:
+    """Datetime column as microseconds since 1970-01-01, matching datetime64[us].
+
+    Zoned values are converted to UTC.
+    """
+
+    if parser is None:
+        parser = DateTimeParser()
+
+    mask = null_mask(values)
+
+    return Column(parser.parse_batch(fill_nulls(values, mask, '1970-01-01')), mask)
+
+
+def parse_text_column(values) -> Column:
+    return Column(list(values), null_mask(values))
+
+
+def parse_object_column(converter, values) -> Column:
+    """Fallback column parser applying a row converter to each value."""
+
+    converted = list(map(converter, values))
+    mask = bytes(value is None for value in converted)
+
+    return Column(converted, mask)
+
+
+def parse_categorical_column(categorical: Categorical, values) -> CategoricalColumn:
+    """Dictionary encoded column of codes, NULL_CODE where masked.
+
+    Codes are stable across batches of the same Categorical; categories
+    is a snapshot of its categories at the end of the batch.
+    """
+
+    mask = null_mask(values)
+    codes = categorical.encode(values)
+
+    if 1 in mask:
+        for i, null in enumerate(mask):
+            if null:
+                codes[i] = NULL_CODE
+
+    return CategoricalColumn(codes, mask, tuple(categorical.categories))
+
+
+def concat_columns(columns) -> Column:
+    """Join Columns of one field from consecutive rows.
+
+    Categorical columns keep the categories of the last column, which
+    hold those of the earlier ones.
+    """
+
+    values = columns[0].values[:0]
+
+    for column in columns:
+        values.extend(column.values)
+
+    mask = b''.join(column.mask for column in columns)
+
+    if isinstance(columns[0], CategoricalColumn):
+        return CategoricalColumn(values, mask, columns[-1].categories)
+
+    return Column(values, mask)
+
+
+COLUMN_PARSERS = {
+    passthrough: parse_text_column,
+    str: parse_text_column,
+    parse_int: parse_int_column,
+    parse_float: parse_float_column,
+    parse_bool: parse_bool_column,
+    parse_iso_date: parse_iso_date_column,
+}
+
+
+def make_column_parser(converter):
+    """Return the vectorized column parser for a row converter.
+
+    Memoized date converters from foil.parsers.memoize keep their memo,
+    and datetime converters keep their DateTimeParser, or get one of their
+    own, so columns of different layouts do not share a detected layout.
+    """
+
+    if getattr(converter, '__wrapped__', None) is parse_iso_date:
+        return partial(parse_iso_date_column, parse=converter)
+    if converter is parse_iso_datetime:
+        return partial(parse_iso_datetime_column, parser=DateTimeParser())
+    if isinstance(converter, partial) and converter.func is parse_iso_datetime:
+        return partial(parse_iso_datetime_column, **converter.keywords)
+    if isinstance(converter, Categorical):
+        return partial(parse_categorical_column, converter)
+
+    try:
+        return COLUMN_PARSERS[converter]
+    except (KeyError, TypeError):
+        return partial(parse_object_column, converter)
+
+
+def decode_date(days: int) -> date:
+    return date.fromordinal(days + EPOCH_ORDINAL)
+
+
+def decode_datetime(microseconds: int) -> datetime:
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+# Decoders from typed array storage back to Python objects, by formatter.
+COLUMN_DECODERS = {
+    format_bool: bool,
+    format_iso_date: decode_date,
+    format_iso_datetime: decode_datetime,
+}
+
+
+def column_values(column: Column, formatter=None) -> list:
+    """Python values of a Column, None where masked.
+
+    Typed arrays of bool codes, epoch days or epoch microseconds are
+    decoded for the bool, date and datetime formatters, and categorical
+    codes are looked up in their categories.
+    """
+
+    values = column.values
+
+    if isinstance(column, CategoricalColumn):
+        decode = column.categories.__getitem__
+    elif isinstance(values, array):
+        decode = COLUMN_DECODERS.get(formatter)
+    else:
+        decode = None
+
+    if decode is not None:
+        values = map(decode, values)
+
+    return fill_nulls(list(values), column.mask, None)
@@ -0,0 +1,169 @@
+"""Compile specialized row conversion functions for delimited readers.
+
+A row converter casts a tokenized row into a Record in a single call.
+A line splitter cuts a fixed-width byte line into decoded fields.
+Its source is generated per schema so that converters are unrolled,
+the field index is inlined as constant subscripts, and passthrough
+columns are copied without a function call.
+
+Example generated source for fields (a, b) converters (passthrough, int)
+and field index (3, 0):
+
+    def convert_row(row):
+        return _new(_Record, (row[3], _c1(row[0]), ))
+"""
+
+import struct
+from functools import lru_cache
+
+from foil.parsers import passthrough
+from foil.recordtypes import make_record_type
+
+
+PASSTHROUGH_CONVERTERS = frozenset((passthrough, str))
+
+ROW_CONVERTER_TEMPLATE = """\
+def convert_row(row):
+    return {constructor}
+"""
+
+RECORD_CONSTRUCTORS = {
+    'namedtuple': '_new(_Record, ({values}))',
+    'tuple': '({values})',
+    'slots': '_Record({values})',
+    'columnar': '_Record.append({values})',
+}
+
+LINE_SPLITTER_TEMPLATE = """\
+def split_line(line):
+    if len(line) < {size}:
+        line = line.ljust({size})
+    {unpack}
+    return ({values})
+"""
+
+# Record types holding state per reader are compiled for each reader, as
+# are converters with a true stateful attribute.
+STATEFUL_RECORD_TYPES = frozenset(('columnar',))
+
+
+def generate_row_converter(Record, converters, field_index=None,
+                           record_type='namedtuple'):
+    """Generate a function converting a raw row into a Record."""
+
+    if field_index is None:
+        field_index = range(len(converters))
+
+    namespace = {'_new': tuple.__new__, '_Record': Record}
+    values = []
+
+    for position, (converter, index) in enumerate(zip(converters, field_index)):
+        if _is_passthrough(converter):
+            values.append('row[{}], '.format(index))
+        else:
+            name = '_c{}'.format(position)
+            namespace[name] = converter
+            values.append('{}(row[{}]), '.format(name, index))
+
+    constructor = RECORD_CONSTRUCTORS[record_type].format(values=''.join(values))
+    source = ROW_CONVERTER_TEMPLATE.format(constructor=constructor)
+    exec(compile(source, '<row converter>', 'exec'), namespace)
+
+    return namespace['convert_row']
+
+
+def generate_line_splitter(columns, encoding):
+    """Generate a function splitting a fixed-width byte line into fields.
+
+    Fields are cut by a precompiled struct when columns are ordered and
+    disjoint, and by slices otherwise. Each field is stripped of padding
+    before it is decoded. Lines shorter than the layout are padded.
+
+    Parameters
+    ----------
+    columns: (start, end) byte offsets of each field, end exclusive.
+    encoding: text encoding of the fields.
+    """
+
+    columns = [(int(start), int(end)) for start, end in columns]
+    size = max((end for _, end in columns), default=0)
+    names = ['f{}'.format(position) for position in range(len(columns))]
+    namespace = {'_encoding': encoding}
+
+    if _is_disjoint(columns):
+        namespace['_unpack'] = struct.Struct(_struct_format(columns)).unpack_from
+        unpack = '{}, = _unpack(line)'.format(', '.join(names)) if names else 'pass'
+    else:
+        unpack = '; '.join('{} = line[{}:{}]'.format(name, start, end)
+                           for name, (start, end) in zip(names, columns)) or 'pass'
+
+    values = ''.join('{}.strip().decode(_encoding), '.format(name) for name in names)
+    source = LINE_SPLITTER_TEMPLATE.format(size=size, unpack=unpack, values=values)
+    exec(compile(source, '<line splitter>', 'exec'), namespace)
+
+    return namespace['split_line']
+
+
+def compile_row_converter(fields, converters, field_index=None,
+                          record_type='namedtuple'):
+    """Return a (Record, row converter) pair, cached by schema.
+
+    Parameters
+    ----------
+    fields: Record field names.
+    converters: casting functions to cast fields to Python objects.
+    field_index: row positions to pluck for each field, all positions if None.
+    record_type: foil.recordtypes record type name. For columnar records,
+      Record is the ColumnarRecords buffer that rows are appended to.
+    """
+
+    schema = (tuple(fields), tuple(converters),
+              None if field_index is None else tuple(field_index), record_type)
+
+    if record_type in STATEFUL_RECORD_TYPES or any(map(_is_stateful, converters)):
+        return _compile(*schema)
+
+    try:
+        return _compile_cached(*schema)
+    except TypeError:
+        return _compile(*schema)
+
+
+def _compile(fields, converters, field_index, record_type):
+    Record = make_record_type(fields, record_type, converters)
+    convert_row = generate_row_converter(Record, converters, field_index,
+                                         record_type)
+
+    return Record, convert_row
+
+
+_compile_cached = lru_cache(maxsize=256)(_compile)
+
+
+def _is_stateful(converter):
+    return getattr(converter, 'stateful', False)
+
+
+def _is_passthrough(converter):
+    try:
+        return converter in PASSTHROUGH_CONVERTERS
+    except TypeError:
+        return False
+
+
+def _is_disjoint(columns):
+    return all(0 <= start <= end for start, end in columns) and all(
+        end <= start for (_, end), (start, _) in zip(columns, columns[1:]))
+
+
+def _struct_format(columns):
+    parts = []
+    position = 0
+
+    for start, end in columns:
+        if start > position:
+            parts.append('{}x'.format(start - position))
+        parts.append('{}s'.format(end - start))
+        position = end
+
+    return ''.join(parts)
@@ -0,0 +1,207 @@
+"""Transparent decompression of gzip, bz2 and xz files.
+
+Codecs are picked from the file's magic bytes rather than its name.
+Decompression runs in a background thread that reads ahead of the
+consumer; zlib, bz2 and lzma release the GIL while inflating, so
+decompression overlaps with CSV tokenizing in the reading thread.
+Compressed writes are likewise handed to a background thread.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import threading
+from functools import partial
+from queue import Empty, Full, Queue
+
+
+CHUNK_SIZE = 1 << 20
+READ_AHEAD_CHUNKS = 4
+
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+def detect_codec(path):
+    """Compression codec name from a file's magic bytes, None if uncompressed."""
+
+    with open(path, 'rb') as f:
+        head = f.read(max(len(magic) for magic, _ in MAGIC_NUMBERS))
+
+    for magic, codec in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return codec
+
+    return None
+
+
+class ReadAheadReader(io.RawIOBase):
+    """Raw binary reader filled by a background thread.
+
+    Parameters
+    ----------
+    file: binary file to read, closed with the reader.
+    chunk_size: bytes read from file per chunk.
+    read_ahead: chunks buffered ahead of the consumer.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE, read_ahead=READ_AHEAD_CHUNKS):
+        super().__init__()
+        self.file = file
+        self.chunk_size = chunk_size
+        self.chunks = Queue(read_ahead)
+        self.chunk = memoryview(b'')
+        self.eof = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._fill, daemon=True)
+        self.thread.start()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.chunk and not self.eof:
+            item = self.chunks.get()
+
+            if isinstance(item, BaseException):
+                raise item
+
+            self.chunk = memoryview(item)
+            self.eof = not item
+
+        size = min(len(buffer), len(self.chunk))
+        buffer[:size] = self.chunk[:size]
+        self.chunk = self.chunk[size:]
+
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.stopped.set()
+            self._drain()
+            self.thread.join()
+            self.file.close()
+        super().close()
+
+    def _fill(self):
+        try:
+            for chunk in iter(partial(self.file.read, self.chunk_size), b''):
+                if not self._put(chunk):
+                    return
+            self._put(b'')
+        except Exception as exc:
+            self._put(exc)
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def _drain(self):
+        try:
+            while True:
+                self.chunks.get_nowait()
+        except Empty:
+            pass
+
+
+def open_compressed(path, chunk_size=CHUNK_SIZE, read_ahead=READ_AHEAD_CHUNKS):
+    """Binary stream of a file's decompressed content, decompressed ahead."""
+
+    codec = detect_codec(path)
+    file = OPENERS[codec](path, 'rb') if codec else open(path, 'rb')
+
+    return io.BufferedReader(ReadAheadReader(file, chunk_size, read_ahead),
+                             chunk_size)
+
+
+def open_compressed_text(path, encoding, chunk_size=CHUNK_SIZE,
+                         read_ahead=READ_AHEAD_CHUNKS):
+    """Text stream of a compressed file, line endings kept for csv."""
+
+    return io.TextIOWrapper(open_compressed(path, chunk_size, read_ahead),
+                            encoding=encoding, newline='')
+
+
+class WriteBehindWriter(io.RawIOBase):
+    """Raw binary writer drained by a background thread.
+
+    Errors raised writing to file are raised by the next write or close.
+
+    Parameters
+    ----------
+    file: binary file to write, closed with the writer.
+    write_behind: chunks buffered behind the producer.
+    """
+
+    def __init__(self, file, write_behind=READ_AHEAD_CHUNKS):
+        super().__init__()
+        self.file = file
+        self.chunks = Queue(write_behind)
+        self.error = None
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, buffer):
+        self._raise_error()
+        self.chunks.put(bytes(buffer))
+
+        return len(buffer)
+
+    def close(self):
+        if not self.closed:
+            self.chunks.put(None)
+            self.thread.join()
+            self.file.close()
+        super().close()
+        self._raise_error()
+
+    def _drain(self):
+        for chunk in iter(self.chunks.get, None):
+            if self.error is None:
+                try:
+                    self.file.write(chunk)
+                except Exception as exc:
+                    self.error = exc
+
+    def _raise_error(self):
+        error, self.error = self.error, None
+
+        if error is not None:
+            raise error
+
+
+def open_compressed_writer(path, codec, chunk_size=CHUNK_SIZE,
+                           write_behind=READ_AHEAD_CHUNKS):
+    """Binary stream compressing to a file with codec, or uncompressed if None."""
+
+    file = OPENERS[codec](path, 'wb') if codec else open(path, 'wb')
+
+    return io.BufferedWriter(WriteBehindWriter(file, write_behind), chunk_size)
+
+
+def open_compressed_text_writer(path, encoding, codec, chunk_size=CHUNK_SIZE,
+                                write_behind=READ_AHEAD_CHUNKS):
+    """Text stream compressing to a file, line endings left to csv."""
+
+    return io.TextIOWrapper(open_compressed_writer(path, codec, chunk_size,
+                                                   write_behind),
+                            encoding=encoding, newline='')
@@ -1,5 +1,9 @@
 import datetime as dt
 import re
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
 from types import MappingProxyType
 
 import pytz
@@ -40,25 +44,204 @@ def _format_re(pattern):
 _RE_DATE = re.compile(r'^{}$'.format(IsoDatePattern().date))
 _RE_DATETIMEZONE = re.compile(IsoDatePattern().datetimezone)
 
+# Concrete layouts a DateTimeParser specializes on.
+_RE_LAYOUT = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'(?P<time>(?P<dtsep>[T|\s]?)\d{2}:\d{2}:\d{2}'
+    r'(?:(?P<fsep>[.,])(?P<fraction>\d{1,6}))?)?'
+    r'(?:(?P<tzsep>\s?)(?P<timezone>[A-Z][A-Z_]+(?:/[A-Z][A-Z_]+)+|[A-Z]{3,}'
+    r'|Z|[+-]\d{2}:\d{2}))?')
+
+# UTC offset suffixes, as written by datetime.isoformat for aware datetimes.
+_RE_UTC_OFFSET = re.compile(r'Z|(?P<sign>[+-])(?P<hours>\d{2}):(?P<minutes>\d{2})')
+
+LAYOUT_PARSER_TEMPLATE = """\
+def parse_layout(s):
+    if {checks}:
+        try:
+            return {construct}
+        except ValueError:
+            pass
+    return _fallback(s)
+"""
+
+EPOCH = dt.datetime(1970, 1, 1)
+UTC_EPOCH = EPOCH.replace(tzinfo=pytz.UTC)
+MICROSECOND = dt.timedelta(microseconds=1)
+
+# pytz moves nonexistent local times this far back before localizing.
+_GAP_SHIFT = dt.timedelta(hours=6)
+
 TIMEZONE_MAP = MappingProxyType(dict(cartesian_product(
     (('EST', 'EDT', 'EST/EDT'), pytz.timezone('US/Eastern')))))
 
 
+try:
+    _date_fromisoformat = dt.date.fromisoformat
+except AttributeError:  # Python < 3.7
+    def _date_fromisoformat(date_str):
+        if not all(part.isdigit() for part in date_str.split('-')):
+            raise ValueError('Invalid isoformat string: {!r}'.format(date_str))
+
+        return dt.date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+
+
 def parse_date(date_str: str, pattern=_RE_DATE) -> dt.date:
-    """Parse datetime.date from YYYY-MM-DD format."""
+    """Parse datetime.date from YYYY-MM-DD format.
+
+    Fixed-width dates take a fast path; anything else, including out of
+    range dates, goes through the regex so that malformed values raise
+    AttributeError as before.
+    """
+
+    if len(date_str) == 10 and date_str[4] == date_str[7] == '-':
+        try:
+            return _date_fromisoformat(date_str)
+        except ValueError:
+            pass
 
     groups = re.match(pattern, date_str)
 
     return dt.date(*_date_to_tuple(groups.groupdict()))
 
 
+class Layout(namedtuple('Layout', ['dtsep', 'fsep', 'fraction_digits',
+                                   'tzsep', 'timezone'])):
+    """Concrete layout of a datetime string.
+
+    dtsep is None for date only layouts, fsep is None without fractional
+    seconds and tzsep is None without a timezone suffix.
+    """
+
+    __slots__ = ()
+
+    @property
+    def prefix_length(self) -> int:
+        """Length of the date and time before any timezone suffix."""
+
+        if self.dtsep is None:
+            return 10
+
+        length = 10 + len(self.dtsep) + 8
+
+        if self.fsep is not None:
+            length += 1 + self.fraction_digits
+
+        return length
+
+    def separators(self) -> list:
+        """(position, character) of each separator in the layout."""
+
+        positions = [(4, '-'), (7, '-')]
+
+        if self.dtsep is not None:
+            time_start = 10 + len(self.dtsep)
+            positions.extend([(10, self.dtsep)] if self.dtsep else [])
+            positions.extend([(time_start + 2, ':'), (time_start + 5, ':')])
+
+            if self.fsep is not None:
+                positions.append((time_start + 8, self.fsep))
+
+        if self.tzsep:
+            positions.append((self.prefix_length, self.tzsep))
+
+        return positions
+
+
+def detect_layout(date_str: str):
+    """Layout of an ISO 8601 datetime string, None if not recognized."""
+
+    match = _RE_LAYOUT.fullmatch(date_str)
+
+    if match is None:
+        return None
+
+    fraction = match.group('fraction')
+
+    return Layout(match.group('dtsep') if match.group('time') else None,
+                  match.group('fsep'), len(fraction) if fraction else 0,
+                  match.group('tzsep') if match.group('timezone') else None,
+                  match.group('timezone') is not None)
+
+
+def generate_layout_parser(layout: Layout, fallback, convert, timezones=TIMEZONE_MAP):
+    """Generate a parser for strings of one layout.
+
+    Strings are checked by length, separator positions and timezone
+    suffix, then sliced into datetime components. datetime.fromisoformat
+    is used when it parses the layout identically on this Python version.
+    Strings of another layout, or with invalid components, are handed to
+    fallback; timezone suffixes are handed to convert.
+    """
+
+    prefix = layout.prefix_length
+    checks = ['len(s) {} {}'.format('>' if layout.timezone else '==',
+                                    prefix + len(layout.tzsep or ''))]
+    checks.extend('s[{}] == {!r}'.format(position, character)
+                  for position, character in layout.separators())
+
+    if layout.timezone:
+        checks.append('(s[{0}:] in _timezones or _is_offset(s[{0}:]))'.format(
+            prefix + len(layout.tzsep)))
+
+    namespace = {'_datetime': dt.datetime, '_fallback': fallback,
+                 '_convert': convert, '_timezones': timezones,
+                 '_is_offset': _RE_UTC_OFFSET.fullmatch}
+
+    if _fromisoformat_parses(layout):
+        namespace['_fromisoformat'] = dt.datetime.fromisoformat
+        construct = '_fromisoformat(s{})'.format('[:{}]'.format(prefix)
+                                                 if layout.timezone else '')
+    else:
+        construct = '_datetime({})'.format(', '.join(
+            'int(s[{}:{}]){}'.format(start, end,
+                                     ' * {}'.format(scale) if scale > 1 else '')
+            for start, end, scale in _component_slices(layout)))
+
+    if layout.timezone:
+        construct = '_convert({}, s[{}:])'.format(
+            construct, prefix + len(layout.tzsep))
+
+    source = LAYOUT_PARSER_TEMPLATE.format(checks=' and '.join(checks),
+                                           construct=construct)
+    exec(compile(source, '<layout parser>', 'exec'), namespace)
+
+    parse_layout = namespace['parse_layout']
+    parse_layout.layout = layout
+
+    return parse_layout
+
+
 class DateTimeParser:
+    """Parse ISO 8601 datetime strings, converting timezones to UTC.
+
+    The layout of the first string parsed is detected and a parser
+    specialized to it is compiled; a string of another layout switches
+    the parser to that layout. Strings of no recognized layout are
+    parsed by the regex pattern.
+
+    Parameters
+    ----------
+    pattern: compiled regex of optional datetime and timezone groups.
+    tz_mapper: mapping of timezone names to pytz timezones.
+    """
 
     def __init__(self, pattern=_RE_DATETIMEZONE, tz_mapper=TIMEZONE_MAP):
         self.pattern = pattern
         self.tz_mapper = tz_mapper
+        self.layout_parsers = {}
+        self.parse = self._switch_layout
+
+    def __reduce__(self):
+        # Compiled layout parsers do not pickle; they are compiled again.
+        if self.tz_mapper is TIMEZONE_MAP:
+            return type(self), (self.pattern,)
+
+        return type(self), (self.pattern, dict(self.tz_mapper))
+
+    def parse_pattern(self, date_str) -> dt.datetime:
+        """Parse with the regex pattern, regardless of layout."""
 
-    def parse(self, date_str) -> dt.datetime:
         gd = self.pattern.match(date_str).groupdict()
 
         if gd['microsecond'] is not None:
@@ -71,11 +254,223 @@ class DateTimeParser:
 
         return datetime_
 
+    def parse_batch(self, values) -> array:
+        """Parse strings into an array('q') of microseconds since the epoch.
+
+        Zoned values are converted to UTC, naive values are taken as is.
+        The array buffer maps directly to numpy datetime64[us].
+        """
+
+        return array('q', (epoch_microseconds(self.parse(value)) for value in values))
+
     def convert_2_utc(self, datetime_, timezone):
-        """convert to datetime to UTC offset."""
+        """convert to datetime to UTC offset.
+
+        timezone is a tz_mapper name, or a UTC offset such as +00:00 or Z.
+        """
+
+        if timezone not in self.tz_mapper:
+            offset = _RE_UTC_OFFSET.fullmatch(timezone)
+            if offset is not None:
+                return UTC_EPOCH + (datetime_ - _utc_offset(offset) - EPOCH)
+
+        return utc_offset_table(self.tz_mapper[timezone]).to_utc(datetime_)
+
+    def _switch_layout(self, date_str):
+        layout = detect_layout(date_str)
+
+        if layout is None:
+            return self.parse_pattern(date_str)
+
+        parser = self.layout_parsers.get(layout)
+
+        if parser is None:
+            parser = generate_layout_parser(layout, self._fallback,
+                                            self.convert_2_utc, self.tz_mapper)
+            self.layout_parsers[layout] = parser
+
+        self.parse = parser
 
-        datetime_ = self.tz_mapper[timezone].localize(datetime_)
-        return datetime_.astimezone(pytz.UTC)
+        return parser(date_str)
+
+    def _fallback(self, date_str):
+        if detect_layout(date_str) in (None, getattr(self.parse, 'layout', None)):
+            return self.parse_pattern(date_str)
+
+        return self._switch_layout(date_str)
+
+
+class UTCOffsetTable:
+    """Local time to UTC offsets of a pytz timezone, looked up by bisect.
+
+    The local times at which the offset changes are precomputed from
+    the timezone transitions between start and end. Offsets are those
+    pytz localize picks with is_dst=False: standard time for ambiguous
+    times and the earlier offset for nonexistent times. Times outside
+    [start, end) are localized by pytz.
+
+    Parameters
+    ----------
+    timezone: pytz timezone.
+    start: first naive local time of the table, unbounded if None.
+    end: naive local time the table ends before, unbounded if None.
+    """
+
+    def __init__(self, timezone, start=None, end=None):
+        self.timezone = timezone
+        self.start = start
+        self.end = end
+
+        boundaries = [boundary for boundary in _local_boundaries(timezone)
+                      if self._in_range(boundary) and boundary != start]
+        first = start or (boundaries[0] - _GAP_SHIFT if boundaries else EPOCH)
+
+        self.boundaries = [start or dt.datetime.min]
+        self.offsets = [_localized_offset(timezone, first)]
+
+        for boundary in boundaries:
+            offset = _localized_offset(timezone, boundary)
+            if offset != self.offsets[-1]:
+                self.boundaries.append(boundary)
+                self.offsets.append(offset)
+
+        self.lower = epoch_microseconds(self.boundaries[0])
+        self.upper = epoch_microseconds(end or dt.datetime.max)
+        self.boundary_microseconds = [epoch_microseconds(boundary)
+                                      for boundary in self.boundaries]
+        self.offset_microseconds = [offset // MICROSECOND for offset in self.offsets]
+
+    def utcoffset(self, datetime_: dt.datetime) -> dt.timedelta:
+        """UTC offset of a naive local time."""
+
+        if not self._in_range(datetime_):
+            return _localized_offset(self.timezone, datetime_)
+
+        return self.offsets[bisect_right(self.boundaries, datetime_) - 1]
+
+    def _in_range(self, datetime_):
+        after_start = self.start is None or self.start <= datetime_
+        return after_start and (self.end is None or datetime_ < self.end)
+
+    def to_utc(self, datetime_: dt.datetime) -> dt.datetime:
+        """Convert a naive local time to an aware UTC datetime."""
+
+        # Adding to an aware epoch is much cheaper than replace(tzinfo=...).
+        return UTC_EPOCH + (datetime_ - self.utcoffset(datetime_) - EPOCH)
+
+    def to_utc_batch(self, values) -> array:
+        """Convert microseconds since the epoch from local time to UTC.
+
+        Parameters
+        ----------
+        values: iterable of naive local times as microseconds since
+          1970-01-01, such as DateTimeParser.parse_batch returns.
+        """
+
+        boundaries = self.boundary_microseconds
+        offsets = self.offset_microseconds
+        lower, upper = self.lower, self.upper
+        utc = array('q', values)
+
+        for i, value in enumerate(utc):
+            if lower <= value < upper:
+                utc[i] = value - offsets[bisect_right(boundaries, value) - 1]
+            else:
+                local = EPOCH + value * MICROSECOND
+                utc[i] = value - _localized_offset(self.timezone, local) // MICROSECOND
+
+        return utc
+
+
+@lru_cache(maxsize=None)
+def utc_offset_table(timezone) -> UTCOffsetTable:
+    """Unbounded UTCOffsetTable of a timezone, built once per timezone."""
+
+    return UTCOffsetTable(timezone)
+
+
+def epoch_microseconds(datetime_: dt.datetime) -> int:
+    """Microseconds since 1970-01-01, in UTC for aware datetimes."""
+
+    if datetime_.tzinfo is not None:
+        return (datetime_ - UTC_EPOCH) // MICROSECOND
+
+    return (datetime_ - EPOCH) // MICROSECOND
+
+
+def _utc_offset(match) -> dt.timedelta:
+    if match.group('sign') is None:
+        return dt.timedelta(0)
+
+    offset = dt.timedelta(hours=int(match.group('hours')),
+                          minutes=int(match.group('minutes')))
+
+    return -offset if match.group('sign') == '-' else offset
+
+
+def _local_boundaries(timezone) -> list:
+    """Sorted local times at which the offset pytz localizes to may change.
+
+    Around each UTC transition the candidate offsets change at the
+    transition time in the old and in the new offset; nonexistent times
+    are localized from _GAP_SHIFT earlier, so those points shifted by
+    _GAP_SHIFT are included as well.
+    """
+
+    transitions = getattr(timezone, '_utc_transition_times', ())
+    infos = getattr(timezone, '_transition_info', ())
+    boundaries = set()
+
+    for i in range(1, len(transitions)):
+        for offset in (infos[i - 1][0], infos[i][0]):
+            boundaries.add(transitions[i] + offset)
+            boundaries.add(transitions[i] + offset + _GAP_SHIFT)
+
+    return sorted(boundaries)
+
+
+def _localized_offset(timezone, datetime_) -> dt.timedelta:
+    return timezone.localize(datetime_, is_dst=False).utcoffset()
+
+
+def _component_slices(layout):
+    """(start, end, scale) of each datetime component in a layout."""
+
+    components = [(0, 4, 1), (5, 7, 1), (8, 10, 1)]
+
+    if layout.dtsep is not None:
+        start = 10 + len(layout.dtsep)
+        components.extend((start + offset, start + offset + 2, 1)
+                          for offset in (0, 3, 6))
+
+        if layout.fsep is not None:
+            digits = layout.fraction_digits
+            components.append((start + 9, start + 9 + digits, 10 ** (6 - digits)))
+
+    return components
+
+
+def _fromisoformat_parses(layout):
+    fromisoformat = getattr(dt.datetime, 'fromisoformat', None)
+
+    if fromisoformat is None:
+        return False
+
+    sample = '2001-02-03'
+
+    if layout.dtsep is not None:
+        sample += layout.dtsep + '04:05:06'
+
+        if layout.fsep is not None:
+            sample += layout.fsep + '789123'[:layout.fraction_digits]
+
+    expected = dt.datetime(*(int(sample[start:end]) * scale for start, end, scale
+                             in _component_slices(layout)))
+
+    try:
+        return fromisoformat(sample) == expected
+    except ValueError:
+        return False
 
 
 def _datetime_to_tuple(dt_dict):
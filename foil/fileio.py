@@ -2,13 +2,31 @@
 tools.fileio.py contains helper utilities for file reading and writing.
 """
 
+import codecs
 import csv
-from collections import namedtuple
+import mmap
+import os
+import re
 from contextlib import contextmanager
-from io import BufferedReader
+from io import BufferedReader, BytesIO, StringIO, TextIOWrapper
+from itertools import chain, islice
+from operator import itemgetter
 from zipfile import ZipFile
 
-from foil.filters import create_indexer
+from foil.categorical import categorize, category_stats
+from foil.compilers import compile_row_converter, generate_line_splitter
+from foil.compression import open_compressed_text, open_compressed_text_writer
+from foil.filters import AttributeFilter, create_indexer
+from foil.indexes import RowOffsetIndex
+from foil.parsers import make_bytes_converters
+from foil.paths import match_files
+from foil.util import find_index
+
+
+TEXT_BUFFER_SIZE = 1 << 16
+MAP_BLOCK_SIZE = 1 << 20
+BATCH_BLOCK_CELLS = 1 << 13
+WRITE_BUFFER_ROWS = 10000
 
 
 class TextReader:
@@ -30,6 +48,76 @@ class TextReader:
                 yield line.strip('\r\n')
 
 
+class MappedTextReader:
+    """Reads text file through a read-only memory map.
+
+    The map is decoded in blocks of whole lines, which are split by the
+    str and bytes builtins rather than line by line in Python. Processes
+    mapping the same file share the operating system page cache rather
+    than each holding a read buffer.
+
+    Parameters
+    ----------
+    path : Absolute path to text file.
+    encoding : File encoding.
+    block_size : bytes of the map decoded at a time.
+    """
+
+    def __init__(self, path: str, encoding: str, block_size=MAP_BLOCK_SIZE):
+        self.path = path
+        self.encoding = encoding
+        self.block_size = block_size
+
+    def __iter__(self):
+        return self.readlines()
+
+    def readlines(self, keepends=False):
+        """Read content into encoded str line iterator."""
+
+        return chain.from_iterable(self._line_blocks(keepends))
+
+    def readlines_bytes(self, keepends=False):
+        """Read content into byte str line iterator."""
+
+        return chain.from_iterable(self._byte_line_blocks(keepends))
+
+    def _line_blocks(self, keepends):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        pending = ''
+
+        with open_memory_map(self.path) as buffer:
+            with memoryview(buffer) as view:
+                for block in iter_blocks(view, self.block_size):
+                    text = pending + decoder.decode(block)
+                    end = text.rfind('\n') + 1
+                    pending = text[end:]
+                    yield _split_lines(text[:end], keepends)
+
+        yield _split_lines(pending + decoder.decode(b'', True), keepends)
+
+    def _byte_line_blocks(self, keepends):
+        pending = b''
+
+        with open_memory_map(self.path) as buffer:
+            with memoryview(buffer) as view:
+                for block in iter_blocks(view, self.block_size):
+                    data = pending + block
+                    end = data.rfind(b'\n') + 1
+                    pending = data[end:]
+                    yield _split_lines(data[:end], keepends)
+
+        yield _split_lines(pending, keepends)
+
+    def line_offsets(self):
+        """Byte offset of the start of each line."""
+
+        offset = 0
+
+        for line in self.readlines_bytes(keepends=True):
+            yield offset
+            offset += len(line)
+
+
 class DelimitedReader:
     """Read delimited text stream into namedtuple Records.
 
@@ -40,45 +128,227 @@ class DelimitedReader:
     fields: Record field names.
     converters: casting functions to cast fields to Python objects.
       Utilize tools.parsers.make_converters for the general use case.
+    row_filter: foil.filters.AttributeFilter keyed by header names, whose
+      predicates are raw text values. Rows outside the filter set are
+      dropped before any converter runs.
+    record_type: record representation, one of foil.recordtypes.RECORD_TYPES.
+    stats: foil.profiling.ReaderStats collecting throughput and timings,
+      the reader is not instrumented if None.
+    categorical: names of low cardinality fields whose converters are
+      wrapped in foil.categorical.Categorical.
 
     Factory Methods
     ---------------
     See factory methods for alternative constructors.
     """
 
-    def __init__(self, stream,
-                 dialect: csv.Dialect, fields: list, converters: list):
-        reader = csv.reader(stream, dialect=dialect)
+    field_index = None
+    line_offset = 0
+
+    def __init__(self, stream, dialect: csv.Dialect, fields: list,
+                 converters: list, row_filter: AttributeFilter = None,
+                 record_type='namedtuple', stats=None, categorical=None):
+        self.stream = stream
+
+        if categorical:
+            converters = categorize(fields, converters, categorical)
+
+        if stats is not None:
+            stream = stats.count_lines(stream)
+
+        reader = self.make_reader(stream, dialect)
         self.header = next(reader)
         self.reader = reader
+        self.rows = self.filter_rows(reader, row_filter)
+        self.fields = tuple(fields)
         self.converters = converters
-        self.Record = namedtuple('Record', fields)
+        self.stats = stats
+
+        if stats is None:
+            self.Record, self.convert_row = compile_row_converter(
+                fields, converters, self.field_index, record_type)
+        else:
+            self.rows = stats.time_rows(self.rows)
+            self.Record, convert_row = compile_row_converter(
+                fields, stats.time_converters(fields, converters),
+                self.field_index, record_type)
+            self.convert_row = stats.time_row_converter(convert_row)
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        Record = self.Record
-        record = Record._make(type_converter(item) for type_converter, item
-                              in zip(self.converters, next(self.reader)))
-        return record
+        return self.convert_row(next(self.rows))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying stream, if it can be closed."""
+
+        close = getattr(self.stream, 'close', None)
+
+        if close is not None:
+            close()
+
+    def category_stats(self) -> dict:
+        """foil.categorical.CategoryStats of each categorical field."""
+
+        return category_stats(self.fields, self.converters)
+
+    def iter_batches(self, batch_size: int):
+        """Read delimited text into batches of typed columns.
+
+        Yields dictionaries mapping each field to a foil.columns.Column
+        of at most batch_size values and its null mask. Categorical
+        fields are foil.columns.CategoricalColumn codes and categories.
+        Rows too short to hold every field raise ValueError.
+
+        Batches are parsed in blocks of about BATCH_BLOCK_CELLS fields,
+        so text is converted while it is still in cache.
+        """
+        from foil.columns import concat_columns, make_column_parser
+
+        column_parsers = [make_column_parser(converter)
+                          for converter in self.converters]
+        block_size = max(1, min(batch_size, BATCH_BLOCK_CELLS // max(self.row_width, 1)))
+
+        while True:
+            blocks = []
+            size = 0
+
+            while size < batch_size:
+                count, columns = self._read_columns(min(block_size, batch_size - size))
+
+                if not count:
+                    break
+
+                size += count
+                blocks.append([parse_column(column) for parse_column, column
+                               in zip(column_parsers, columns)])
+
+            if not blocks:
+                return
+
+            columns = blocks[0] if len(blocks) == 1 else map(concat_columns, zip(*blocks))
+            yield dict(zip(self.fields, columns))
+
+    def _read_columns(self, size: int):
+        """Read up to size rows, returning the row count and field value lists."""
+
+        line_number = self.file_line_number
+        rows = list(islice(self.rows, size))
+
+        if not rows:
+            return 0, None
+
+        width = self.row_width
+        lengths = set(map(len, rows))
+
+        if min(lengths) < width:
+            self._raise_short_row(rows, width, line_number)
+
+        if len(lengths) > 1:
+            return len(rows), [list(map(itemgetter(i), rows)) for i in self.column_index]
+
+        stride = lengths.pop()
+        values = list(chain.from_iterable(rows))
+
+        return len(rows), [values[i::stride] for i in self.column_index]
+
+    @property
+    def column_index(self):
+        """Row positions of the read fields."""
+
+        return range(len(self.fields))
+
+    @property
+    def row_width(self) -> int:
+        """Fields a row needs to hold every read field."""
+
+        return len(self.fields)
+
+    def _raise_short_row(self, rows, width, line_number):
+        """Raise ValueError for the first short row of a block read after line_number.
+
+        The line is exact when each row of the block was one line, otherwise
+        the block's line range is given.
+        """
+
+        index, row = next((i, row) for i, row in enumerate(rows) if len(row) < width)
+        lines = self.file_line_number - line_number
+
+        if lines == len(rows):
+            location = 'line {}'.format(line_number + index + 1)
+        else:
+            location = 'lines {}-{}'.format(line_number + 1, self.file_line_number)
+
+        raise ValueError('{}: expected at least {} fields, got {}'.format(
+            location, width, len(row)))
+
+    def make_reader(self, stream, dialect):
+        return csv.reader(stream, dialect=dialect)
+
+    def filter_rows(self, rows, row_filter):
+        """Apply the row filter to tokenized rows ahead of conversion."""
+
+        if row_filter is None:
+            return rows
+        else:
+            return filter(row_filter.row_predicate(self.header), rows)
 
     @property
     def file_line_number(self):
-        return self.reader.line_num
+        return self.line_offset + self.reader.line_num
 
     @classmethod
-    def from_file(cls, path, encoding, dialect, fields, converters):
+    def from_file(cls, path, encoding, dialect, fields, converters, **options):
         """Read delimited text from a text file."""
 
-        return cls(open(path, 'r', encoding=encoding), dialect, fields, converters)
+        return cls(open(path, 'r', encoding=encoding), dialect, fields, converters,
+                   **options)
+
+    @classmethod
+    def from_mmap(cls, path, encoding, dialect, fields, converters, **options):
+        """Read delimited text from a memory mapped text file."""
+
+        stream = MappedTextReader(path, encoding).readlines(keepends=True)
+        return cls(stream, dialect, fields, converters, **options)
+
+    @classmethod
+    def from_compressed(cls, path, encoding, dialect, fields, converters,
+                        **options):
+        """Read delimited text from a gzip, bz2, xz or uncompressed file."""
+
+        stream = open_compressed_text(path, encoding)
+        return cls(stream, dialect, fields, converters, **options)
 
     @classmethod
-    def from_zipfile(cls, path, filename, encoding, dialect, fields, converters):
+    def from_file_rows(cls, path, encoding, dialect, fields, converters,
+                       start, stop=None, row_index=None, **options):
+        """Read data rows [start, stop) of a text file.
+
+        Seeks through a foil.indexes.RowOffsetIndex sidecar, built or
+        rebuilt on demand when row_index is not given.
+        """
+
+        stream, line_offset = open_row_range(path, encoding, dialect,
+                                             start, stop, row_index)
+        reader = cls(stream, dialect, fields, converters, **options)
+        reader.line_offset = line_offset
+
+        return reader
+
+    @classmethod
+    def from_zipfile(cls, path, filename, encoding, dialect, fields, converters,
+                     **options):
         """Read delimited text from zipfile."""
 
-        stream = ZipReader(path, filename).readlines(encoding)
-        return cls(stream, dialect, fields, converters)
+        stream = ZipReader(path, filename).stream(encoding)
+        return cls(stream, dialect, fields, converters, **options)
 
     @staticmethod
     def discover_headers(stream, dialect):
@@ -91,13 +361,12 @@ class DelimitedReader:
 
     @staticmethod
     def file_headers(path, encoding, dialect):
-        stream = open(path, 'r', encoding=encoding)
-
-        return DelimitedReader.discover_headers(stream, dialect=dialect)
+        with open(path, 'r', encoding=encoding) as stream:
+            return DelimitedReader.discover_headers(stream, dialect=dialect)
 
     @staticmethod
     def zipfile_headers(path, filename, encoding, dialect):
-        stream = ZipReader(path, filename).readlines(encoding)
+        stream = ZipReader(path, filename).stream(encoding)
 
         return DelimitedReader.discover_headers(stream, dialect)
 
@@ -106,34 +375,447 @@ class DelimitedSubsetReader(DelimitedReader):
     """Read delimited text into namedtuple Records ignoring certain fields."""
 
     def __init__(self, stream, dialect: csv.Dialect, fields: list,
-                 converters: list, field_index: list):
-        super().__init__(stream, dialect, fields, converters)
+                 converters: list, field_index: list,
+                 row_filter: AttributeFilter = None, record_type='namedtuple',
+                 stats=None, categorical=None):
+        self.field_index = field_index
+        super().__init__(stream, dialect, fields, converters, row_filter,
+                         record_type, stats, categorical)
 
         self.indexer = create_indexer(field_index)
 
-    def __next__(self):
-        indexer = self.indexer
-        Record = self.Record
+    def make_reader(self, stream, dialect):
+        """Tokenize only up to the last indexed column where possible."""
+
+        if ProjectionReader.supports(dialect):
+            return ProjectionReader(stream, dialect, max(self.field_index) + 1)
+        else:
+            return csv.reader(stream, dialect=dialect)
 
-        row = indexer(next(self.reader))
-        record = Record._make(type_converter(item) for type_converter, item
-                              in zip(self.converters, row))
+    def filter_rows(self, rows, row_filter):
+        """Widen the projection to cover the filtered columns."""
 
-        return record
+        if row_filter is not None and isinstance(rows, ProjectionReader):
+            filter_width = max(find_index(self.header, row_filter.keys)) + 1
+            rows.width = max(rows.width, filter_width)
+
+        return super().filter_rows(rows, row_filter)
+
+    @property
+    def column_index(self):
+        return self.field_index
+
+    @property
+    def row_width(self) -> int:
+        return max(self.field_index, default=-1) + 1
 
     @classmethod
-    def from_file(cls, path, encoding, dialect, fields, converters, field_index):
+    def from_file(cls, path, encoding, dialect, fields, converters, field_index,
+                  **options):
         """Read delimited text from a text file."""
 
-        return cls(open(path, 'r', encoding=encoding), dialect, fields, converters, field_index)
+        return cls(open(path, 'r', encoding=encoding), dialect, fields, converters,
+                   field_index, **options)
+
+    @classmethod
+    def from_mmap(cls, path, encoding, dialect, fields, converters, field_index,
+                  **options):
+        """Read delimited text from a memory mapped text file."""
+
+        stream = MappedTextReader(path, encoding).readlines(keepends=True)
+        return cls(stream, dialect, fields, converters, field_index, **options)
+
+    @classmethod
+    def from_compressed(cls, path, encoding, dialect, fields, converters,
+                        field_index, **options):
+        """Read delimited text from a gzip, bz2, xz or uncompressed file."""
+
+        stream = open_compressed_text(path, encoding)
+        return cls(stream, dialect, fields, converters, field_index, **options)
+
+    @classmethod
+    def from_file_rows(cls, path, encoding, dialect, fields, converters,
+                       field_index, start, stop=None, row_index=None, **options):
+        """Read data rows [start, stop) of a text file through a row index."""
+
+        stream, line_offset = open_row_range(path, encoding, dialect,
+                                             start, stop, row_index)
+        reader = cls(stream, dialect, fields, converters, field_index, **options)
+        reader.line_offset = line_offset
+
+        return reader
 
     @classmethod
     def from_zipfile(cls, path, filename, encoding, dialect, fields,
-                     converters, field_index):
+                     converters, field_index, **options):
         """Read delimited text from zipfile."""
 
-        stream = ZipReader(path, filename).readlines(encoding)
-        return cls(stream, dialect, fields, converters, field_index)
+        stream = ZipReader(path, filename).stream(encoding)
+        return cls(stream, dialect, fields, converters, field_index, **options)
+
+
+class BytesDelimitedReader(DelimitedSubsetReader):
+    """Read delimited byte lines into Records, decoding only what is used.
+
+    Lines are tokenized as bytes and only the projected fields are
+    converted. Numeric converters cast bytes directly, other converters
+    receive the decoded field. Row filter predicates receive bytes
+    values. The encoding must be ASCII compatible, such as utf-8 or
+    latin-1. Categorical fields are keyed by the raw bytes, so repeated
+    values are not decoded again.
+
+    Attributes
+    ----------
+    lines: iterable of byte lines, line endings kept.
+    encoding: text encoding of the lines.
+    field_index: positions of fields to read, the leading len(fields)
+      positions if None.
+    See DelimitedReader for the remaining attributes.
+    """
+
+    def __init__(self, lines, encoding: str, dialect: csv.Dialect, fields: list,
+                 converters: list, field_index: list = None,
+                 row_filter: AttributeFilter = None, record_type='namedtuple',
+                 stats=None, categorical=None):
+        self.encoding = encoding
+
+        if field_index is None:
+            field_index = list(range(len(fields)))
+
+        super().__init__(lines, dialect, fields,
+                         make_bytes_converters(converters, encoding), field_index,
+                         row_filter, record_type, stats, categorical)
+
+    def make_reader(self, stream, dialect):
+        return BytesProjectionReader(stream, dialect, self.encoding,
+                                     max(self.field_index, default=-1) + 1)
+
+    @classmethod
+    def from_file(cls, path, encoding, dialect, fields, converters,
+                  field_index=None, **options):
+        """Read delimited bytes from a file."""
+
+        return cls(open(path, 'rb'), encoding, dialect, fields, converters,
+                   field_index, **options)
+
+    @classmethod
+    def from_mmap(cls, path, encoding, dialect, fields, converters,
+                  field_index=None, **options):
+        """Read delimited bytes from a memory mapped file."""
+
+        lines = MappedTextReader(path, encoding).readlines_bytes(keepends=True)
+        return cls(lines, encoding, dialect, fields, converters, field_index,
+                   **options)
+
+    @classmethod
+    def from_zipfile(cls, path, filename, encoding, dialect, fields, converters,
+                     field_index=None, **options):
+        """Read delimited bytes from zipfile."""
+
+        lines = ZipReader(path, filename).readlines_bytes(keepends=True)
+        return cls(lines, encoding, dialect, fields, converters, field_index,
+                   **options)
+
+
+class FixedWidthReader:
+    """Read fixed-width byte lines into namedtuple Records.
+
+    Each line is cut into fields by a compiled line splitter, working on
+    bytes before any decoding; fields are stripped of padding.
+
+    Attributes
+    ----------
+    lines: iterable of byte lines.
+    encoding: text encoding of the fields.
+    columns: (start, end) byte offsets of each field, end exclusive.
+    fields: Record field names.
+    converters: casting functions to cast fields to Python objects.
+    skip_lines: leading lines, such as a header, kept in header undecoded.
+    record_type: record representation, one of foil.recordtypes.RECORD_TYPES.
+    """
+
+    def __init__(self, lines, encoding: str, columns: list, fields: list,
+                 converters: list, skip_lines: int = 0,
+                 record_type='namedtuple'):
+        self.stream = lines
+        lines = iter(lines)
+        self.header = [next(lines) for _ in range(skip_lines)]
+        self.split_line = generate_line_splitter(columns, encoding)
+        self.rows = map(self.split_line, lines)
+        self.fields = tuple(fields)
+        self.converters = converters
+        self.Record, self.convert_row = compile_row_converter(
+            fields, converters, record_type=record_type)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.convert_row(next(self.rows))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying stream, if it can be closed."""
+
+        close = getattr(self.stream, 'close', None)
+
+        if close is not None:
+            close()
+
+    @classmethod
+    def from_file(cls, path, encoding, columns, fields, converters, **options):
+        """Read fixed-width lines from a file."""
+
+        return cls(open(path, 'rb'), encoding, columns, fields, converters,
+                   **options)
+
+    @classmethod
+    def from_mmap(cls, path, encoding, columns, fields, converters, **options):
+        """Read fixed-width lines from a memory mapped file."""
+
+        lines = MappedTextReader(path, encoding).readlines_bytes()
+        return cls(lines, encoding, columns, fields, converters, **options)
+
+    @classmethod
+    def from_zipfile(cls, path, filename, encoding, columns, fields, converters,
+                     **options):
+        """Read fixed-width lines from zipfile."""
+
+        lines = ZipReader(path, filename).readlines_bytes()
+        return cls(lines, encoding, columns, fields, converters, **options)
+
+
+class DelimitedWriter:
+    """Write Records or column batches as delimited text.
+
+    Rows are formatted as they are received and handed to the csv
+    writer in blocks of buffer_rows.
+
+    Attributes
+    ----------
+    stream: writable text stream, opened with newline=''.
+    dialect: delimited file attributes.
+    fields: header field names, written on construction.
+    formatters: functions formatting each field as text, the inverse of
+      the reader converters. Utilize tools.parsers.make_formatters.
+    buffer_rows: rows buffered between writes to stream.
+    """
+
+    def __init__(self, stream, dialect: csv.Dialect, fields: list,
+                 formatters: list, buffer_rows: int = WRITE_BUFFER_ROWS):
+        self.stream = stream
+        self.writer = csv.writer(stream, dialect=dialect)
+        self.fields = tuple(fields)
+        self.formatters = formatters
+        self.buffer_rows = buffer_rows
+        self.buffer = []
+        _, self.format_row = compile_row_converter(fields, formatters,
+                                                   record_type='tuple')
+        self.writer.writerow(self.fields)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record):
+        """Write a single Record, or any sequence of field values."""
+
+        self.buffer.append(self.format_row(record))
+
+        if len(self.buffer) >= self.buffer_rows:
+            self.flush()
+
+    def writerows(self, records):
+        buffer, format_row, buffer_rows = self.buffer, self.format_row, self.buffer_rows
+
+        for record in records:
+            buffer.append(format_row(record))
+
+            if len(buffer) >= buffer_rows:
+                self.flush()
+
+    def write_batch(self, batch: dict):
+        """Write a batch mapping fields to value sequences or Columns.
+
+        Accepts the batches yielded by DelimitedReader.iter_batches.
+        """
+        from foil.columns import CategoricalColumn, Column, column_values
+
+        columns = [column_values(batch[field], formatter)
+                   if isinstance(batch[field], (Column, CategoricalColumn))
+                   else batch[field]
+                   for field, formatter in zip(self.fields, self.formatters)]
+
+        self.writerows(zip(*columns))
+
+    def flush(self):
+        """Write buffered rows to stream."""
+
+        self.writer.writerows(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.stream.close()
+
+    @classmethod
+    def to_file(cls, path, encoding, dialect, fields, formatters,
+                compression=None, **options):
+        """Write delimited text to a file, compressed on a background thread.
+
+        compression: None, or one of the foil.compression codecs
+          gzip, bz2 and xz.
+        """
+
+        if compression is None:
+            stream = open(path, 'w', encoding=encoding, newline='')
+        else:
+            stream = open_compressed_text_writer(path, encoding, compression)
+
+        return cls(stream, dialect, fields, formatters, **options)
+
+
+class ProjectionReader:
+    """Tokenize delimited lines only up to the columns a projection needs.
+
+    Lines free of quote and escape characters are split on the delimiter
+    into at most width leading fields plus the unsplit remainder. Other
+    lines fall back to csv.reader, which may consume the continuation
+    lines of a multi-line quoted field. The header line is always
+    tokenized in full.
+
+    Parameters
+    ----------
+    stream: stream of text.
+    dialect: delimited file attributes.
+    width: count of leading columns required from each row.
+    """
+
+    def __init__(self, stream, dialect, width: int):
+        dialect = _get_dialect(dialect)
+        special = ''.join(c for c in (dialect.quotechar, dialect.escapechar) if c)
+
+        self.lines = iter(stream)
+        self.delimiter = dialect.delimiter
+        self.width = width
+        self.needs_csv = re.compile('[{}]'.format(re.escape(special)) if special
+                                    else r'(?!)').search
+        self.line_num = 0
+        self.pending = None
+        self.csv_reader = csv.reader(self._csv_lines(), dialect=dialect)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self.lines)
+        self.line_num += 1
+
+        if self.line_num == 1 or self.needs_csv(line):
+            self.pending = line
+            return next(self.csv_reader)
+
+        return line.rstrip('\r\n').split(self.delimiter, self.width)
+
+    def _csv_lines(self):
+        while True:
+            line, self.pending = self.pending, None
+
+            if line is None:
+                line = next(self.lines, None)
+                if line is None:
+                    return
+                self.line_num += 1
+
+            yield line
+
+    @staticmethod
+    def supports(dialect):
+        """Whether splitting unquoted lines matches csv.reader for the dialect."""
+
+        dialect = _get_dialect(dialect)
+
+        single_delimiter = len(dialect.delimiter) == 1
+
+        return single_delimiter and not dialect.skipinitialspace and (
+            dialect.quoting != csv.QUOTE_NONNUMERIC)
+
+
+class BytesProjectionReader(ProjectionReader):
+    """Tokenize delimited byte lines into bytes fields.
+
+    Lines free of quote and escape bytes are split as bytes. The header
+    is tokenized by csv and returned decoded; other lines needing csv
+    are decoded, tokenized and their leading width fields encoded again.
+
+    Parameters
+    ----------
+    stream: stream of byte lines, line endings kept.
+    dialect: delimited file attributes.
+    encoding: ASCII compatible text encoding of the lines.
+    width: count of leading columns required from each row, all if -1.
+    """
+
+    def __init__(self, stream, dialect, encoding: str, width: int):
+        self.encoding = encoding
+        super().__init__(stream, dialect, width)
+
+        dialect = _get_dialect(dialect)
+        special = b''.join(c.encode(encoding) for c
+                           in (dialect.quotechar, dialect.escapechar) if c)
+
+        self.delimiter = self.delimiter.encode(encoding)
+        self.needs_csv = (re.compile(b'[' + re.escape(special) + b']').search
+                          if special and self.supports(dialect) else bool)
+
+    def __next__(self):
+        line = next(self.lines)
+        self.line_num += 1
+
+        if self.line_num == 1:
+            self.pending = line
+            return next(self.csv_reader)
+
+        if self.needs_csv(line):
+            self.pending = line
+            encoding = self.encoding
+            fields = next(self.csv_reader)
+            return [field.encode(encoding) for field in
+                    (fields[:self.width] if self.width >= 0 else fields)]
+
+        return line.rstrip(b'\r\n').split(self.delimiter, self.width)
+
+    def _csv_lines(self):
+        encoding = self.encoding
+
+        for line in super()._csv_lines():
+            yield line.decode(encoding)
+
+
+def open_row_range(path, encoding, dialect, start, stop=None, row_index=None):
+    """Line stream of the header and data rows [start, stop) of a file.
+
+    Returns the stream and the offset from stream to file line numbers.
+    """
+
+    if row_index is None:
+        row_index = RowOffsetIndex.open(
+            path, quotechar=_get_dialect(dialect).quotechar or '"')
+
+    stream, line_number = row_index.open_rows(start, stop, encoding)
+
+    return stream, line_number - row_index.header_lines
+
+
+def _get_dialect(dialect):
+    return csv.get_dialect(dialect) if isinstance(dialect, str) else dialect
 
 
 class ZipReader:
@@ -143,11 +825,13 @@ class ZipReader:
     ----------
     path : Absolute path to zip file archive.
     filename : File name in archive to read.
+    archive_pool : ZipArchivePool to reuse an open archive from.
     """
 
-    def __init__(self, path: str, filename: str):
+    def __init__(self, path: str, filename: str, archive_pool=None):
         self.path = path
         self.filename = filename
+        self.archive_pool = archive_pool
 
     def read(self, encoding):
         """Read content into encoded str."""
@@ -156,7 +840,7 @@ class ZipReader:
     def read_bytes(self):
         """Read content into byte string."""
 
-        with ZipFile(self.path, mode='r') as archive:
+        with open_archive(self.path, self.archive_pool) as archive:
             return archive.read(self.filename)
 
     def readlines(self, encoding):
@@ -164,21 +848,154 @@ class ZipReader:
 
         return (line.decode(encoding) for line in self.readlines_bytes())
 
-    def readlines_bytes(self):
+    def readlines_bytes(self, keepends=False):
         """Read content into byte str line iterator."""
 
-        with open_zipfile_archive(self.path, self.filename) as file:
-            for line in file:
-                yield line.rstrip(b'\r\n')
+        with open_zipfile_archive(self.path, self.filename,
+                                  self.archive_pool) as file:
+            if keepends:
+                yield from file
+            else:
+                for line in file:
+                    yield line.rstrip(b'\r\n')
+
+    def stream(self, encoding, buffer_size=TEXT_BUFFER_SIZE):
+        """Read content into str line iterator through an incremental decoder.
+
+        Decompressed bytes are decoded a buffer at a time and lines keep
+        their line endings, so csv.reader can consume them directly and
+        multi-line quoted fields survive. Memory stays at one buffer
+        however large the member is.
+        """
+
+        with open_zipfile_archive(self.path, self.filename, self.archive_pool,
+                                  buffer_size) as file:
+            with TextIOWrapper(file, encoding=encoding, newline='') as text:
+                yield from text
+
+
+class ZipArchivePool:
+    """Keeps one parsed ZipFile open per archive path and modification time.
+
+    The central directory of each archive is parsed once, and parsed
+    again only after the archive file changes, instead of on every
+    member read. Use as a context manager to close the archives.
+    """
+
+    def __init__(self):
+        self.archives = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def archive(self, path: str) -> ZipFile:
+        """Open ZipFile for the archive's current version."""
+
+        mtime = os.stat(path).st_mtime_ns
+        cached_mtime, archive = self.archives.get(path, (None, None))
+
+        if cached_mtime != mtime:
+            if archive is not None:
+                archive.close()
+            archive = ZipFile(path, mode='r')
+            self.archives[path] = (mtime, archive)
+
+        return archive
+
+    def namelist(self, path: str) -> list:
+        return self.archive(path).namelist()
+
+    def reader(self, path: str, filename: str) -> ZipReader:
+        return ZipReader(path, filename, archive_pool=self)
+
+    def match_members(self, path: str, pattern):
+        """Yield archive member names matching a regular expression."""
+
+        return match_files(self.namelist(path), pattern)
+
+    def iter_member_lines(self, path: str, pattern, encoding):
+        """Yield a line stream per matching member, for concatenate_streams."""
+
+        for filename in self.match_members(path, pattern):
+            yield self.reader(path, filename).readlines(encoding)
+
+    def close(self):
+        for _, archive in self.archives.values():
+            archive.close()
+        self.archives.clear()
 
 
 @contextmanager
-def open_zipfile_archive(path, filename):
-    with ZipFile(path, mode='r') as archive:
-        with BufferedReader(archive.open(filename, mode='r')) as file:
+def open_archive(path, archive_pool=None):
+    """Open ZipFile, borrowing it from archive_pool when given."""
+
+    if archive_pool is None:
+        with ZipFile(path, mode='r') as archive:
+            yield archive
+    else:
+        yield archive_pool.archive(path)
+
+
+@contextmanager
+def open_zipfile_archive(path, filename, archive_pool=None,
+                         buffer_size=TEXT_BUFFER_SIZE):
+    with open_archive(path, archive_pool) as archive:
+        with BufferedReader(archive.open(filename, mode='r'), buffer_size) as file:
             yield file
 
 
+@contextmanager
+def open_memory_map(path):
+    """Read-only memory map of a file, empty bytes for an empty file."""
+
+    with open(path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+        else:
+            with buffer:
+                yield buffer
+
+
+def iter_blocks(view, block_size):
+    """Yield consecutive block_size slices of a memoryview."""
+
+    for start in range(0, len(view), block_size):
+        with view[start:start + block_size] as block:
+            yield block
+
+
+def _split_lines(text, keepends):
+    """Lines of a str or bytes block, with or without their line endings.
+
+    Only newline ends a line, and one carriage return before it is
+    dropped with the line ending.
+    """
+
+    if isinstance(text, str):
+        newline, carriage_return, stream = '\n', '\r', StringIO
+    else:
+        newline, carriage_return, stream = b'\n', b'\r', BytesIO
+
+    if keepends:
+        return stream(text)
+
+    # splitlines also ends lines at other separators, so it is used only
+    # when it finds exactly one line per newline.
+    lines = text.splitlines()
+    line_count = text.count(newline) + (text[-1:] not in (newline, text[:0]))
+
+    if len(lines) == line_count:
+        return lines
+
+    return [line[:-1] if line.endswith(carriage_return) else line
+            for line in text.split(newline)][:line_count]
+
+
 def concatenate_streams(streams):
     """Chain a sequence of iterators into a single stream."""
 
@@ -4,7 +4,9 @@ Utilities for filtering sequences.
 
 from itertools import product, chain
 from operator import attrgetter, itemgetter
-from typing import Dict, Generator, List, Tuple
+from typing import Callable, Dict, Generator, List, Sequence, Tuple
+
+from foil.util import find_index
 
 
 class AttributeFilter:
@@ -13,7 +15,8 @@ class AttributeFilter:
 
     Parameters
     ----------
-    keys: group of attribute keys to use as filter set.
+    keys: group of attribute keys to use as filter set, or of int positions
+      for sequences without attributes such as plain tuples.
     predicates: values of attribute set to use in filtering.
     """
 
@@ -22,7 +25,7 @@ class AttributeFilter:
     def __init__(self, keys: Tuple[str], predicates: List[Tuple]):
         self.keys = keys
         self.predicates = set(predicates)
-        self.indexer = attrgetter(*keys)
+        self.indexer = create_key_getter(keys)
 
     def including(self, sequence) -> Generator:
         """Include the sequence elements matching the filter set."""
@@ -34,6 +37,18 @@ class AttributeFilter:
         return (element for element in sequence
                 if self.indexer(element) not in self.predicates)
 
+    def row_predicate(self, header: Sequence[str]) -> Callable:
+        """Row predicate matching keys by header position rather than attribute.
+
+        Applies the filter set to tokenized rows, before any type
+        conversion, so predicates hold the raw field values.
+        """
+
+        indexer = itemgetter(*find_index(header, self.keys))
+        predicates = self.predicates
+
+        return lambda row: indexer(row) in predicates
+
 
 def create_key_filter(properties: Dict[str, list]) -> List[Tuple]:
     """Generate combinations of key, value pairs for each key in properties.
@@ -50,6 +65,15 @@ def create_key_filter(properties: Dict[str, list]) -> List[Tuple]:
     return chain.from_iterable(combinations)
 
 
+def create_key_getter(keys):
+    """Item getter for int positions, attribute getter for names."""
+
+    if all(isinstance(key, int) for key in keys):
+        return itemgetter(*keys)
+    else:
+        return attrgetter(*keys)
+
+
 def create_indexer(indexes: list):
     """Create indexer function to pluck values from list."""
 
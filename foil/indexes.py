@@ -0,0 +1,200 @@
+"""Sidecar row offset indexes for random access into delimited files."""
+
+import json
+import os
+from bisect import bisect_right
+from collections import namedtuple
+
+
+DEFAULT_INTERVAL = 10000
+INDEX_SUFFIX = '.rowidx'
+
+Checkpoint = namedtuple('Checkpoint', ['row', 'offset', 'line_number'])
+Checkpoint.__doc__ = """Start of a data row: byte offset and lines preceding it."""
+
+
+def iter_record_ends(file, quotechar='"', quotes=0):
+    """Yield (offset, line_number) at the end of each record of a binary file.
+
+    Both count from the file's current position. A line ends a record
+    when an even number of quote characters have been read, starting
+    from the quotes preceding the position.
+    """
+
+    quote = quotechar.encode('ascii')
+    offset = 0
+    line_number = 0
+
+    for line in iter(file.readline, b''):
+        offset += len(line)
+        line_number += 1
+        quotes += line.count(quote)
+
+        if not quotes % 2:
+            yield offset, line_number
+
+
+def iter_record_starts(file, quotechar='"'):
+    """Yield (row, offset, line_number) for the start of each data row.
+
+    The header record is skipped, so row 0 is the first data row.
+    """
+
+    for row, (offset, line_number) in enumerate(iter_record_ends(file, quotechar)):
+        yield row, offset, line_number
+
+
+def skip_record(file, quotechar='"') -> int:
+    """Advance a binary file past one record, returning the lines read."""
+
+    for _, line_number in iter_record_ends(file, quotechar):
+        return line_number
+
+    return 0
+
+
+class RowOffsetIndex:
+    """Byte offset and line number of every interval-th data row of a file.
+
+    The index is stored as a JSON sidecar next to the file and records
+    the file's size and mtime; a stale index is rebuilt by open.
+
+    Parameters
+    ----------
+    path: Absolute path to delimited file, header row included.
+    size: file size in bytes when indexed.
+    mtime_ns: file modification time when indexed.
+    interval: data rows between checkpoints.
+    quotechar: dialect quote character used to find record boundaries.
+    checkpoints: Checkpoint of rows 0, interval, 2 * interval, ...
+    """
+
+    def __init__(self, path, size, mtime_ns, interval, quotechar, checkpoints):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.interval = interval
+        self.quotechar = quotechar
+        self.checkpoints = [Checkpoint(*checkpoint) for checkpoint in checkpoints]
+        self.rows = [checkpoint.row for checkpoint in self.checkpoints]
+
+    @classmethod
+    def build(cls, path, interval=DEFAULT_INTERVAL, quotechar='"'):
+        """Index a file by scanning its records."""
+
+        stat = os.stat(path)
+
+        with open(path, 'rb') as file:
+            checkpoints = [start for start in iter_record_starts(file, quotechar)
+                           if not start[0] % interval]
+
+        return cls(path, stat.st_size, stat.st_mtime_ns, interval, quotechar,
+                   checkpoints or [(0, stat.st_size, 0)])
+
+    @classmethod
+    def load(cls, path, index_path=None):
+        """Load the sidecar index, None when missing or stale."""
+
+        try:
+            with open(index_path or path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                index = cls(path=path, **json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        return index if index.is_current() else None
+
+    @classmethod
+    def open(cls, path, interval=DEFAULT_INTERVAL, quotechar='"', index_path=None):
+        """Load the sidecar index, rebuilding and saving it when out of date.
+
+        A rebuilt index that cannot be saved, as in a read-only directory,
+        is still returned.
+        """
+
+        index = cls.load(path, index_path)
+
+        if index is None or (index.interval, index.quotechar) != (interval, quotechar):
+            index = cls.build(path, interval, quotechar)
+            try:
+                index.save(index_path)
+            except OSError:
+                pass
+
+        return index
+
+    def save(self, index_path=None):
+        content = {'size': self.size, 'mtime_ns': self.mtime_ns,
+                   'interval': self.interval, 'quotechar': self.quotechar,
+                   'checkpoints': self.checkpoints}
+
+        with open(index_path or self.path + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(content, f)
+
+    def is_current(self) -> bool:
+        """Whether the file still has the size and mtime it was indexed at."""
+
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    @property
+    def header_lines(self) -> int:
+        return self.checkpoints[0].line_number
+
+    def locate(self, row: int) -> Checkpoint:
+        """Nearest checkpoint at or before a data row."""
+
+        return self.checkpoints[max(bisect_right(self.rows, row) - 1, 0)]
+
+    def seek(self, file, row: int) -> int:
+        """Position a binary file at the start of a data row.
+
+        Returns the count of lines preceding the row.
+        """
+
+        checkpoint = self.locate(row)
+        file.seek(checkpoint.offset)
+        line_number = checkpoint.line_number
+
+        for _ in range(row - checkpoint.row):
+            line_number += skip_record(file, self.quotechar)
+
+        return line_number
+
+    def open_rows(self, start: int, stop=None, encoding='utf-8'):
+        """Return (lines, line_number) for data rows [start, stop).
+
+        lines yields the header lines followed by the row lines, decoded
+        with line endings kept; line_number counts the lines preceding
+        row start in the file.
+        """
+
+        with open(self.path, 'rb') as file:
+            line_number = self.seek(file, start)
+            offset = file.tell()
+
+        return self._readlines(offset, start, stop, encoding), line_number
+
+    def _readlines(self, offset, start, stop, encoding):
+        quote = self.quotechar.encode('ascii')
+        quotes = 0
+        row = start
+
+        with open(self.path, 'rb') as file:
+            header = file.read(self.checkpoints[0].offset)
+
+            for line in header.splitlines(keepends=True):
+                yield line.decode(encoding)
+
+            file.seek(offset)
+
+            for line in iter(file.readline, b''):
+                if stop is not None and row >= stop:
+                    return
+
+                yield line.decode(encoding)
+                quotes += line.count(quote)
+                row += not quotes % 2
@@ -1,12 +1,12 @@
 """Parsing utilities for ETL loading."""
 
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from functools import partial
+from functools import lru_cache, partial
+from operator import methodcaller
 
-import yaml
-
-from foil.dates import parse_date
+from foil import relaxedjson
+from foil.dates import DateTimeParser, parse_date
 
 
 # Boolean string types, empty values for bool casting.
@@ -29,7 +29,7 @@ def passthrough(value):
 
 
 def parse_numeric(cast_function, value):
-    if value is None or value is '':
+    if value is None or value == '':
         return None
     else:
         return cast_function(value)
@@ -63,7 +63,7 @@ def unquote(value):
 
 
 def parse_quoted_numeric(cast_function, value):
-    if value is '' or value == '""':
+    if value == '' or value == '""':
         return None
     else:
         return cast_function(value.replace('"', '', 2))
@@ -75,12 +75,32 @@ parse_quoted_decimal = partial(parse_quoted_numeric, Decimal)
 
 
 def parse_iso_date(value):
-    if value is None or value is '':
+    if value is None or value == '':
         return None
     else:
         return parse_date(value)
 
 
+_datetime_parser = DateTimeParser()
+
+
+def parse_iso_datetime(value, parser=_datetime_parser):
+    if value is None or value == '':
+        return None
+    else:
+        return parser.parse(value)
+
+
+def make_datetime_converter():
+    """parse_iso_datetime with a DateTimeParser of its own.
+
+    A DateTimeParser keeps the layout it parsed last, so datetime fields
+    of different layouts sharing one would switch layouts on every value.
+    """
+
+    return partial(parse_iso_datetime, parser=DateTimeParser())
+
+
 def parse_quoted_string(value):
     if value == '""':
         return None
@@ -98,6 +118,7 @@ TYPE_CASTERS = {
     float: parse_float,
     bool: parse_bool,
     date: parse_iso_date,
+    datetime: parse_iso_datetime,
 }
 
 
@@ -113,9 +134,181 @@ def make_converters(data_types) -> dict:
     -------
     >> make_converters({'student': str, 'score': float, 'grade': Grade) ->
     {'student_name': passthrough, 'score': parse_float, 'grade': Grade)
+
+    Each datetime field gets a converter from make_datetime_converter.
+    """
+
+    converters = {k: TYPE_CASTERS.get(v, v) for k, v in data_types.items()}
+
+    return {k: make_datetime_converter() if v is parse_iso_datetime else v
+            for k, v in converters.items()}
+
+
+def make_row_converter(data_types, field_index=None):
+    """
+    Return a (Record, row converter) pair for the data types mapping.
+
+    The row converter is compiled from make_converters casting functions
+    and turns a row of text into a Record in a single call.
+    Parameters
+    ----------
+    data_types: dict-like
+        data field name str: python primitive type or class.
+    field_index: row position of each field, in data_types order.
+    Example
+    -------
+    >> Record, convert_row = make_row_converter({'student': str, 'score': float})
+    >> convert_row(['Dave', '82.5']) -> Record(student='Dave', score=82.5)
+    """
+    from foil.compilers import compile_row_converter
+
+    converters = make_converters(data_types)
+
+    return compile_row_converter(converters.keys(), converters.values(),
+                                 field_index)
+
+
+# ----------------------------------------------------------
+# Memoized converters for columns of repeated values
+# ----------------------------------------------------------
+
+MEMO_SIZE = 1 << 16
+
+
+def memoize(converter, maxsize=MEMO_SIZE):
+    """
+    Wrap a converter in a bounded LRU memo of value to result, for columns
+    repeating a limited set of values such as dates. The wrapper keeps the
+    converter as __wrapped__, and cache_info() reports hits and misses.
+    """
+
+    return lru_cache(maxsize=maxsize)(converter)
+
+
+def memo_hit_rate(converter) -> float:
+    """Fraction of calls to a memoized converter served from its memo."""
+
+    hits, misses, _, _ = converter.cache_info()
+    calls = hits + misses
+
+    return hits / calls if calls else 0.0
+
+
+parse_iso_date_memo = memoize(parse_iso_date)
+
+
+# ----------------------------------------------------------
+# Parsers for undecoded bytes fields
+# ----------------------------------------------------------
+
+def parse_bytes_numeric(cast_function, value):
+    if not value:
+        return None
+    else:
+        return cast_function(value)
+
+
+# int and float accept ASCII digits as bytes, skipping the decode.
+parse_bytes_int = partial(parse_bytes_numeric, int)
+parse_bytes_float = partial(parse_bytes_numeric, float)
+
+BYTES_CONVERTERS = {
+    parse_int: parse_bytes_int,
+    parse_float: parse_bytes_float,
+    int: int,
+    float: float,
+}
+
+
+def decode_then(converter, encoding, value):
+    return converter(value.decode(encoding))
+
+
+def make_bytes_converters(converters, encoding) -> list:
     """
+    Return converters accepting bytes fields. Numeric converters cast
+    the bytes directly, other converters receive the decoded text.
+    """
+
+    bytes_converters = []
+
+    for converter in converters:
+        try:
+            bytes_converter = BYTES_CONVERTERS.get(converter)
+        except TypeError:
+            bytes_converter = None
+
+        if bytes_converter is not None:
+            bytes_converters.append(bytes_converter)
+        elif converter in (passthrough, str):
+            bytes_converters.append(methodcaller('decode', encoding))
+        else:
+            bytes_converters.append(partial(decode_then, converter, encoding))
+
+    return bytes_converters
+
+
+# ----------------------------------------------------------
+# Formatters writing Python objects back to parsable text
+# ----------------------------------------------------------
+
+bool_strings = {True: 'true', False: 'false', None: ''}
+
+
+def format_numeric(value):
+    if value is None:
+        return ''
+    else:
+        return str(value)
+
+
+format_int = format_float = format_decimal = format_numeric
 
-    return {k: TYPE_CASTERS.get(v, v) for k, v in data_types.items()}
+
+def format_bool(value):
+    return bool_strings[value]
+
+
+def format_iso_date(value):
+    if value is None:
+        return ''
+    else:
+        return value.isoformat()
+
+
+def format_iso_datetime(value):
+    if value is None:
+        return ''
+    else:
+        return value.isoformat()
+
+
+TYPE_FORMATTERS = {
+    str: passthrough,
+    int: format_int,
+    float: format_float,
+    bool: format_bool,
+    date: format_iso_date,
+    datetime: format_iso_datetime,
+    Decimal: format_decimal,
+}
+
+
+def make_formatters(data_types) -> dict:
+    """
+    Return a mapping between data type names, and formatting functions
+    writing Python objects as text that TYPE_CASTERS parse back.
+    Parameters
+    ----------
+    data_types: dict-like
+        data field name str: python primitive type or formatting function.
+    Example
+    -------
+    >> make_formatters({'student': str, 'score': float}) ->
+    {'student_name': passthrough, 'score': format_float}
+    """
+
+    return {k: TYPE_FORMATTERS.get(v, v) for k, v in data_types.items()}
 
 
 def parse_broken_json(json_text: str) -> dict:
@@ -124,12 +317,14 @@ def parse_broken_json(json_text: str) -> dict:
 
     Ex: {success:true}
 
-    Keys do not contain quotes and the JSON cannot be parsed using the regular json encoder.
-    YAML happens to be a superset of JSON and can parse json without quotes.
+    Keys do not contain quotes, strings may be single quoted and objects
+    or arrays may end in a trailing comma. See foil.relaxedjson.
     """
 
-    # Add spacing between Key and Value to prevent parsing error
-    json_text = json_text.replace(":", ": ")
-    json_dict = yaml.load(json_text)
+    return relaxedjson.loads(json_text)
+
+
+def iter_broken_json(stream, chunk_size=relaxedjson.CHUNK_SIZE):
+    """Yield broken JSON documents from a text stream, read in chunks."""
 
-    return json_dict
+    return relaxedjson.iter_documents(stream, chunk_size)
@@ -50,19 +50,26 @@ def match_files(files, pattern: Pattern):
             yield name
 
 
-def match_zipfile_members(zipfile_path: str, pattern: Pattern):
-    """Match files to a pattern within a zip file's content."""
+def match_zipfile_members(zipfile_path: str, pattern: Pattern,
+                          archive_pool=None):
+    """Match files to a pattern within a zip file's content.
 
-    with ZipFile(zipfile_path, mode='r') as zfile:
-        members = zfile.namelist()
+    An archive_pool (foil.fileio.ZipArchivePool) reuses its parsed archive.
+    """
+
+    if archive_pool is None:
+        with ZipFile(zipfile_path, mode='r') as zfile:
+            members = zfile.namelist()
+    else:
+        members = archive_pool.namelist(zipfile_path)
 
     yield from match_files(members, pattern)
 
 
-def find_zipfile_member(zipfile_path: str, pattern: Pattern):
+def find_zipfile_member(zipfile_path: str, pattern: Pattern, archive_pool=None):
     """Return the first match to a regex within a zip file's content."""
 
-    return next(match_zipfile_members(zipfile_path, pattern))
+    return next(match_zipfile_members(zipfile_path, pattern, archive_pool))
 
 
 def directory_files(path):
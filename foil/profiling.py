@@ -0,0 +1,275 @@
+"""Opt-in throughput and timing instrumentation for delimited readers.
+
+Readers given a ReaderStats wrap their line stream, tokenized rows,
+row converter and each field converter in timers. Readers without
+stats run the uninstrumented code path unchanged.
+
+Stages
+------
+read: pulling and decoding lines from the stream.
+tokenize: splitting lines into fields, and row filtering.
+convert: field converters, timed per field.
+record: Record construction and the remaining row converter time.
+
+Usage
+-----
+python -m foil.profiling path [--delimiter ,] [--types int,str,...]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import OrderedDict
+
+from foil.compilers import _is_passthrough
+
+
+class Timer:
+    """Cumulative call count and seconds of a timed function."""
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return 'Timer(calls={}, seconds={:.6f})'.format(self.calls, self.seconds)
+
+
+class ReaderStats:
+    """Counters and cumulative timings collected by an instrumented reader.
+
+    Timers measure inclusive time; stage_seconds reports each stage
+    exclusive of the stages it wraps. Timing overhead is charged to the
+    record stage.
+
+    Parameters
+    ----------
+    encoding: encoding used to count bytes of lines from streams
+      without an encoding attribute.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        self.encoding = encoding
+        self.bytes = 0
+        self.read = Timer()
+        self.tokenize = Timer()
+        self.convert_row = Timer()
+        self.converters = OrderedDict()
+
+    @property
+    def rows(self) -> int:
+        return self.convert_row.calls
+
+    @property
+    def seconds(self) -> float:
+        """Time spent inside the reader, excluding the consumer."""
+
+        return self.tokenize.seconds + self.convert_row.seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def stage_seconds(self) -> OrderedDict:
+        converted = sum(timer.seconds for timer in self.converters.values())
+
+        return OrderedDict([
+            ('read', self.read.seconds),
+            ('tokenize', self.tokenize.seconds - self.read.seconds),
+            ('convert', converted),
+            ('record', self.convert_row.seconds - converted),
+        ])
+
+    def count_lines(self, stream):
+        """Iterate stream lines, timing reads and counting encoded bytes."""
+
+        encoding = getattr(stream, 'encoding', None) or self.encoding
+        lines = iter(stream)
+        timer = self.read
+        perf_counter = time.perf_counter
+
+        while True:
+            start = perf_counter()
+            line = next(lines, None)
+            timer.seconds += perf_counter() - start
+
+            if line is None:
+                return
+
+            timer.calls += 1
+            self.bytes += len(line.encode(encoding) if isinstance(line, str)
+                              else line)
+            yield line
+
+    def time_rows(self, rows):
+        """Iterate tokenized rows, timing each row fetched."""
+
+        return time_iterator(rows, self.tokenize)
+
+    def time_row_converter(self, convert_row):
+        return timed(convert_row, self.convert_row)
+
+    def time_converters(self, fields, converters) -> list:
+        """Wrap each field converter in a timer, passthrough excepted."""
+
+        timed_converters = []
+
+        for field, converter in zip(fields, converters):
+            if _is_passthrough(converter):
+                timed_converters.append(converter)
+            else:
+                timer = self.converters.setdefault(field, Timer())
+                timed_converters.append(timed(converter, timer))
+
+        return timed_converters
+
+    def as_dict(self) -> dict:
+        return {
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'seconds': self.seconds,
+            'rows_per_second': self.rows_per_second,
+            'bytes_per_second': self.bytes_per_second,
+            'stages': self.stage_seconds(),
+            'converters': OrderedDict(
+                (field, {'calls': timer.calls, 'seconds': timer.seconds})
+                for field, timer in self.converters.items()),
+        }
+
+    def report(self) -> str:
+        lines = ['{:,} rows  {:,} bytes  {:.3f} s  {:,.0f} rows/s  {:,.0f} bytes/s'
+                 .format(self.rows, self.bytes, self.seconds,
+                         self.rows_per_second, self.bytes_per_second),
+                 '', 'stage         seconds']
+        lines.extend('{:<12} {:>8.3f}'.format(stage, seconds)
+                     for stage, seconds in self.stage_seconds().items())
+        lines.extend(['', '{:<24} {:>10} {:>8}'.format('converter', 'calls', 'seconds')])
+        lines.extend('{:<24} {:>10,} {:>8.3f}'.format(field, timer.calls, timer.seconds)
+                     for field, timer in self.converters.items())
+
+        return '\n'.join(lines)
+
+
+def timed(function, timer: Timer):
+    """Wrap a single argument function to accumulate its calls and time."""
+
+    perf_counter = time.perf_counter
+
+    def timed_function(value):
+        start = perf_counter()
+        try:
+            return function(value)
+        finally:
+            timer.seconds += perf_counter() - start
+            timer.calls += 1
+
+    return timed_function
+
+
+def time_iterator(iterable, timer: Timer):
+    """Iterate, accumulating the items fetched and time spent fetching."""
+
+    iterator = iter(iterable)
+    perf_counter = time.perf_counter
+    sentinel = object()
+
+    while True:
+        start = perf_counter()
+        item = next(iterator, sentinel)
+        timer.seconds += perf_counter() - start
+
+        if item is sentinel:
+            return
+
+        timer.calls += 1
+        yield item
+
+
+def profile_file(path, encoding, dialect, field_names=None, types=None,
+                 limit=None) -> ReaderStats:
+    """Read a delimited file with instrumentation, returning its stats.
+
+    Parameters
+    ----------
+    field_names: header fields to read, all fields if None.
+    types: foil.schemas type names of the fields read, inferred if None.
+    limit: maximum rows read.
+    """
+    from itertools import islice
+
+    from foil.fileio import DelimitedReader, DelimitedSubsetReader
+    from foil.schemas import Schema, infer_file_schema
+    from foil.util import find_index
+
+    header = list(DelimitedReader.file_headers(path, encoding, dialect))
+    field_names = list(field_names or header)
+    field_index = find_index(header, field_names)
+
+    if types is None:
+        schema = infer_file_schema(path, encoding, dialect)
+        types = [schema.types[index] for index in field_index]
+
+    converters = Schema(field_names, types).converters
+    fields = ['f{}'.format(index) for index in field_index]
+    stats = ReaderStats(encoding)
+
+    if field_index == list(range(len(header))):
+        reader = DelimitedReader.from_file(path, encoding, dialect, fields,
+                                           converters, stats=stats)
+    else:
+        reader = DelimitedSubsetReader.from_file(path, encoding, dialect, fields,
+                                                 converters, field_index,
+                                                 stats=stats)
+
+    with reader:
+        for _ in islice(reader, limit):
+            pass
+
+    stats.converters = OrderedDict(
+        (header[index], stats.converters[field]) for index, field
+        in zip(field_index, fields) if field in stats.converters)
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m foil.profiling',
+        description='Profile reading a delimited file with a given schema.')
+    parser.add_argument('path')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--quotechar', default='"')
+    parser.add_argument('--fields', help='comma separated header fields to read')
+    parser.add_argument('--types', help='comma separated foil.schemas type names')
+    parser.add_argument('--limit', type=int, help='maximum rows read')
+    parser.add_argument('--json', action='store_true', help='print stats as JSON')
+    args = parser.parse_args(argv)
+
+    class Dialect(csv.excel):
+        delimiter = args.delimiter
+        quotechar = args.quotechar
+
+    stats = profile_file(args.path, args.encoding, Dialect,
+                         _split(args.fields), _split(args.types), args.limit)
+
+    if args.json:
+        print(json.dumps(stats.as_dict(), indent=2))
+    else:
+        print(stats.report())
+
+
+def _split(text):
+    return text.split(',') if text else None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Record representations produced by delimited readers.
+
+namedtuple: collections.namedtuple Records, the default.
+tuple: plain tuples, indexed by position only.
+slots: __slots__ based Records without the tuple length header.
+columnar: Record views over column buffers shared by every row read.
+
+Records other than plain tuples support attribute and index access,
+so attrgetter and itemgetter key functions work across them.
+"""
+
+import sys
+from array import array
+from collections import namedtuple
+from itertools import zip_longest
+from operator import attrgetter
+
+from foil.parsers import parse_float, parse_int
+
+
+COLUMN_TYPECODES = {
+    int: 'q',
+    float: 'd',
+    parse_int: 'q',
+    parse_float: 'd',
+}
+
+SLOTS_INIT_TEMPLATE = """\
+def __init__(self, {args}):
+{assignments}
+    pass
+"""
+
+
+class RecordBase:
+    """Tuple protocol for records built on attribute storage.
+
+    Subclasses define _values, returning the field values as a tuple.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __iter__(self):
+        return iter(self._values())
+
+    def __getitem__(self, index):
+        return self._values()[index]
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        try:
+            return self._values() == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(
+            '{}={!r}'.format(field, value)
+            for field, value in zip(self._fields, self._values())))
+
+    def _asdict(self) -> dict:
+        return dict(zip(self._fields, self._values()))
+
+
+class SlotsRecord(RecordBase):
+    """Record storing each field in a slot."""
+
+    __slots__ = ()
+
+    def _values(self):
+        return self._getter(self)
+
+
+def make_slots_record(fields) -> type:
+    """Create a SlotsRecord class for the field names."""
+
+    fields = tuple(fields)
+    source = SLOTS_INIT_TEMPLATE.format(
+        args=', '.join(fields),
+        assignments=''.join('    self.{0} = {0}\n'.format(f) for f in fields))
+    namespace = {}
+    exec(source, namespace)
+
+    return type('Record', (SlotsRecord,), {
+        '__slots__': fields,
+        '_fields': fields,
+        '_getter': staticmethod(_tuple_getter(fields)),
+        '__init__': namespace['__init__'],
+    })
+
+
+class RecordView(RecordBase):
+    """Record reading its fields from a row of shared column buffers."""
+
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def _values(self):
+        index = self._index
+        return tuple(column[index] for column in self._columns)
+
+    def _footprint(self):
+        row_size = sum(column.itemsize if isinstance(column, array)
+                       else 8 + sys.getsizeof(column[self._index])
+                       for column in self._columns)
+
+        return sys.getsizeof(self) + row_size
+
+
+class ColumnarRecords:
+    """Column buffers holding every row appended, viewed as records.
+
+    Fields cast by int or float converters are stored in typed arrays,
+    other fields in lists. A typed column turns into a list the first
+    time it receives a value the array cannot hold, such as None.
+
+    Parameters
+    ----------
+    fields: Record field names.
+    converters: casting functions for each field, choosing column storage.
+    """
+
+    def __init__(self, fields, converters=()):
+        self.fields = tuple(fields)
+        self.columns = [_new_column(converter) for _, converter
+                        in zip_longest(self.fields, converters)][:len(self.fields)]
+        self.View = _make_record_view(self.fields)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index):
+        return self.View(self.columns, range(len(self))[index])
+
+    def __iter__(self):
+        View, columns = self.View, self.columns
+        return (View(columns, index) for index in range(len(self)))
+
+    def append(self, *values):
+        """Append a row of values, returning its record view."""
+
+        columns = self.columns
+
+        for position, value in enumerate(values):
+            try:
+                columns[position].append(value)
+            except (TypeError, OverflowError):
+                columns[position] = list(columns[position])
+                columns[position].append(value)
+
+        return self.View(columns, len(columns[0]) - 1 if columns else 0)
+
+
+RECORD_TYPES = {
+    'namedtuple': lambda fields, converters: namedtuple('Record', fields),
+    'tuple': lambda fields, converters: tuple,
+    'slots': lambda fields, converters: make_slots_record(fields),
+    'columnar': ColumnarRecords,
+}
+
+
+def make_record_type(fields, record_type='namedtuple', converters=()):
+    """Record class, or ColumnarRecords buffer, for a record type name."""
+
+    try:
+        factory = RECORD_TYPES[record_type]
+    except KeyError:
+        raise ValueError('record_type must be one of {}'.format(
+            ', '.join(RECORD_TYPES))) from None
+
+    return factory(tuple(fields), tuple(converters))
+
+
+def record_footprint(record) -> int:
+    """Bytes held per row by a record, its container plus field values.
+
+    Values shared between records are counted for each record, so the
+    footprint is an upper bound for repeated values.
+    """
+
+    try:
+        return record._footprint()
+    except AttributeError:
+        return sys.getsizeof(record) + sum(map(sys.getsizeof, record))
+
+
+def _make_record_view(fields) -> type:
+    properties = {field: property(_column_getter(position))
+                  for position, field in enumerate(fields)}
+
+    return type('Record', (RecordView,), dict(
+        properties, __slots__=(), _fields=fields))
+
+
+def _column_getter(position):
+    def getter(self):
+        return self._columns[position][self._index]
+
+    return getter
+
+
+def _new_column(converter):
+    try:
+        return array(COLUMN_TYPECODES[converter])
+    except (KeyError, TypeError):
+        return []
+
+
+def _tuple_getter(fields):
+    getter = attrgetter(*fields) if fields else (lambda record: ())
+
+    if len(fields) == 1:
+        return lambda record: (getter(record),)
+
+    return getter
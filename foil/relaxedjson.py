@@ -0,0 +1,152 @@
+"""Parse relaxed JSON: unquoted keys, single quoted strings and trailing commas.
+
+Relaxed text is rewritten to strict JSON in a single regex pass and
+decoded by the json module. Quoted strings are matched whole, so colons,
+commas and quotes inside values are left untouched.
+
+Bare scalars other than numbers and true, false, null, NaN and Infinity
+are quoted, so unquoted keys such as content-type and unquoted values
+such as 2014-01-01 are read as strings. Numbers may have a leading plus
+or dot or a trailing dot, as in +1, .5 and 1.
+
+Unlike YAML, dates and times are read as strings rather than date
+objects, and a bare scalar ends at whitespace, so {a: b c} is invalid.
+
+Example
+-------
+loads("{success: true, url: 'http://example.com', items: [1, 2,],}")
+-> {'success': True, 'url': 'http://example.com', 'items': [1, 2]}
+"""
+
+import json
+import re
+from functools import partial
+from itertools import chain
+
+
+CHUNK_SIZE = 1 << 16
+
+# Characters after a token that may still extend it, as in '1.' or '1e+'.
+_EXTEND_LENGTH = 3
+
+KEYWORDS = frozenset(['true', 'false', 'null', 'NaN', 'Infinity', '-Infinity'])
+
+# A bare scalar runs up to whitespace or a structural character.
+_BARE = r'''[^\s,:{}\[\]"']'''
+
+_VALUE_TOKENS = (
+    r'(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")'
+    r"|(?P<single>'[^'\\]*(?:\\.[^'\\]*)*')"
+    r'|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?!' + _BARE + ')'
+    r'|(?P<loose>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(?!' + _BARE + ')'
+    r'|(?P<word>' + _BARE + '+)'
+    r'|(?P<comma>,\s*(?P<trailing>[}\]])?)')
+
+_TOKEN = re.compile(_VALUE_TOKENS, re.DOTALL)
+
+# Brackets are tracked to split documents, and a quote that starts no
+# complete string marks a string continued in the next chunk.
+_STREAM_TOKEN = re.compile(
+    _VALUE_TOKENS + r'|(?P<open>[{\[])|(?P<close>[}\]])|(?P<unterminated>["\'])',
+    re.DOTALL)
+
+_SINGLE_ESCAPE = re.compile(r'\\(.)|"', re.DOTALL)
+
+_LEADING_DOT = re.compile(r'(?<!\d)\.')
+_TRAILING_DOT = re.compile(r'\.(?!\d)')
+
+
+def _rewrite_single(match) -> str:
+    escaped = match.group(1)
+
+    if escaped is None:
+        return '\\"'
+
+    return "'" if escaped == "'" else match.group(0)
+
+
+def _rewrite_token(match) -> str:
+    kind = match.lastgroup
+    token = match.group(0)
+
+    if kind == 'single':
+        content = token[1:-1]
+        if '\\' in content or '"' in content:
+            content = _SINGLE_ESCAPE.sub(_rewrite_single, content)
+        return '"{}"'.format(content)
+    if kind == 'loose':
+        return _TRAILING_DOT.sub('.0', _LEADING_DOT.sub('0.', token.lstrip('+')))
+    if kind == 'word':
+        return token if token in KEYWORDS else '"{}"'.format(token)
+    if kind == 'comma' and match.group('trailing'):
+        return token[1:]
+
+    return token
+
+
+def to_json(text: str) -> str:
+    """Rewrite relaxed JSON text as strict JSON text."""
+
+    return _TOKEN.sub(_rewrite_token, text)
+
+
+def loads(text: str, **options):
+    """Parse relaxed JSON text.
+
+    Options are passed to json.loads, such as object_hook.
+    """
+
+    return json.loads(to_json(text), **options)
+
+
+def iter_documents(stream, chunk_size=CHUNK_SIZE, **options):
+    """Yield relaxed JSON documents read from a text stream.
+
+    Documents may be concatenated or separated by whitespace, such as
+    one per line. The stream is read chunk_size characters at a time and
+    each document is decoded as soon as it is complete, so a large
+    stream is never held in memory at once.
+
+    Options are passed to json.JSONDecoder.
+    """
+
+    decode = json.JSONDecoder(**options).decode
+    chunks = chain(iter(partial(stream.read, chunk_size), ''), [None])
+    document = []
+    depth = 0
+    pending = ''
+
+    for chunk in chunks:
+        final = chunk is None
+        text = pending + (chunk or '')
+        position = 0
+
+        for match in _STREAM_TOKEN.finditer(text):
+            kind = match.lastgroup
+
+            incomplete = match.end() + _EXTEND_LENGTH > len(text)
+
+            if not final and (incomplete or kind == 'unterminated'):
+                break
+
+            document.append(text[position:match.start()])
+            document.append(_rewrite_token(match))
+            position = match.end()
+
+            if kind == 'open':
+                depth += 1
+            elif kind == 'close' or kind == 'comma' and match.group('trailing'):
+                depth -= 1
+            elif kind == 'comma' and depth == 0:
+                raise ValueError('comma between documents at {}'.format(match.start()))
+
+            if depth == 0:
+                yield decode(''.join(document))
+                document = []
+
+        pending = text[position:]
+
+    remainder = ''.join(document) + pending
+
+    if remainder.strip():
+        yield decode(remainder)
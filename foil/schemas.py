@@ -0,0 +1,258 @@
+"""Schema inference for delimited files from sampled rows.
+
+Rows are reservoir sampled and each column is assigned the most
+specific type whose converter parses every non-empty sampled value.
+Columns whose values all carry literal quotes are typed by their
+unquoted content.
+"""
+
+import csv
+import json
+import os
+import random
+import re
+from collections import namedtuple
+from hashlib import sha256
+from itertools import islice
+from zipfile import ZipFile
+
+from foil.dates import IsoDatePattern
+from foil.fileio import ZipReader
+from foil.parsers import (boolean_strings, parse_bool, parse_decimal,
+                          make_datetime_converter, parse_float, parse_int,
+                          parse_iso_date, parse_iso_datetime, parse_quoted_bool,
+                          parse_quoted_decimal, parse_quoted_float,
+                          parse_quoted_int, parse_quoted_string,
+                          passthrough)
+
+
+DEFAULT_SAMPLE_SIZE = 1000
+FINGERPRINT_SIZE = 1 << 20
+
+# Significant digits beyond which float cannot hold a value exactly.
+FLOAT_DIGITS = 15
+
+_RE_INT = re.compile(r'[-+]?\d+')
+_RE_FLOAT = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_RE_DATE = re.compile(IsoDatePattern().date)
+_RE_DATETIME = re.compile(
+    r'{0.YEAR}-{0.MONTH}-{0.DAY}[T\s]{0.HOUR}:{0.MINUTE}:'
+    r'{0.SECOND}{0.MICROSECOND}\s?{0.TIMEZONE}'.format(IsoDatePattern))
+_RE_SIGNIFICANT = re.compile(r'[1-9](?:[\d.]*\d)?')
+
+# Candidate types from most to least specific, with a pattern screening
+# values before their converter is tried.
+TYPE_CHECKS = (
+    ('bool', lambda value: value in boolean_strings),
+    ('int', _RE_INT.fullmatch),
+    ('float', _RE_FLOAT.fullmatch),
+    ('date', _RE_DATE.fullmatch),
+    ('datetime', _RE_DATETIME.fullmatch),
+)
+
+CONVERTERS = {
+    'bool': parse_bool,
+    'int': parse_int,
+    'decimal': parse_decimal,
+    'float': parse_float,
+    'date': parse_iso_date,
+    'datetime': parse_iso_datetime,
+    'str': passthrough,
+    'quoted_bool': parse_quoted_bool,
+    'quoted_int': parse_quoted_int,
+    'quoted_decimal': parse_quoted_decimal,
+    'quoted_float': parse_quoted_float,
+    'quoted_str': parse_quoted_string,
+}
+
+
+class Schema(namedtuple('Schema', ['fields', 'types'])):
+    """Field names and inferred type names of a delimited file."""
+
+    __slots__ = ()
+
+    @property
+    def converters(self) -> list:
+        return [make_datetime_converter() if type_name == 'datetime'
+                else CONVERTERS[type_name] for type_name in self.types]
+
+
+def reservoir_sample(iterable, sample_size, rng=random):
+    """Uniform random sample of sample_size items in a single pass."""
+
+    iterator = iter(iterable)
+    sample = list(islice(iterator, sample_size))
+
+    for count, item in enumerate(iterator, start=sample_size + 1):
+        index = rng.randrange(count)
+        if index < sample_size:
+            sample[index] = item
+
+    return sample
+
+
+def infer_type(values) -> str:
+    """Most specific type name that every non-empty value parses as."""
+
+    values = [value for value in values if value not in ('', '""')]
+
+    if values and all(_is_quoted(value) for value in values):
+        inner = infer_type([value[1:-1] for value in values])
+        return 'quoted_' + ('str' if inner in ('date', 'datetime') else inner)
+
+    candidates = [name for name, check in TYPE_CHECKS
+                  if all(map(check, values)) and _all_parse(CONVERTERS[name], values)
+                  ] if values else []
+
+    if 'bool' in candidates and not set(values) & {'true', 'false'}:
+        candidates.remove('bool')
+
+    type_name = candidates[0] if candidates else 'str'
+
+    if type_name == 'float' and any(map(_exceeds_float, values)):
+        type_name = 'decimal'
+
+    return type_name
+
+
+def infer_schema(stream, dialect, sample_size=DEFAULT_SAMPLE_SIZE, seed=0) -> Schema:
+    """Infer a Schema from the header and a sample of rows in a text stream.
+
+    Blank lines are skipped; rows with fewer fields than the header
+    raise ValueError.
+    """
+
+    reader = csv.reader(stream, dialect=dialect)
+    fields = next(reader)
+    rows = _checked_rows(reader, len(fields))
+    sample = reservoir_sample(rows, sample_size, random.Random(seed))
+    columns = zip(*sample) if sample else ([] for _ in fields)
+
+    return Schema(fields, [infer_type(column) for column in columns])
+
+
+def file_schema_key(path, dialect) -> str:
+    """Hash of a file's size, mtime, leading content and dialect.
+
+    The mtime catches changes past the leading content that keep the size.
+    """
+
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        head = f.read(FINGERPRINT_SIZE)
+
+    return _fingerprint((stat.st_size, stat.st_mtime_ns), head, dialect)
+
+
+def zipfile_schema_key(path, filename, dialect) -> str:
+    """Hash of an archive member's size and CRC and dialect."""
+
+    with ZipFile(path, mode='r') as archive:
+        info = archive.getinfo(filename)
+
+    return _fingerprint(info.file_size, str(info.CRC).encode('ascii'), dialect)
+
+
+def infer_file_schema(path, encoding, dialect, sample_size=DEFAULT_SAMPLE_SIZE,
+                      cache=None, seed=0) -> Schema:
+    """Infer the Schema of a delimited text file, reusing a cached schema."""
+
+    def sample():
+        with open(path, 'r', encoding=encoding, newline='') as stream:
+            return infer_schema(stream, dialect, sample_size, seed)
+
+    return _cached(cache, lambda: file_schema_key(path, dialect), sample)
+
+
+def infer_zipfile_schema(path, filename, encoding, dialect,
+                         sample_size=DEFAULT_SAMPLE_SIZE, cache=None,
+                         seed=0) -> Schema:
+    """Infer the Schema of a delimited zip archive member."""
+
+    def sample():
+        stream = ZipReader(path, filename).stream(encoding)
+        return infer_schema(stream, dialect, sample_size, seed)
+
+    return _cached(cache, lambda: zipfile_schema_key(path, filename, dialect),
+                   sample)
+
+
+class SchemaCache:
+    """Inferred schemas stored as JSON files named by content fingerprint.
+
+    Parameters
+    ----------
+    directory: cache directory, created when missing.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, fingerprint):
+        try:
+            with open(self._path(fingerprint), 'r', encoding='utf-8') as f:
+                return Schema(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, fingerprint, schema: Schema):
+        with open(self._path(fingerprint), 'w', encoding='utf-8') as f:
+            json.dump(schema._asdict(), f)
+
+    def _path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint + '.json')
+
+
+def _cached(cache, fingerprint, infer):
+    if cache is None:
+        return infer()
+
+    key = fingerprint()
+    schema = cache.get(key)
+
+    if schema is None:
+        schema = infer()
+        cache.put(key, schema)
+
+    return schema
+
+
+def _fingerprint(size, content, dialect):
+    dialect = csv.get_dialect(dialect) if isinstance(dialect, str) else dialect
+    digest = sha256('{}|{!r}|{!r}|'.format(size, dialect.delimiter,
+                                           dialect.quotechar).encode('utf-8'))
+    digest.update(content)
+
+    return digest.hexdigest()
+
+
+def _checked_rows(reader, width):
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            raise ValueError('line {}: expected {} fields, got {}'.format(
+                reader.line_num, width, len(row)))
+        yield row
+
+
+def _all_parse(converter, values):
+    try:
+        for value in values:
+            converter(value)
+    except (ValueError, TypeError, KeyError, AttributeError, OverflowError):
+        return False
+
+    return True
+
+
+def _is_quoted(value):
+    return len(value) >= 2 and value[0] == value[-1] == '"'
+
+
+def _exceeds_float(value):
+    mantissa = value.lower().split('e')[0]
+    significant = _RE_SIGNIFICANT.search(mantissa)
+
+    return bool(significant) and len(significant.group().replace('.', '')) > FLOAT_DIGITS
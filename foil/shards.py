@@ -0,0 +1,253 @@
+"""Parallel parsing of delimited data split into shards.
+
+A shard is either a byte range of a delimited file or a member of a
+zip archive. Shards are parsed in a process pool into tuples, which
+are turned into Records in the calling process.
+"""
+
+import csv
+import io
+import os
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
+
+from foil.fileio import ZipReader, _get_dialect, open_memory_map
+from foil.indexes import iter_record_ends
+
+
+DEFAULT_SHARD_SIZE = 1 << 26
+
+Shard = namedtuple('Shard', ['start', 'end', 'line_number'])
+Shard.__doc__ = """Byte range [start, end) of whole records in a file.
+
+line_number counts the physical lines preceding start, so adding a
+reader's line_num gives the original file line number.
+"""
+
+
+def count_range(path, quotechar, span) -> tuple:
+    """Newlines and quote characters in a [start, end) byte range of a file."""
+
+    start, end = span
+
+    with open_memory_map(path) as buffer:
+        data = buffer[start:end]
+
+    return data.count(b'\n'), data.count(quotechar.encode('ascii'))
+
+
+def find_shards(path, shard_size=DEFAULT_SHARD_SIZE, quotechar='"',
+                skip_header=True, map=map):
+    """Split a delimited file into shards of roughly shard_size bytes.
+
+    Newlines and quotes of each shard_size range are counted with map,
+    which may be an executor's map. Their running totals give the quote
+    parity and line number at each split, which is then moved forward
+    to the next record boundary so splits never fall inside a quoted
+    field.
+    """
+
+    size = os.path.getsize(path)
+    targets = range(0, size, shard_size)
+    spans = [(target, min(target + shard_size, size)) for target in targets]
+    counts = map(partial(count_range, path, quotechar), spans)
+    boundaries = []
+    line_number = quotes = 0
+
+    with open(path, 'rb') as file:
+        for target, (newlines, quote_count) in zip(targets, counts):
+            if not boundaries or boundaries[-1][0] <= target:
+                file.seek(target)
+                for offset, lines in iter_record_ends(file, quotechar, quotes):
+                    boundaries.append((target + offset, line_number + lines))
+                    break
+
+            line_number += newlines
+            quotes += quote_count
+
+    boundaries = [boundary for boundary in boundaries if boundary[0] < size]
+
+    if not skip_header:
+        boundaries[:1] = [(0, 0)]
+
+    ends = [start for start, _ in boundaries[1:]] + [size]
+
+    return [Shard(start, end, line_number)
+            for (start, line_number), end in zip(boundaries, ends)]
+
+
+def parse_shard(path, shard, encoding, dialect, converters):
+    """Parse a shard into tuples of converted values."""
+
+    with open_memory_map(path) as buffer:
+        with memoryview(buffer) as view:
+            text = str(view[shard.start:shard.end], encoding)
+
+    reader = csv.reader(io.StringIO(text, newline=''), dialect=dialect)
+
+    return convert_rows(reader, converters, path, shard.line_number)
+
+
+def parse_zipfile_member(path, filename, encoding, dialect, converters):
+    """Parse a zip archive member, header row skipped, into tuples."""
+
+    reader = csv.reader(ZipReader(path, filename).stream(encoding),
+                        dialect=dialect)
+    next(reader, None)
+
+    return convert_rows(reader, converters, '{}:{}'.format(path, filename))
+
+
+def convert_rows(reader, converters, source, line_offset=0):
+    """Convert csv reader rows to tuples, locating failures by file line."""
+
+    rows = []
+
+    try:
+        for row in reader:
+            rows.append(tuple(type_converter(item) for type_converter, item
+                              in zip(converters, row)))
+    except (TypeError, ValueError) as exc:
+        raise ValueError('{} line {}: {}'.format(
+            source, line_offset + reader.line_num, exc)) from exc
+
+    return rows
+
+
+def bounded_map(executor, function, items, max_in_flight, ordered=True):
+    """Yield (item, result) pairs keeping at most max_in_flight tasks submitted.
+
+    Ordered results follow item order, otherwise results are yielded
+    as tasks complete.
+    """
+
+    items = iter(items)
+    pending = deque()
+
+    def submit(count):
+        for item in islice(items, count):
+            pending.append((item, executor.submit(function, item)))
+
+    submit(max_in_flight)
+
+    while pending:
+        if ordered:
+            done = [pending.popleft()]
+        else:
+            wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+            done = [task for task in pending if task[1].done()]
+            for task in done:
+                pending.remove(task)
+
+        for item, future in done:
+            result = future.result()
+            submit(1)
+            yield item, result
+
+
+class ShardedDelimitedReader:
+    """Read a delimited file into namedtuple Records using a process pool.
+
+    The file is split into byte range shards on record boundaries and
+    each shard is parsed in a worker process with the same dialect and
+    converters as DelimitedReader. Converters and dialect must pickle.
+
+    Parameters
+    ----------
+    path: Absolute path to delimited file, header row included.
+    encoding: File encoding.
+    dialect: delimited file attributes.
+    fields: Record field names.
+    converters: casting functions to cast fields to Python objects.
+    shard_size: approximate bytes per shard.
+    processes: worker process count, defaults to CPU count.
+    ordered: yield shards in file order, or as each shard completes.
+    max_in_flight: shards parsed or held ahead of the consumer,
+      defaults to twice the worker count.
+    """
+
+    def __init__(self, path, encoding, dialect: csv.Dialect, fields: list,
+                 converters: list, shard_size=DEFAULT_SHARD_SIZE,
+                 processes=None, ordered=True, max_in_flight=None):
+        self.path = path
+        self.encoding = encoding
+        self.dialect = dialect
+        self.converters = converters
+        self.shard_size = shard_size
+        self.processes = processes or os.cpu_count()
+        self.ordered = ordered
+        self.max_in_flight = max_in_flight or 2 * self.processes
+        self.Record = namedtuple('Record', fields)
+
+    def __iter__(self):
+        for shard, records in self.iter_shards():
+            yield from records
+
+    def iter_shards(self):
+        """Yield (Shard, Records) pairs, shard line_number locating the rows."""
+
+        quotechar = _get_dialect(self.dialect).quotechar or '"'
+        parse = partial(parse_shard, self.path, encoding=self.encoding,
+                        dialect=self.dialect, converters=self.converters)
+        make_record = self.Record._make
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            shards = find_shards(self.path, self.shard_size, quotechar,
+                                 map=executor.map)
+            for shard, rows in bounded_map(executor, parse, shards,
+                                           self.max_in_flight, self.ordered):
+                yield shard, map(make_record, rows)
+
+
+class ParallelZipReader:
+    """Read delimited zip archive members into namedtuple Records in parallel.
+
+    Members are inflated and parsed in a process pool, with a bounded
+    number in flight so memory stays capped. Every member shares the
+    same dialect, fields and converters, and starts with a header row.
+
+    Parameters
+    ----------
+    path: Absolute path to zip file archive.
+    filenames: archive members to read.
+    encoding: File encoding.
+    dialect: delimited file attributes.
+    fields: Record field names.
+    converters: casting functions to cast fields to Python objects.
+    processes: worker process count, defaults to CPU count.
+    ordered: yield members sorted by name, or as each member completes.
+    max_in_flight: members parsed or held ahead of the consumer,
+      defaults to twice the worker count.
+    """
+
+    def __init__(self, path, filenames, encoding, dialect: csv.Dialect,
+                 fields: list, converters: list, processes=None, ordered=True,
+                 max_in_flight=None):
+        self.path = path
+        self.filenames = filenames
+        self.encoding = encoding
+        self.dialect = dialect
+        self.converters = converters
+        self.processes = processes or os.cpu_count()
+        self.ordered = ordered
+        self.max_in_flight = max_in_flight or 2 * self.processes
+        self.Record = namedtuple('Record', fields)
+
+    def __iter__(self):
+        for filename, records in self.iter_members():
+            yield from records
+
+    def iter_members(self):
+        """Yield (member filename, Records) pairs."""
+
+        filenames = sorted(self.filenames) if self.ordered else self.filenames
+        parse = partial(parse_zipfile_member, self.path, encoding=self.encoding,
+                        dialect=self.dialect, converters=self.converters)
+        make_record = self.Record._make
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            for filename, rows in bounded_map(executor, parse, filenames,
+                                              self.max_in_flight, self.ordered):
+                yield filename, map(make_record, rows)
@@ -19,4 +19,13 @@ def natural_sort(l):
 
 
 def find_index(search_list, items):
-    return [search_list.index(i) for i in items]
+    """Position of each item's first occurrence in search_list."""
+
+    positions = {}
+    for position, value in enumerate(search_list):
+        positions.setdefault(value, position)
+
+    try:
+        return [positions[i] for i in items]
+    except KeyError as exc:
+        raise ValueError('{!r} is not in list'.format(exc.args[0])) from None
@@ -22,7 +22,7 @@ def get_requirements(requirement_file):
 
 
 setup(name=PACKAGE_NAME,
-      packages=find_packages(exclude=('tests',)),
+      packages=find_packages(exclude=('tests', 'benchmarks')),
       include_package_data=True,
       version=version_ns['__version__'],
       license='MIT',
@@ -42,6 +42,7 @@ setup(name=PACKAGE_NAME,
       install_requires=get_requirements('requirements.txt'),
       extras_require={
           'develop': get_requirements('requirements-dev.txt'),
-          'test': get_requirements('requirements-test.txt')
+          'test': get_requirements('requirements-test.txt'),
+          'numpy': ['numpy']
       },
       zip_safe=False)
@@ -0,0 +1,121 @@
+import asyncio
+import csv
+import os
+import unittest
+import zipfile
+from tempfile import TemporaryDirectory
+
+from foil.aio import AsyncDelimitedReader, AsyncReader
+from foil.parsers import parse_int, passthrough
+
+
+ROWS = 250
+CONTENT = 'name,shares,price\n' + ''.join(
+    'N{0},{0},{1}\n'.format(i, i / 4) for i in range(ROWS))
+
+
+def collect(reader):
+    async def read_all():
+        async with reader:
+            return [record async for record in reader]
+
+    return asyncio.run(read_all())
+
+
+class TestAsyncReader(unittest.TestCase):
+    def test_batches(self):
+        reader = AsyncReader(lambda: iter(range(25)), batch_size=10, read_ahead=1)
+
+        self.assertEqual(list(range(25)), collect(reader))
+
+    def test_propagates_errors(self):
+        def broken_records():
+            yield 1
+            raise ValueError('bad row')
+
+        reader = AsyncReader(broken_records, batch_size=1)
+
+        with self.assertRaisesRegex(ValueError, 'bad row'):
+            collect(reader)
+
+    def test_close_before_exhausted(self):
+        closed = []
+
+        class Records:
+            def __iter__(self):
+                return iter(range(1000))
+
+            def close(self):
+                closed.append(True)
+
+        async def read_one():
+            async with AsyncReader(Records, batch_size=10, read_ahead=1) as reader:
+                record = await reader.__anext__()
+            return record, reader.producer.done()
+
+        self.assertEqual((0, True), asyncio.run(read_one()))
+        self.assertEqual([True], closed)
+
+    def test_concurrent_readers(self):
+        async def read_many():
+            readers = [AsyncReader(lambda n=n: iter(range(n)), batch_size=7)
+                       for n in (10, 20, 30)]
+
+            async def read(reader):
+                return [record async for record in reader]
+
+            return await asyncio.gather(*map(read, readers))
+
+        self.assertEqual([list(range(n)) for n in (10, 20, 30)],
+                         asyncio.run(read_many()))
+
+
+class TestAsyncDelimitedReader(unittest.TestCase):
+    fields = ['name', 'shares']
+    converters = [passthrough, parse_int]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'prices.csv')
+        cls.zip_path = os.path.join(cls.directory.name, 'prices.zip')
+
+        with open(cls.path, 'w', encoding='utf-8') as f:
+            f.write(CONTENT)
+
+        with zipfile.ZipFile(cls.zip_path, mode='w') as archive:
+            archive.writestr('prices.csv', CONTENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_from_file(self):
+        reader = AsyncDelimitedReader.from_file(
+            self.path, 'utf-8', csv.excel, self.fields + ['price'],
+            self.converters + [float], batch_size=100)
+        records = collect(reader)
+
+        self.assertEqual(ROWS, len(records))
+        self.assertEqual(('N7', 7, 1.75), tuple(records[7]))
+
+    def test_from_file_subset(self):
+        reader = AsyncDelimitedReader.from_file(
+            self.path, 'utf-8', csv.excel, ['shares'], [parse_int],
+            field_index=[1], batch_size=100)
+
+        self.assertEqual(list(range(ROWS)), [record.shares for record in collect(reader)])
+
+    def test_from_zipfile(self):
+        reader = AsyncDelimitedReader.from_zipfile(
+            self.zip_path, 'prices.csv', 'utf-8', csv.excel, self.fields,
+            self.converters, field_index=[0, 1])
+
+        self.assertEqual(ROWS, len(collect(reader)))
+
+    def test_from_compressed(self):
+        reader = AsyncDelimitedReader.from_compressed(
+            self.path, 'utf-8', csv.excel, self.fields, self.converters,
+            field_index=[0, 1], record_type='tuple')
+
+        self.assertEqual(('N0', 0), collect(reader)[0])
@@ -0,0 +1,196 @@
+import csv
+import os
+import time
+import unittest
+import zipfile
+from datetime import date
+from functools import partial
+from tempfile import TemporaryDirectory
+
+from foil.caching import (RecordCache, cache_key, describe, file_fingerprint,
+                          read_file_cached, read_zipfile_cached)
+from foil.categorical import Categorical
+from foil.filters import AttributeFilter
+from foil.parsers import parse_int, parse_iso_date, passthrough
+from foil.profiling import ReaderStats
+
+
+CONTENT = 'name,shares,day\nABC,10,2015-03-02\nXYZ,20,2015-03-03\nQRS,,\n'
+FIELDS = ['name', 'shares', 'day']
+CONVERTERS = [passthrough, parse_int, parse_iso_date]
+EXPECTED = [('ABC', 10, date(2015, 3, 2)), ('XYZ', 20, date(2015, 3, 3)),
+            ('QRS', None, None)]
+
+
+class TestDescribe(unittest.TestCase):
+    def test_functions_by_name(self):
+        self.assertEqual('foil.parsers.passthrough', describe(passthrough))
+        self.assertEqual(('partial', 'foil.parsers.parse_numeric',
+                          ('builtins.int',), ()), describe(parse_int))
+
+    def test_categorical_by_converter(self):
+        self.assertEqual(('categorical', 'foil.parsers.passthrough'),
+                         describe(Categorical(passthrough)))
+
+    def test_unnamed_functions_refused(self):
+        def make(suffix):
+            return lambda value: value + suffix
+
+        def local(value):
+            return value
+
+        for function in (make('x'), lambda value: value, local, 'abc'.upper,
+                         partial(make('y'))):
+            with self.subTest(function=function):
+                with self.assertRaises(TypeError):
+                    describe(function)
+
+    def test_objects_refused(self):
+        class Upper:
+            def __call__(self, value):
+                return value.upper()
+
+        for value in (Upper(), ReaderStats(), {'a': 1}):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    describe(value)
+
+    def test_key_stable_for_equal_schema(self):
+        fingerprint = ('/data/file.csv', 10, 1)
+        schema = (csv.excel, FIELDS, CONVERTERS,
+                  AttributeFilter(('name',), ['ABC', 'XYZ']))
+        same = (csv.excel, list(FIELDS), list(CONVERTERS),
+                AttributeFilter(('name',), ['XYZ', 'ABC']))
+
+        self.assertEqual(cache_key(fingerprint, schema), cache_key(fingerprint, same))
+        self.assertNotEqual(cache_key(fingerprint, schema),
+                            cache_key(fingerprint, (csv.excel_tab,) + schema[1:]))
+
+
+class CacheFixture:
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'prices.csv')
+        self.cache = RecordCache(os.path.join(self.directory.name, 'cache'),
+                                 chunk_rows=2)
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(CONTENT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cached_files(self):
+        return os.listdir(self.cache.directory)
+
+    def read(self, **options):
+        return list(read_file_cached(self.cache, self.path, 'utf-8', csv.excel,
+                                     FIELDS, CONVERTERS, **options))
+
+
+class TestReadFileCached(CacheFixture, unittest.TestCase):
+    def test_miss_stores_records(self):
+        self.assertEqual(EXPECTED, self.read())
+        self.assertEqual(1, len(self.cached_files()))
+
+    def test_serves_cached_records(self):
+        first = self.read()
+        key = next(iter(self.cached_files()))
+        mtime = os.stat(self.path).st_mtime_ns
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(CONTENT.replace('ABC', 'DEF'))
+        os.utime(self.path, ns=(mtime, mtime))
+
+        self.assertEqual(first, self.read())
+        self.assertEqual([key], self.cached_files())
+        self.assertEqual(('name', 'shares', 'day'), self.read()[0]._fields)
+
+    def test_changed_source_invalidates(self):
+        self.read()
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('NEW,1,2015-03-04\n')
+
+        self.assertEqual(4, len(self.read()))
+        self.assertEqual(2, len(self.cached_files()))
+
+    def test_schema_in_key(self):
+        self.read()
+        subset = list(read_file_cached(self.cache, self.path, 'utf-8', csv.excel,
+                                       ['shares'], [parse_int], [1]))
+
+        self.assertEqual([(10,), (20,), (None,)], subset)
+        self.assertEqual(2, len(self.cached_files()))
+
+    def test_record_type(self):
+        self.assertEqual(EXPECTED, self.read(record_type='tuple'))
+
+    def test_closures_bypass_cache(self):
+        def read(suffix):
+            converters = [lambda value: value + suffix] + CONVERTERS[1:]
+            return [record.name for record in read_file_cached(
+                self.cache, self.path, 'utf-8', csv.excel, FIELDS, converters)]
+
+        self.assertEqual(['ABCx', 'XYZx', 'QRSx'], read('x'))
+        self.assertEqual(['ABCy', 'XYZy', 'QRSy'], read('y'))
+        self.assertEqual([], self.cached_files())
+
+    def test_stats_bypass_cache(self):
+        stats = ReaderStats()
+
+        self.assertEqual(EXPECTED, self.read(stats=stats))
+        self.assertEqual([], self.cached_files())
+
+    def test_partial_read_not_cached(self):
+        records = read_file_cached(self.cache, self.path, 'utf-8', csv.excel,
+                                   FIELDS, CONVERTERS)
+        next(records)
+        del records
+
+        self.assertEqual([], [name for name in self.cached_files()
+                              if name.endswith('.records')])
+
+
+class TestRecordCache(CacheFixture, unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        for key in ('a', 'b', 'c'):
+            list(self.cache.rows(key, lambda: [('x' * 100,)] * 10))
+            time.sleep(0.01)
+
+        self.cache.get('a')
+        size = os.path.getsize(self.cache.path('a'))
+        self.cache.max_bytes = 2 * size
+        self.cache.evict()
+
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertIn('c', self.cache)
+
+    def test_clear(self):
+        list(self.cache.rows('a', lambda: [(1,)]))
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get('a'))
+
+
+class TestReadZipfileCached(CacheFixture, unittest.TestCase):
+    def test_zipfile_member(self):
+        zip_path = os.path.join(self.directory.name, 'prices.zip')
+
+        with zipfile.ZipFile(zip_path, mode='w') as archive:
+            archive.writestr('prices.csv', CONTENT)
+
+        for _ in range(2):
+            records = list(read_zipfile_cached(self.cache, zip_path, 'prices.csv',
+                                               'utf-8', csv.excel, FIELDS,
+                                               CONVERTERS))
+            self.assertEqual(EXPECTED, records)
+
+        self.assertEqual(1, len(self.cached_files()))
+
+    def test_file_fingerprint(self):
+        stat = os.stat(self.path)
+
+        self.assertEqual((os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns),
+                         file_fingerprint(self.path))
@@ -0,0 +1,72 @@
+import sys
+import unittest
+from array import array
+
+from foil.categorical import (Categorical, CategoryStats, categorize,
+                              category_stats)
+from foil.parsers import parse_bool, parse_int, passthrough
+
+
+class TestCategorical(unittest.TestCase):
+    def test_shared_objects(self):
+        categorical = Categorical(passthrough)
+        first, second = ''.join(['NY', 'SE']), ''.join(['NYS', 'E'])
+
+        self.assertIsNot(first, second)
+        self.assertIs(categorical(first), categorical(second))
+
+    def test_converts_once(self):
+        calls = []
+
+        def convert(value):
+            calls.append(value)
+            return int(value)
+
+        categorical = Categorical(convert)
+
+        self.assertEqual([1, 2, 1, 1], list(map(categorical, ['1', '2', '1', '1'])))
+        self.assertEqual(['1', '2'], calls)
+
+    def test_encode(self):
+        categorical = Categorical(parse_int)
+        categorical('3')
+
+        codes = categorical.encode(['5', '3', '5', '7'])
+
+        self.assertEqual(array('i', [1, 0, 1, 2]), codes)
+        self.assertEqual([3, 5, 7], categorical.categories)
+        self.assertEqual(5, categorical.count)
+
+    def test_stats(self):
+        categorical = Categorical(passthrough)
+
+        for value in ['USD', 'EUR'] * 50:
+            categorical(value)
+
+        expected = CategoryStats(100, 2, 98 * sys.getsizeof('USD'))
+
+        self.assertEqual(expected, categorical.stats())
+        self.assertEqual(CategoryStats(0, 0, 0), Categorical().stats())
+
+
+class TestCategorize(unittest.TestCase):
+    def test_wraps_named_fields(self):
+        existing = Categorical(parse_bool)
+        converters = categorize(['a', 'b', 'c'], [passthrough, parse_int, existing],
+                                ['a', 'c'])
+
+        self.assertIsInstance(converters[0], Categorical)
+        self.assertIs(passthrough, converters[0].converter)
+        self.assertIs(parse_int, converters[1])
+        self.assertIs(existing, converters[2])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            categorize(['a'], [passthrough], ['b'])
+
+    def test_category_stats(self):
+        converters = categorize(['a', 'b'], [passthrough, parse_int], ['a'])
+        converters[0]('x')
+
+        self.assertEqual({'a': CategoryStats(1, 1, 0)},
+                         category_stats(['a', 'b'], converters))
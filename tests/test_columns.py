@@ -0,0 +1,184 @@
+import unittest
+from array import array
+from datetime import date, datetime
+
+from foil.categorical import Categorical
+from foil.columns import (CategoricalColumn, Column, column_values,
+                          concat_columns, make_column_parser, null_mask,
+                          parse_bool_column, parse_float_column,
+                          parse_int_column, parse_iso_date_column,
+                          parse_object_column, parse_text_column)
+from foil.parsers import (format_bool, format_iso_date, format_iso_datetime,
+                          make_converters, memoize, parse_float, parse_int,
+                          parse_iso_date, parse_iso_datetime, passthrough)
+
+
+class TestNullMask(unittest.TestCase):
+    def test_null_mask(self):
+        expected = bytes([0, 1, 0, 1])
+        result = null_mask(['a', '', 'b', None])
+
+        self.assertEqual(expected, result)
+
+
+class TestColumnParsers(unittest.TestCase):
+    def test_int_column(self):
+        expected = Column(array('q', [3, 0, -2]), bytes([0, 1, 0]))
+        result = parse_int_column(('3', '', '-2'))
+
+        self.assertEqual(expected, result)
+
+    def test_float_column(self):
+        expected = Column(array('d', [3.5, 1.0]), bytes([0, 0]))
+        result = parse_float_column(('3.5', '1'))
+
+        self.assertEqual(expected, result)
+
+    def test_bool_column(self):
+        expected = Column(array('b', [1, 0, 0, 1]), bytes([0, 0, 1, 0]))
+        result = parse_bool_column(('true', '0', '', '1'))
+
+        self.assertEqual(expected, result)
+
+    def test_iso_date_column(self):
+        expected = Column(array('q', [0, 0, 16525]), bytes([0, 1, 0]))
+        result = parse_iso_date_column(('1970-01-01', '', '2015-03-31'))
+
+        self.assertEqual(expected, result)
+        self.assertEqual(date(2015, 3, 31),
+                         date.fromordinal(date(1970, 1, 1).toordinal() + 16525))
+
+    def test_iso_date_column_matches_parse_iso_date(self):
+        for value in ('0000-01-01', '+002015-01', '2015-03', '2015-03-02T10'):
+            with self.subTest(value=value):
+                with self.assertRaises(Exception) as expected:
+                    parse_iso_date(value)
+                with self.assertRaises(type(expected.exception)):
+                    parse_iso_date_column(['2015-03-02', value])
+
+    def test_text_column(self):
+        expected = Column(['a', ''], bytes([0, 1]))
+        result = parse_text_column(('a', ''))
+
+        self.assertEqual(expected, result)
+
+    def test_object_column(self):
+        expected = Column([None, 'A'], bytes([1, 0]))
+        result = parse_object_column(lambda x: x.upper() or None, ('', 'a'))
+
+        self.assertEqual(expected, result)
+
+
+class TestConcatColumns(unittest.TestCase):
+    def test_concat(self):
+        expected = Column(array('q', [1, 0, 3]), bytes([0, 1, 0]))
+        result = concat_columns([parse_int_column(['1', '']), parse_int_column(['3'])])
+
+        self.assertEqual(expected, result)
+
+    def test_categorical_keeps_last_categories(self):
+        categorical = Categorical()
+        columns = [make_column_parser(categorical)(values)
+                   for values in (['a', 'b'], ['c', 'a'])]
+
+        expected = CategoricalColumn(array('i', [0, 1, 2, 0]), bytes(4), ('a', 'b', 'c'))
+
+        self.assertEqual(expected, concat_columns(columns))
+
+
+class TestMakeColumnParser(unittest.TestCase):
+    def test_known_converters(self):
+        mock_data = [(parse_int, parse_int_column),
+                     (parse_float, parse_float_column),
+                     (passthrough, parse_text_column)]
+
+        for converter, expected in mock_data:
+            with self.subTest(converter=converter):
+                self.assertIs(expected, make_column_parser(converter))
+
+    def test_fallback_converter(self):
+        parser = make_column_parser(float)
+
+        expected = Column([1.5], bytes([0]))
+        result = parser(('1.5',))
+
+        self.assertEqual(expected, result)
+
+
+class TestDatetimeColumn(unittest.TestCase):
+    def test_epoch_microseconds(self):
+        column = make_column_parser(parse_iso_datetime)(
+            ['1970-01-02T00:00:00.000001', '', '2014-06-29T02:25:20 EST'])
+
+        self.assertEqual(array('q', [86400000001, 0, 1404023120000000]), column.values)
+        self.assertEqual(bytes([0, 1, 0]), column.mask)
+
+    def test_decode(self):
+        column = make_column_parser(parse_iso_datetime)(['2015-04-03T06:34:22.5', ''])
+
+        self.assertEqual([datetime(2015, 4, 3, 6, 34, 22, 500000), None],
+                         column_values(column, format_iso_datetime))
+
+    def test_parser_per_column(self):
+        dates, times = (make_column_parser(parse_iso_datetime) for _ in range(2))
+
+        for _ in range(2):
+            dates(['2015-04-03'])
+            times(['2015-04-03T06:34:22'])
+
+        self.assertIsNot(dates.keywords['parser'], times.keywords['parser'])
+        self.assertEqual(1, len(dates.keywords['parser'].layout_parsers))
+
+    def test_converter_parser_kept(self):
+        converter = make_converters({'created': datetime})['created']
+
+        self.assertIs(converter.keywords['parser'],
+                      make_column_parser(converter).keywords['parser'])
+
+
+class TestCategoricalColumn(unittest.TestCase):
+    def test_codes_stable_across_batches(self):
+        parse_column = make_column_parser(Categorical(passthrough))
+
+        first = parse_column(['USD', '', 'EUR', 'USD'])
+        second = parse_column(['JPY', 'EUR'])
+
+        self.assertEqual(CategoricalColumn(array('i', [0, -1, 2, 0]), bytes([0, 1, 0, 0]),
+                                           ('USD', '', 'EUR')), first)
+        self.assertEqual(array('i', [3, 2]), second.values)
+        self.assertEqual(('USD', '', 'EUR', 'JPY'), second.categories)
+
+    def test_decode(self):
+        column = make_column_parser(Categorical(parse_int))(['1', '', '2', '1'])
+
+        self.assertEqual([1, None, 2, 1], column_values(column))
+
+
+class TestMemoizedColumnParser(unittest.TestCase):
+    def test_memoized_date_column(self):
+        converter = memoize(parse_iso_date)
+        column = make_column_parser(converter)(['2015-03-02', '', '2015-03-02'])
+
+        self.assertEqual(array('q', [16496, 0, 16496]), column.values)
+        self.assertEqual(bytes([0, 1, 0]), column.mask)
+        self.assertEqual(1, converter.cache_info().hits)
+
+
+class TestColumnValues(unittest.TestCase):
+    def test_masked_values(self):
+        column = parse_int_column(['1', '', '3'])
+
+        self.assertEqual([1, None, 3], column_values(column))
+
+    def test_decodes_typed_columns(self):
+        dates = parse_iso_date_column(['2015-03-02', ''])
+        bools = parse_bool_column(['true', 'false'])
+
+        self.assertEqual([date(2015, 3, 2), None],
+                         column_values(dates, format_iso_date))
+        self.assertEqual([True, False], column_values(bools, format_bool))
+
+    def test_object_columns_not_decoded(self):
+        column = Column([date(2015, 3, 2)], bytes(1))
+
+        self.assertEqual([date(2015, 3, 2)], column_values(column, format_iso_date))
@@ -0,0 +1,115 @@
+import unittest
+from collections import namedtuple
+
+from foil.categorical import Categorical
+from foil.compilers import (_compile_cached, compile_row_converter,
+                            generate_line_splitter, generate_row_converter)
+from foil.parsers import make_row_converter, parse_int, passthrough
+
+
+class Upper:
+    __hash__ = None
+
+    def __call__(self, value):
+        return value.upper()
+
+
+class TestGenerateRowConverter(unittest.TestCase):
+    def setUp(self):
+        self.Record = namedtuple('Record', ['name', 'score'])
+
+    def test_all_fields(self):
+        convert_row = generate_row_converter(self.Record, [passthrough, parse_int])
+
+        expected = self.Record('Dave', 82)
+        result = convert_row(['Dave', '82'])
+
+        self.assertEqual(expected, result)
+        self.assertIsInstance(result, self.Record)
+
+    def test_field_index(self):
+        convert_row = generate_row_converter(self.Record, [str, parse_int], [2, 0])
+
+        expected = self.Record('Dave', 82)
+        result = convert_row(['82', 'History', 'Dave'])
+
+        self.assertEqual(expected, result)
+
+    def test_single_field(self):
+        Record = namedtuple('Record', ['score'])
+        convert_row = generate_row_converter(Record, [parse_int], [1])
+
+        self.assertEqual(Record(3), convert_row(['a', '3']))
+
+
+class TestCompileRowConverter(unittest.TestCase):
+    def test_cached_by_schema(self):
+        first = compile_row_converter(['a', 'b'], [passthrough, parse_int], [1, 0])
+        second = compile_row_converter(('a', 'b'), (passthrough, parse_int), (1, 0))
+
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+
+    def test_record_type(self):
+        Record, convert_row = compile_row_converter(['a', 'b'], [passthrough, parse_int],
+                                                    record_type='tuple')
+
+        self.assertIs(tuple, Record)
+        self.assertEqual(('x', 1), convert_row(['x', '1']))
+
+    def test_columnar_not_cached(self):
+        first, _ = compile_row_converter(['a'], [parse_int], record_type='columnar')
+        second, _ = compile_row_converter(['a'], [parse_int], record_type='columnar')
+
+        self.assertIsNot(first, second)
+
+    def test_stateful_converter_not_cached(self):
+        categorical = Categorical(parse_int)
+        before = _compile_cached.cache_info().currsize
+
+        first, _ = compile_row_converter(['a'], [categorical])
+        second, _ = compile_row_converter(['a'], [categorical])
+
+        self.assertIsNot(first, second)
+        self.assertEqual(before, _compile_cached.cache_info().currsize)
+
+    def test_unhashable_converter(self):
+        Record, convert_row = compile_row_converter(['a'], [Upper()])
+
+        self.assertEqual(Record('X'), convert_row(['x']))
+
+
+class TestGenerateLineSplitter(unittest.TestCase):
+    def test_disjoint_columns(self):
+        split_line = generate_line_splitter([(0, 4), (6, 10), (10, 12)], 'ascii')
+
+        self.assertEqual(('abcd', '12', 'xy'), split_line(b'abcd    12xy\n'))
+
+    def test_short_line_padded(self):
+        split_line = generate_line_splitter([(0, 4), (4, 8)], 'ascii')
+
+        self.assertEqual(('ab', ''), split_line(b'ab'))
+
+    def test_overlapping_columns(self):
+        split_line = generate_line_splitter([(2, 6), (0, 4)], 'ascii')
+
+        self.assertEqual(('cdef', 'abcd'), split_line(b'abcdefg'))
+
+    def test_decodes_after_cutting_bytes(self):
+        split_line = generate_line_splitter([(0, 7), (7, 10)], 'utf-8')
+
+        self.assertEqual(('Zürich', '42'), split_line('Zürich 42'.encode('utf-8')))
+
+    def test_no_columns(self):
+        self.assertEqual((), generate_line_splitter([], 'ascii')(b'abc'))
+
+
+class TestMakeRowConverter(unittest.TestCase):
+    def test_make_row_converter(self):
+        Record, convert_row = make_row_converter({'student': str, 'score': float})
+
+        expected = Record('Dave', 82.5)
+        result = convert_row(['Dave', '82.5'])
+
+        self.assertEqual(expected, result)
+        self.assertEqual(('student', 'score'), Record._fields)
@@ -0,0 +1,101 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from foil.compression import (ReadAheadReader, WriteBehindWriter, detect_codec,
+                              open_compressed, open_compressed_text,
+                              open_compressed_writer)
+
+
+CONTENT = ''.join('{},"value {}"\n'.format(i, i) for i in range(2000)).encode('utf-8')
+
+
+class CompressedFixture:
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()
+        cls.paths = {}
+        for codec, compress in (('gzip', gzip.compress), ('bz2', bz2.compress),
+                                ('xz', lzma.compress), (None, bytes)):
+            path = os.path.join(cls.directory.name, 'data.{}'.format(codec))
+            with open(path, 'wb') as f:
+                f.write(compress(CONTENT))
+            cls.paths[codec] = path
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+
+class TestDetectCodec(CompressedFixture, unittest.TestCase):
+    def test_detect_codec(self):
+        for codec, path in self.paths.items():
+            with self.subTest(codec=codec):
+                self.assertEqual(codec, detect_codec(path))
+
+
+class TestOpenCompressed(CompressedFixture, unittest.TestCase):
+    def test_open_compressed(self):
+        for codec, path in self.paths.items():
+            with self.subTest(codec=codec):
+                with open_compressed(path, chunk_size=1000) as f:
+                    self.assertEqual(CONTENT, f.read())
+
+    def test_open_compressed_text(self):
+        with open_compressed_text(self.paths['gzip'], 'utf-8') as f:
+            lines = list(f)
+
+        self.assertEqual(2000, len(lines))
+        self.assertEqual('1999,"value 1999"\n', lines[-1])
+
+
+class TestReadAheadReader(unittest.TestCase):
+    def test_close_before_exhausted(self):
+        reader = ReadAheadReader(io.BytesIO(CONTENT), chunk_size=10, read_ahead=1)
+
+        self.assertEqual(b'0,"va', reader.read(5))
+        reader.close()
+
+        self.assertFalse(reader.thread.is_alive())
+        self.assertTrue(reader.file.closed)
+
+    def test_propagates_errors(self):
+        class BrokenFile(io.BytesIO):
+            def read(self, size=-1):
+                raise OSError('corrupt stream')
+
+        with ReadAheadReader(BrokenFile()) as reader:
+            with self.assertRaisesRegex(OSError, 'corrupt stream'):
+                reader.read(10)
+
+
+class TestWriteBehindWriter(unittest.TestCase):
+    def test_open_compressed_writer(self):
+        with TemporaryDirectory() as directory:
+            for codec in ('gzip', 'bz2', 'xz', None):
+                with self.subTest(codec=codec):
+                    path = os.path.join(directory, str(codec))
+
+                    with open_compressed_writer(path, codec, chunk_size=1000) as f:
+                        f.write(CONTENT)
+
+                    self.assertEqual(codec, detect_codec(path))
+                    with open_compressed(path) as f:
+                        self.assertEqual(CONTENT, f.read())
+
+    def test_propagates_errors(self):
+        class BrokenFile(io.BytesIO):
+            def write(self, buffer):
+                raise OSError('disk full')
+
+        writer = WriteBehindWriter(BrokenFile())
+        writer.write(b'data')
+
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            writer.close()
+
+        self.assertFalse(writer.thread.is_alive())
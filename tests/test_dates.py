@@ -1,9 +1,14 @@
-from datetime import datetime, date
+from datetime import datetime, timedelta, date
 
+import pickle
 import pytz
 import unittest
 
-from foil.dates import parse_date, DateTimeParser, _datetime_to_tuple
+from array import array
+
+from foil.dates import (parse_date, DateTimeParser, Layout, UTCOffsetTable,
+                        _datetime_to_tuple, detect_layout, epoch_microseconds,
+                        generate_layout_parser, utc_offset_table)
 
 
 test_dt_data = [
@@ -40,6 +45,20 @@ class TestToolsDates(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_parse_date_errors(self):
+        cases = [('2015-13-02', ValueError), ('2015-02-30', ValueError),
+                 ('2015-+1-03', AttributeError), ('2015-20-01', AttributeError),
+                 ('20150403', AttributeError), ('2015-04-03 ', AttributeError),
+                 ('', TypeError)]
+
+        for value, error in cases:
+            with self.subTest(value=value):
+                with self.assertRaises(error):
+                    parse_date(value)
+
+    def test_parse_date_leading_zero_year(self):
+        self.assertEqual(date(999, 1, 2), parse_date('0999-01-02'))
+
     def test_all_string_components(self):
         expected = (2014, 7, 3, 13, 2, 45, 321)
         result = _datetime_to_tuple(self.dt_dict)
@@ -67,3 +86,179 @@ class TestToolsDates(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             _datetime_to_tuple(dt_dict)
+
+
+class TestDetectLayout(unittest.TestCase):
+    def test_layouts(self):
+        cases = [
+            ('2015-04-03', Layout(None, None, 0, None, False)),
+            ('2015-04-03T06:34:22', Layout('T', None, 0, None, False)),
+            ('2015-04-03 06:34:22.234', Layout(' ', '.', 3, None, False)),
+            ('2015-04-03|06:34:22,5', Layout('|', ',', 1, None, False)),
+            ('2014-06-29T02:25:20 EST', Layout('T', None, 0, ' ', True)),
+            ('2014-06-29T02:25:20.25EDT', Layout('T', '.', 2, '', True)),
+            ('2015-04-03T6:34:22', None),
+            ('04/03/2015', None)]
+
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(expected, detect_layout(value))
+
+    def test_prefix_length(self):
+        self.assertEqual(23, detect_layout('2015-04-03T06:34:22.234 EST').prefix_length)
+
+
+class TestLayoutParser(unittest.TestCase):
+    def test_slices_without_fromisoformat(self):
+        layout = Layout('|', ',', 4, None, False)
+        parse = generate_layout_parser(layout, None, None)
+
+        self.assertEqual(datetime(2015, 4, 3, 6, 34, 22, 234500),
+                         parse('2015-04-03|06:34:22,2345'))
+        self.assertIs(layout, parse.layout)
+
+    def test_mismatch_falls_back(self):
+        parse = generate_layout_parser(Layout('T', None, 0, None, False),
+                                       lambda value: 'fallback', None)
+
+        self.assertEqual('fallback', parse('2015-04-03 06:34:22'))
+        self.assertEqual('fallback', parse('2015-04-03T06:34:99'))
+
+
+class TestDateTimeParserLayouts(unittest.TestCase):
+    def test_matches_pattern_parse(self):
+        values = [value for value, _ in test_dt_data] + [
+            '2015-04-03 06:34:22.234567',
+            '2015-04-03T06:34:22,123456', '2014-06-29T02:25:20.123EDT']
+
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(DateTimeParser().parse_pattern(value),
+                                 DateTimeParser().parse(value))
+
+    def test_short_fraction(self):
+        self.assertEqual(datetime(2015, 4, 3, 6, 34, 22, 500000),
+                         DateTimeParser().parse('2015-04-03T06:34:22.5'))
+        self.assertEqual(datetime(2015, 4, 3, 6, 34, 22, 120000),
+                         DateTimeParser().parse('2015-04-03T06:34:22.12'))
+
+    def test_switches_layout(self):
+        parser = DateTimeParser()
+        expected = datetime(2015, 4, 3, 6, 34, 22)
+
+        self.assertEqual(expected, parser.parse('2015-04-03T06:34:22'))
+        self.assertEqual(datetime(2015, 4, 3), parser.parse('2015-04-03'))
+        self.assertEqual(expected, parser.parse('2015-04-03T06:34:22'))
+        self.assertEqual(2, len(parser.layout_parsers))
+
+    def test_mixed_zoned_layouts(self):
+        cases = [
+            ('2014-02-14 EST', datetime(2014, 2, 14, 5, tzinfo=pytz.utc)),
+            ('2014-02-14 12:00:00', datetime(2014, 2, 14, 12)),
+            ('2014-02-14T11:12:04EST', datetime(2014, 2, 14, 16, 12, 4, tzinfo=pytz.utc)),
+            ('2014-02-14T11:12:04.5', datetime(2014, 2, 14, 11, 12, 4, 500000)),
+        ]
+
+        for ordered in (cases, cases[::-1]):
+            parser = DateTimeParser()
+            for value, expected in ordered:
+                with self.subTest(value=value, order=ordered[0][0]):
+                    self.assertEqual(expected, parser.parse(value))
+
+    def test_utc_offsets(self):
+        utc = datetime(2014, 6, 29, 6, 25, 20, tzinfo=pytz.utc)
+        cases = [
+            ('2014-06-29T06:25:20+00:00', utc),
+            ('2014-06-29T02:25:20-04:00', utc),
+            ('2014-06-29T06:25:20.5Z', utc.replace(microsecond=500000)),
+        ]
+
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(expected, DateTimeParser().parse(value))
+
+    def test_pickle(self):
+        parser = DateTimeParser()
+        parser.parse('2015-04-03T06:34:22')
+
+        result = pickle.loads(pickle.dumps(parser))
+
+        self.assertEqual({}, result.layout_parsers)
+        self.assertEqual(datetime(2014, 2, 14, 5, tzinfo=pytz.utc),
+                         result.parse('2014-02-14 EST'))
+
+    def test_unrecognized_layout_uses_pattern(self):
+        parser = DateTimeParser()
+
+        self.assertEqual(datetime(2015, 4, 3, 6, 34, 22),
+                         parser.parse('2015-04-03T6:34:22'))
+
+    def test_parse_batch(self):
+        values = ['1970-01-01T00:00:01.5', '2014-06-29T02:25:20 EST', '1969-12-31']
+        expected = array('q', [1500000, 1404023120000000, -86400000000])
+
+        self.assertEqual(expected, DateTimeParser().parse_batch(values))
+
+    def test_epoch_microseconds(self):
+        self.assertEqual(1, epoch_microseconds(datetime(1970, 1, 1, 0, 0, 0, 1)))
+        self.assertEqual(3600000000, epoch_microseconds(
+            datetime(1970, 1, 1, 1, tzinfo=pytz.utc)))
+
+
+class TestUTCOffsetTable(unittest.TestCase):
+    eastern = pytz.timezone('US/Eastern')
+
+    def assert_matches_pytz(self, table, local_times):
+        mismatches = [local for local in local_times
+                      if table.to_utc(local) != table.timezone.localize(
+                          local, is_dst=False).astimezone(pytz.utc)]
+
+        self.assertEqual([], mismatches)
+
+    def test_matches_pytz_across_transitions(self):
+        step = timedelta(minutes=15)
+        local_times = [datetime(year, month, day) + i * step
+                       for year in (1918, 1974, 2006, 2007, 2024, 2037, 2040)
+                       for month, day in ((3, 1), (4, 1), (10, 25), (11, 1))
+                       for i in range(14 * 24 * 4)]
+
+        self.assert_matches_pytz(utc_offset_table(self.eastern), local_times)
+
+    def test_ambiguous_and_nonexistent(self):
+        table = utc_offset_table(self.eastern)
+
+        ambiguous, nonexistent = datetime(2014, 11, 2, 1, 30), datetime(2014, 3, 9, 2, 30)
+
+        self.assertEqual(timedelta(hours=-5), table.utcoffset(ambiguous))
+        self.assertEqual(timedelta(hours=-5), table.utcoffset(nonexistent))
+        self.assertEqual(timedelta(hours=-4), table.utcoffset(datetime(2014, 3, 9, 3)))
+
+    def test_bounded_range(self):
+        table = UTCOffsetTable(self.eastern, datetime(2010, 1, 1), datetime(2011, 1, 1))
+
+        self.assertEqual(3, len(table.boundaries))
+        self.assert_matches_pytz(table, [datetime(2009, 7, 1), datetime(2010, 7, 1),
+                                         datetime(2011, 7, 1)])
+
+    def test_static_timezone(self):
+        table = UTCOffsetTable(pytz.timezone('Etc/GMT+5'))
+
+        self.assertEqual([timedelta(hours=-5)], table.offsets)
+        self.assertEqual(datetime(2014, 1, 1, 5, tzinfo=pytz.utc),
+                         table.to_utc(datetime(2014, 1, 1)))
+
+    def test_to_utc_batch(self):
+        table = UTCOffsetTable(self.eastern, datetime(2010, 1, 1), datetime(2011, 1, 1))
+        local_times = [datetime(2010, 1, 1), datetime(2010, 7, 1), datetime(2009, 7, 1),
+                       datetime(2014, 11, 2, 1, 30)]
+        values = array('q', map(epoch_microseconds, local_times))
+        expected = array('q', (epoch_microseconds(table.timezone.localize(
+            local, is_dst=False)) for local in local_times))
+
+        self.assertEqual(expected, table.to_utc_batch(values))
+
+    def test_convert_2_utc(self):
+        parser = DateTimeParser()
+
+        self.assertEqual(datetime(2014, 11, 2, 6, 30, tzinfo=pytz.utc),
+                         parser.convert_2_utc(datetime(2014, 11, 2, 1, 30), 'EST/EDT'))
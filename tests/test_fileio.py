@@ -1,15 +1,30 @@
 import csv
+import gzip
 import io
 import os
+import sys
 import unittest
 import textwrap
 import zipfile
+from array import array
 from collections import namedtuple
 from datetime import date, datetime
 from tempfile import NamedTemporaryFile
-
-from foil.fileio import (concatenate_streams, DelimitedReader,
-                         DelimitedSubsetReader, TextReader, ZipReader)
+from unittest.mock import patch
+
+from foil.fileio import (BytesDelimitedReader, BytesProjectionReader,
+                         concatenate_streams, DelimitedReader,
+                         DelimitedSubsetReader, DelimitedWriter,
+                         FixedWidthReader, MappedTextReader,
+                         ProjectionReader, TextReader, ZipArchivePool,
+                         ZipReader)
+from foil.categorical import CategoryStats
+from foil.columns import column_values
+from foil.filters import AttributeFilter
+from foil.indexes import RowOffsetIndex
+from foil.parsers import (format_float, format_int, format_iso_date,
+                          format_iso_datetime, parse_float, parse_int,
+                          parse_iso_date, parse_iso_datetime, passthrough)
 
 
 class MockDialect(csv.Dialect):
@@ -130,6 +145,52 @@ class TestTextReader(ReaderFixture, unittest.TestCase):
         self.assertEqual(expected, result)
 
 
+class TestMappedTextReader(ReaderFixture, unittest.TestCase):
+    @classmethod
+    def _prep(cls):
+        file_content = 'hello\r\nworld\n\nlast'
+        with NamedTemporaryFile(prefix='text_', suffix='.txt', delete=False) as tmp:
+            with open(tmp.name, 'w', encoding=cls.encoding, newline='') as text_file:
+                text_file.write(file_content)
+            cls.path = tmp.name
+
+    def test_mapped_text_reader(self):
+        reader = MappedTextReader(self.path, self.encoding)
+
+        expected = ['hello', 'world', '', 'last']
+        result = list(reader)
+
+        self.assertEqual(expected, result)
+
+    def test_keepends(self):
+        reader = MappedTextReader(self.path, self.encoding)
+
+        expected = ['hello\r\n', 'world\n', '\n', 'last']
+        result = list(reader.readlines(keepends=True))
+
+        self.assertEqual(expected, result)
+
+    def test_line_offsets(self):
+        expected = [0, 7, 13, 14]
+        result = list(MappedTextReader(self.path, self.encoding).line_offsets())
+
+        self.assertEqual(expected, result)
+
+    def test_empty_file(self):
+        with NamedTemporaryFile(prefix='empty_', suffix='.txt') as tmp:
+            self.assertEqual([], list(MappedTextReader(tmp.name, self.encoding)))
+
+    def test_small_blocks(self):
+        with NamedTemporaryFile(prefix='blocks_', suffix='.txt') as tmp:
+            tmp.write('ab\r\n\u00e9\u00e9\nc\n'.encode(self.encoding))
+            tmp.flush()
+            reader = MappedTextReader(tmp.name, self.encoding, block_size=3)
+
+            self.assertEqual(['ab', '\u00e9\u00e9', 'c'], list(reader))
+            self.assertEqual([b'ab\r\n', '\u00e9\u00e9\n'.encode(self.encoding), b'c\n'],
+                             list(reader.readlines_bytes(keepends=True)))
+
+
 class TestDelimitedReader(DelimitedReaderFixture, unittest.TestCase):
     def setUp(self):
         self.fields = ['NAME', 'CLASS', 'DATE', 'ASSIGNMENT', 'SCORE', 'AVERAGE']
@@ -156,6 +217,17 @@ class TestDelimitedReader(DelimitedReaderFixture, unittest.TestCase):
 
         self.assertSequenceEqual(self.expected, result)
 
+    def test_from_mmap(self):
+        reader = DelimitedReader.from_mmap(path=self.path,
+                                           encoding=self.encoding,
+                                           dialect=self.dialect,
+                                           fields=self.fields,
+                                           converters=self.converters)
+
+        result = list(reader)
+
+        self.assertSequenceEqual(self.expected, result)
+
     def test_from_zipfile(self):
         reader = DelimitedReader.from_zipfile(path=self.zip_path,
                                               filename=self.zip_filename,
@@ -182,6 +254,35 @@ class TestDelimitedReader(DelimitedReaderFixture, unittest.TestCase):
                                                   dialect=self.dialect)
         self.assertEqual(self.fields, list(headers))
 
+    def test_from_compressed(self):
+        with NamedTemporaryFile(prefix='delim_', suffix='.gz') as tmp:
+            with gzip.open(tmp.name, 'wt', encoding=self.encoding) as f:
+                f.write(delimited_text())
+            reader = DelimitedReader.from_compressed(path=tmp.name,
+                                                     encoding=self.encoding,
+                                                     dialect=self.dialect,
+                                                     fields=self.fields,
+                                                     converters=self.converters)
+
+            result = list(reader)
+
+        self.assertSequenceEqual(self.expected, result)
+
+    def test_from_file_rows(self):
+        reader = DelimitedReader.from_file_rows(path=self.path,
+                                                encoding=self.encoding,
+                                                dialect=self.dialect,
+                                                fields=self.fields,
+                                                converters=self.converters,
+                                                start=1, stop=2)
+        try:
+            result = list(reader)
+
+            self.assertSequenceEqual(self.expected[1:2], result)
+            self.assertEqual(3, reader.file_line_number)
+        finally:
+            os.unlink(self.path + '.rowidx')
+
     def test_line_number(self):
         # counts skipped header line
         stream = io.StringIO(delimited_text())
@@ -192,6 +293,116 @@ class TestDelimitedReader(DelimitedReaderFixture, unittest.TestCase):
 
         self.assertEqual(reader.file_line_number, 3)
 
+    def test_row_filter(self):
+        stream = io.StringIO(delimited_text())
+        row_filter = AttributeFilter(('ASSIGNMENT', 'SCORE'),
+                                     predicates=[('QUIZ 2', '91'), ('Mid-term', '77')])
+        reader = DelimitedReader(stream, dialect=self.dialect, fields=self.fields,
+                                 converters=self.converters, row_filter=row_filter)
+
+        result = list(reader)
+
+        self.assertSequenceEqual(self.expected[1:], result)
+        self.assertEqual(reader.file_line_number, 4)
+
+    def test_row_filter_skips_conversion(self):
+        text = delimited_text().replace('|82|', '|bad|')
+        row_filter = AttributeFilter(('ASSIGNMENT',), predicates=['QUIZ 2'])
+        reader = DelimitedReader(io.StringIO(text), dialect=self.dialect,
+                                 fields=self.fields, converters=self.converters,
+                                 row_filter=row_filter)
+
+        self.assertSequenceEqual(self.expected[1:2], list(reader))
+
+    def test_record_types(self):
+        for record_type in ('tuple', 'slots', 'columnar'):
+            with self.subTest(record_type=record_type):
+                reader = DelimitedReader(io.StringIO(delimited_text()),
+                                         dialect=self.dialect, fields=self.fields,
+                                         converters=self.converters,
+                                         record_type=record_type)
+
+                self.assertEqual([tuple(r) for r in self.expected], list(reader))
+
+    def test_columnar_record_buffer(self):
+        reader = DelimitedReader(io.StringIO(delimited_text()), dialect=self.dialect,
+                                 fields=self.fields, converters=self.converters,
+                                 record_type='columnar')
+        records = list(reader)
+
+        self.assertEqual(3, len(reader.Record))
+        self.assertEqual(86.5, records[1].AVERAGE)
+
+    def test_iter_batches(self):
+        stream = io.StringIO(delimited_text())
+        converters = [passthrough, passthrough, parse_iso_date,
+                      passthrough, parse_int, parse_float]
+        reader = DelimitedReader(stream, dialect=self.dialect, fields=self.fields,
+                                 converters=converters)
+
+        batches = list(reader.iter_batches(2))
+
+        self.assertEqual([2, 1], [len(batch['NAME'].values) for batch in batches])
+        self.assertEqual(self.fields, list(batches[0]))
+        self.assertEqual(array('q', [82, 91]), batches[0]['SCORE'].values)
+        self.assertEqual(array('d', [83.333]), batches[1]['AVERAGE'].values)
+        self.assertEqual(['QUIZ 1', 'QUIZ 2'], batches[0]['ASSIGNMENT'].values)
+
+    def test_iter_batches_blocks(self):
+        text = 'a,b,c\n1,x,2015-03-02\n2,y,\n3,,2015-03-04,extra\n4,z,2015-03-05\n'
+        fields, converters = ['a', 'b', 'c'], [parse_int, passthrough, parse_iso_date]
+
+        for cells in (2, 4, 1000):
+            with self.subTest(cells=cells), patch('foil.fileio.BATCH_BLOCK_CELLS', cells):
+                reader = DelimitedReader(io.StringIO(text), csv.excel, fields, converters)
+                records = list(DelimitedReader(io.StringIO(text), csv.excel, fields,
+                                               converters))
+                batches = list(reader.iter_batches(3))
+
+                self.assertEqual([3, 1], [len(batch['a'].values) for batch in batches])
+                dates = [column_values(batch['c'], format_iso_date) for batch in batches]
+
+                self.assertEqual([record.c for record in records], sum(dates, []))
+                self.assertEqual([record.b or '' for record in records],
+                                 batches[0]['b'].values + batches[1]['b'].values)
+
+    def test_iter_batches_short_row(self):
+        for text in ('a,b\n1,2\n\n3,4\n', 'a,b\n1,2\n3\n'):
+            with self.subTest(text=text):
+                reader = DelimitedReader(io.StringIO(text), csv.excel, ['a', 'b'],
+                                         [parse_int, parse_int])
+
+                with self.assertRaisesRegex(ValueError, 'line 3'):
+                    list(reader.iter_batches(10))
+
+    def test_subset_iter_batches_short_row(self):
+        reader = DelimitedSubsetReader(io.StringIO('a,b,c\n1,2,3\n4\n'), csv.excel,
+                                       ['c'], [parse_int], [2])
+
+        with self.assertRaisesRegex(ValueError, 'line 3: expected at least 3'):
+            list(reader.iter_batches(10))
+
+    def test_categorical(self):
+        reader = DelimitedReader(io.StringIO(delimited_text()), dialect=self.dialect,
+                                 fields=self.fields, converters=self.converters,
+                                 categorical=['NAME', 'CLASS'])
+        records = list(reader)
+
+        self.assertSequenceEqual(self.expected, records)
+        self.assertIs(records[0].CLASS, records[2].CLASS)
+        self.assertEqual({'NAME', 'CLASS'}, set(reader.category_stats()))
+        self.assertEqual((3, 1), reader.category_stats()['CLASS'][:2])
+
+    def test_categorical_batches(self):
+        reader = DelimitedReader(io.StringIO(delimited_text()), dialect=self.dialect,
+                                 fields=self.fields, converters=self.converters,
+                                 categorical=['CLASS'])
+
+        batch = next(reader.iter_batches(3))
+
+        self.assertEqual(array('i', [0, 0, 0]), batch['CLASS'].values)
+        self.assertEqual(1, len(batch['CLASS'].categories))
+
 
 class TestDelimitedSubsetReader(DelimitedReaderFixture, unittest.TestCase):
     def setUp(self):
@@ -226,6 +437,34 @@ class TestDelimitedSubsetReader(DelimitedReaderFixture, unittest.TestCase):
 
         self.assertSequenceEqual(self.expected, result)
 
+    def test_from_mmap(self):
+        reader = DelimitedSubsetReader.from_mmap(path=self.path,
+                                                 encoding=self.encoding,
+                                                 dialect=self.dialect,
+                                                 fields=self.fields,
+                                                 converters=self.converters,
+                                                 field_index=self.field_index)
+
+        result = list(reader)
+
+        self.assertSequenceEqual(self.expected, result)
+
+    def test_from_file_rows(self):
+        row_index = RowOffsetIndex.build(self.path, interval=2)
+        reader = DelimitedSubsetReader.from_file_rows(path=self.path,
+                                                      encoding=self.encoding,
+                                                      dialect=self.dialect,
+                                                      fields=self.fields,
+                                                      converters=self.converters,
+                                                      field_index=self.field_index,
+                                                      start=1,
+                                                      row_index=row_index)
+
+        result = list(reader)
+
+        self.assertSequenceEqual(self.expected[1:], result)
+        self.assertEqual(4, reader.file_line_number)
+
     def test_from_zipfile(self):
         reader = DelimitedSubsetReader.from_zipfile(path=self.zip_path,
                                                     filename=self.zip_filename,
@@ -256,6 +495,289 @@ class TestDelimitedSubsetReader(DelimitedReaderFixture, unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_iter_batches(self):
+        stream = io.StringIO(delimited_text())
+        reader = DelimitedSubsetReader(stream,
+                                       dialect=self.dialect,
+                                       fields=self.fields,
+                                       converters=[passthrough, passthrough, parse_float],
+                                       field_index=self.field_index)
+
+        batch = next(reader.iter_batches(10))
+
+        self.assertEqual(self.fields, list(batch))
+        self.assertEqual(array('d', [82.0, 86.5, 83.333]), batch['AVERAGE'].values)
+        self.assertEqual(bytes(3), batch['AVERAGE'].mask)
+
+
+class TestBytesDelimitedReader(DelimitedReaderFixture, unittest.TestCase):
+    def setUp(self):
+        self.fields = ['NAME', 'CLASS', 'DATE', 'ASSIGNMENT', 'SCORE', 'AVERAGE']
+        self.converters = [str, str, parse_date, str, float, float]
+        self.expected = data_records(self.fields)
+
+    def test_stream_reader(self):
+        stream = io.BytesIO(delimited_text().encode('utf-8'))
+        reader = BytesDelimitedReader(stream, 'utf-8', self.dialect,
+                                      self.fields, self.converters)
+
+        self.assertEqual(self.fields, reader.header)
+        self.assertSequenceEqual(self.expected, list(reader))
+
+    def test_field_index(self):
+        stream = io.BytesIO(delimited_text().encode('utf-8'))
+        reader = BytesDelimitedReader(stream, 'utf-8', self.dialect,
+                                      ['NAME', 'CLASS', 'AVERAGE'],
+                                      [str, str, parse_float], [0, 1, 5])
+
+        self.assertSequenceEqual(partial_data_records(['NAME', 'CLASS', 'AVERAGE']),
+                                 list(reader))
+
+    def test_only_projected_fields_decoded(self):
+        stream = io.BytesIO(b'a,b,c\n1,2.5,\xff\n')
+        reader = BytesDelimitedReader(stream, 'utf-8', csv.excel, ['a', 'b'],
+                                      [passthrough, parse_float], [0, 1])
+
+        self.assertEqual([('1', 2.5)], list(map(tuple, reader)))
+
+    def test_factories(self):
+        for factory, source in ((BytesDelimitedReader.from_file, (self.path,)),
+                                (BytesDelimitedReader.from_mmap, (self.path,)),
+                                (BytesDelimitedReader.from_zipfile,
+                                 (self.zip_path, self.zip_filename))):
+            with self.subTest(factory=factory.__name__):
+                reader = factory(*source, self.encoding, self.dialect,
+                                 self.fields, self.converters)
+
+                self.assertSequenceEqual(self.expected, list(reader))
+
+    def test_row_filter(self):
+        stream = io.BytesIO(delimited_text().encode('utf-8'))
+        row_filter = AttributeFilter(('SCORE',), predicates=[b'91'])
+        reader = BytesDelimitedReader(stream, 'utf-8', self.dialect,
+                                      ['NAME'], [str], [0], row_filter=row_filter)
+
+        self.assertEqual([('Dave',)], list(map(tuple, reader)))
+
+    def test_categorical_keyed_by_bytes(self):
+        stream = io.BytesIO(b'a,b\nx,1\nx,2\n')
+        reader = BytesDelimitedReader(stream, 'utf-8', csv.excel, ['a', 'b'],
+                                      [passthrough, parse_int], categorical=['a'])
+
+        self.assertEqual([('x', 1), ('x', 2)], list(map(tuple, reader)))
+        self.assertEqual([b'x'], list(reader.converters[0].lookup))
+        self.assertEqual(CategoryStats(2, 1, sys.getsizeof('x')),
+                         reader.category_stats()['a'])
+
+
+class TestBytesProjectionReader(unittest.TestCase):
+    def test_tokenize(self):
+        content = b'a,b,c\n1,2,3\n"x, y",5,6\n"multi\nline",8,9\n'
+        reader = BytesProjectionReader(io.BytesIO(content), csv.excel, 'utf-8', -1)
+
+        self.assertEqual([['a', 'b', 'c'], [b'1', b'2', b'3'], [b'x, y', b'5', b'6'],
+                          [b'multi\nline', b'8', b'9']], list(reader))
+
+    def test_width(self):
+        content = b'a,b,c\n1,2,3\n"x",5,6\n'
+        reader = BytesProjectionReader(io.BytesIO(content), csv.excel, 'utf-8', 1)
+
+        self.assertEqual([['a', 'b', 'c'], [b'1', b'2,3'], [b'x']], list(reader))
+
+
+class TestFixedWidthReader(unittest.TestCase):
+    content = (b'NAME      SCORE DATE\n'
+               b'Dave         82 2015-03-02\n'
+               b'Zo\xc3\xab         91 2015-04-04\n'
+               b'Alex\n')
+    columns = [(0, 10), (10, 15), (16, 26)]
+    fields = ['name', 'score', 'date']
+    converters = [passthrough, parse_int, parse_iso_date]
+
+    def setUp(self):
+        self.expected = [('Dave', 82, date(2015, 3, 2)),
+                         ('Zo\u00eb', 91, date(2015, 4, 4)),
+                         ('Alex', None, None)]
+
+    def test_stream_reader(self):
+        reader = FixedWidthReader(io.BytesIO(self.content), 'utf-8', self.columns,
+                                  self.fields, self.converters, skip_lines=1)
+
+        self.assertEqual([b'NAME      SCORE DATE\n'], reader.header)
+        self.assertEqual(self.expected, [tuple(record) for record in reader])
+        self.assertEqual(('name', 'score', 'date'), reader.Record._fields)
+
+    def test_from_file(self):
+        with NamedTemporaryFile() as f:
+            f.write(self.content)
+            f.flush()
+
+            for factory in (FixedWidthReader.from_file, FixedWidthReader.from_mmap):
+                with self.subTest(factory=factory.__name__):
+                    with factory(f.name, 'utf-8', self.columns, self.fields,
+                                 self.converters, skip_lines=1) as reader:
+                        self.assertEqual(self.expected, list(map(tuple, reader)))
+
+    def test_from_zipfile(self):
+        with NamedTemporaryFile(suffix='.zip') as f:
+            with zipfile.ZipFile(f.name, mode='w') as archive:
+                archive.writestr('scores.txt', self.content)
+
+            reader = FixedWidthReader.from_zipfile(
+                f.name, 'scores.txt', 'utf-8', self.columns, self.fields,
+                self.converters, skip_lines=1, record_type='tuple')
+
+            self.assertEqual(self.expected, list(reader))
+
+
+class TestDelimitedWriter(unittest.TestCase):
+    def setUp(self):
+        self.fields = ['NAME', 'CLASS', 'DATE', 'ASSIGNMENT', 'SCORE', 'AVERAGE']
+        self.converters = [passthrough, passthrough, parse_iso_date, passthrough,
+                           parse_float, parse_float]
+        self.formatters = [passthrough, passthrough, format_iso_date, passthrough,
+                           format_float, format_float]
+
+    def read_back(self, stream):
+        return list(DelimitedReader(stream, MockDialect, self.fields,
+                                    self.converters))
+
+    def test_round_trip(self):
+        stream = io.StringIO(newline='')
+        records = data_records(self.fields)
+
+        writer = DelimitedWriter(stream, MockDialect, self.fields,
+                                 self.formatters, buffer_rows=2)
+        writer.writerows(records)
+        writer.flush()
+        stream.seek(0)
+
+        self.assertEqual(records, self.read_back(stream))
+
+    def test_aware_datetime_round_trip(self):
+        stream = io.StringIO(newline='')
+        eastern = DelimitedReader(io.StringIO('ts\n2014-06-29T02:25:20 EST\n'),
+                                  csv.excel, ['ts'], [parse_iso_datetime])
+        original = next(eastern).ts
+
+        writer = DelimitedWriter(stream, csv.excel, ['ts'], [format_iso_datetime])
+        writer.write((original,))
+        writer.flush()
+        stream.seek(0)
+        result = next(DelimitedReader(stream, csv.excel, ['ts'], [parse_iso_datetime]))
+
+        self.assertEqual(original, result.ts)
+        self.assertIsNotNone(result.ts.tzinfo)
+
+    def test_write_buffers_rows(self):
+        stream = io.StringIO(newline='')
+        records = data_records(self.fields)
+
+        writer = DelimitedWriter(stream, MockDialect, self.fields,
+                                 self.formatters, buffer_rows=2)
+        writer.write(records[0])
+        self.assertEqual(1, len(stream.getvalue().splitlines()))
+
+        writer.write(records[1])
+        self.assertEqual(3, len(stream.getvalue().splitlines()))
+
+    def test_write_batch(self):
+        stream = io.StringIO(newline='')
+        source = DelimitedReader(io.StringIO(delimited_text()), MockDialect,
+                                 self.fields, self.converters)
+
+        writer = DelimitedWriter(stream, MockDialect, self.fields, self.formatters)
+        for batch in source.iter_batches(2):
+            writer.write_batch(batch)
+        writer.flush()
+        stream.seek(0)
+
+        self.assertEqual(data_records(self.fields), self.read_back(stream))
+
+    def test_write_categorical_batch(self):
+        stream = io.StringIO(newline='')
+        source = DelimitedReader(io.StringIO(delimited_text()), MockDialect,
+                                 self.fields, self.converters,
+                                 categorical=['NAME', 'CLASS'])
+
+        writer = DelimitedWriter(stream, MockDialect, self.fields, self.formatters)
+        for batch in source.iter_batches(2):
+            writer.write_batch(batch)
+        writer.flush()
+        stream.seek(0)
+
+        self.assertEqual(data_records(self.fields), self.read_back(stream))
+
+    def test_write_null_values(self):
+        stream = io.StringIO(newline='')
+        fields = ['a', 'b']
+
+        writer = DelimitedWriter(stream, MockDialect, fields,
+                                 [format_int, format_iso_date])
+        writer.write((None, None))
+        writer.flush()
+
+        self.assertEqual('a|b\n|\n', stream.getvalue())
+
+    def test_to_file_compressed(self):
+        records = data_records(self.fields)
+
+        with NamedTemporaryFile(suffix='.gz') as f:
+            with DelimitedWriter.to_file(f.name, 'utf-8', MockDialect, self.fields,
+                                         self.formatters, compression='gzip') as writer:
+                writer.writerows(records)
+
+            reader = DelimitedReader.from_compressed(
+                f.name, 'utf-8', MockDialect, self.fields, self.converters)
+
+            self.assertEqual(records, list(reader))
+
+
+class TestProjectionReader(unittest.TestCase):
+    def setUp(self):
+        self.dialect = MockDialect()
+        self.text = 'A|B|C|D\n1|2|3|4\n5|"x\ny"|7|8\n9|10|11|12\n'
+
+    def test_projection_reader(self):
+        reader = ProjectionReader(io.StringIO(self.text), self.dialect, width=2)
+
+        expected = [['A', 'B', 'C', 'D'], ['1', '2', '3|4'],
+                    ['5', 'x\ny', '7', '8'], ['9', '10', '11|12']]
+        result = list(reader)
+
+        self.assertEqual(expected, result)
+        self.assertEqual(5, reader.line_num)
+
+    def test_subset_reader_projection(self):
+        reader = DelimitedSubsetReader(io.StringIO(self.text), dialect=self.dialect,
+                                       fields=['B', 'A'], converters=[str, int],
+                                       field_index=[1, 0])
+
+        expected = [('2', 1), ('x\ny', 5), ('10', 9)]
+        result = [tuple(record) for record in reader]
+
+        self.assertEqual(expected, result)
+        self.assertEqual(['A', 'B', 'C', 'D'], reader.header)
+
+    def test_row_filter_widens_projection(self):
+        row_filter = AttributeFilter(('D',), predicates=['8', '12'])
+        reader = DelimitedSubsetReader(io.StringIO(self.text), dialect=self.dialect,
+                                       fields=['A'], converters=[int],
+                                       field_index=[0], row_filter=row_filter)
+
+        expected = [(5,), (9,)]
+        result = [tuple(record) for record in reader]
+
+        self.assertEqual(expected, result)
+
+    def test_supports(self):
+        class SpaceDialect(MockDialect):
+            skipinitialspace = True
+
+        self.assertTrue(ProjectionReader.supports(self.dialect))
+        self.assertTrue(ProjectionReader.supports('excel'))
+        self.assertFalse(ProjectionReader.supports(SpaceDialect()))
+
 
 class TestZipReader(ReaderFixture, unittest.TestCase):
 
@@ -281,6 +803,61 @@ class TestZipReader(ReaderFixture, unittest.TestCase):
 
         self.assertEqual(expected, list(line_gen))
 
+    def test_stream(self):
+        lines = ZipReader(self.path, self.filename).stream(self.encoding)
+        expected = ['abc\n', 'easy\n', '123.\n']
+
+        self.assertEqual(expected, list(lines))
+
+    def test_stream_small_buffer(self):
+        content = 'h\u00e9llo,"multi\r\nline"\r\n\u20ac\n'
+        with NamedTemporaryFile(prefix='zipped_', suffix='.zip') as tmp:
+            with zipfile.ZipFile(tmp.name, mode='w') as myzip:
+                myzip.writestr(self.filename, content.encode(self.encoding))
+            reader = ZipReader(tmp.name, self.filename)
+
+            result = list(csv.reader(reader.stream(self.encoding, buffer_size=1)))
+
+        self.assertEqual([['h\u00e9llo', 'multi\r\nline'], ['\u20ac']], result)
+
+
+class TestZipArchivePool(ReaderFixture, unittest.TestCase):
+
+    members = {'a_1.txt': 'abc\neasy\n', 'a_2.txt': '123.\n', 'b.txt': 'skip\n'}
+
+    @classmethod
+    def _prep(cls):
+        with NamedTemporaryFile(prefix='zipped_', suffix='.zip', delete=False) as tmp:
+            with zipfile.ZipFile(tmp.name, mode='w') as myzip:
+                for name, content in cls.members.items():
+                    myzip.writestr(name, content.encode(cls.encoding))
+            cls.path = tmp.name
+
+    def test_reuses_archive(self):
+        with ZipArchivePool() as pool:
+            archive = pool.archive(self.path)
+
+            self.assertIs(archive, pool.archive(self.path))
+            self.assertEqual(b'123.\n', pool.reader(self.path, 'a_2.txt').read_bytes())
+        self.assertEqual({}, pool.archives)
+
+    def test_reopens_modified_archive(self):
+        with ZipArchivePool() as pool:
+            archive = pool.archive(self.path)
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            self.assertIsNot(archive, pool.archive(self.path))
+
+    def test_iter_member_lines(self):
+        with ZipArchivePool() as pool:
+            streams = pool.iter_member_lines(self.path, r'a_\d.txt', self.encoding)
+
+            expected = ['abc', 'easy', '123.']
+            result = list(concatenate_streams(streams))
+
+        self.assertEqual(expected, result)
+
 
 class TestConcatenateStreams(unittest.TestCase):
     def test_concatenate_streams(self):
@@ -43,6 +43,27 @@ class TestAttributeFilter(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_row_predicate(self):
+        header = ['sport', 'team', 'rank']
+        rows = [['baseball', 'cubs', '2'], ['basketball', 'bulls', '1'],
+                ['basketball', 'knicks', '3']]
+        keys = ('team', 'sport')
+        include = [('bulls', 'basketball'), ('cubs', 'basketball')]
+
+        predicate = AttributeFilter(keys, predicates=include).row_predicate(header)
+
+        expected = [['basketball', 'bulls', '1']]
+        result = list(filter(predicate, rows))
+
+        self.assertEqual(expected, result)
+
+    def test_single_key_row_predicate(self):
+        header = ['sport', 'team', 'rank']
+        predicate = AttributeFilter(('rank',), predicates=['1']).row_predicate(header)
+
+        self.assertTrue(predicate(['basketball', 'bulls', '1']))
+        self.assertFalse(predicate(['basketball', 'bulls', '2']))
+
     def test_create_key_filter(self):
         properties = {'sports': ['baseball', 'basketball'],
                       'teams': ['bulls', 'knicks', 'lakers']}
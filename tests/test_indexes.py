@@ -0,0 +1,85 @@
+import io
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from foil.indexes import (INDEX_SUFFIX, RowOffsetIndex, iter_record_ends,
+                          iter_record_starts, skip_record)
+
+
+def indexed_text():
+    lines = ['ID,NOTE']
+    lines.extend('{},"row {}\nnote"'.format(i, i) for i in range(10))
+    return '\n'.join(lines) + '\n'
+
+
+class TestRecordScanning(unittest.TestCase):
+    def test_iter_record_starts(self):
+        data = io.BytesIO(b'A,B\n1,"x\ny"\n2,z\n')
+
+        expected = [(0, 4, 1), (1, 12, 3), (2, 16, 4)]
+        result = list(iter_record_starts(data))
+
+        self.assertEqual(expected, result)
+
+    def test_iter_record_ends_inside_quotes(self):
+        data = io.BytesIO(b'y"\n2,z\n')
+
+        self.assertEqual([(3, 1), (7, 2)], list(iter_record_ends(data, quotes=1)))
+
+    def test_skip_record(self):
+        data = io.BytesIO(b'1,"x\ny"\n2,z\n')
+
+        self.assertEqual(2, skip_record(data))
+        self.assertEqual(b'2,z\n', data.read())
+
+
+class TestRowOffsetIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'rows.csv')
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write(indexed_text())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build(self):
+        index = RowOffsetIndex.build(self.path, interval=4)
+
+        self.assertEqual([0, 4, 8], index.rows)
+        self.assertEqual(1, index.header_lines)
+        self.assertEqual(9, index.checkpoints[1].line_number)
+
+    def test_open_saves_sidecar(self):
+        index = RowOffsetIndex.open(self.path, interval=4)
+
+        self.assertTrue(os.path.exists(self.path + INDEX_SUFFIX))
+        self.assertEqual(index.checkpoints, RowOffsetIndex.load(self.path).checkpoints)
+
+    def test_open_unsaved(self):
+        index_path = os.path.join(self.directory.name, 'missing', 'rows.idx')
+
+        index = RowOffsetIndex.open(self.path, interval=4, index_path=index_path)
+
+        self.assertEqual([0, 4, 8], index.rows)
+        self.assertFalse(os.path.exists(index_path))
+
+    def test_stale_index(self):
+        RowOffsetIndex.open(self.path, interval=4)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('10,"row 10"\n')
+
+        self.assertIsNone(RowOffsetIndex.load(self.path))
+        self.assertEqual(os.path.getsize(self.path),
+                         RowOffsetIndex.open(self.path, interval=4).size)
+
+    def test_open_rows(self):
+        index = RowOffsetIndex.build(self.path, interval=4)
+
+        lines, line_number = index.open_rows(5, 7)
+
+        expected = ['ID,NOTE\n', '5,"row 5\n', 'note"\n', '6,"row 6\n', 'note"\n']
+
+        self.assertEqual(expected, list(lines))
+        self.assertEqual(11, line_number)
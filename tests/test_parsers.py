@@ -1,12 +1,19 @@
+import io
 import unittest
-from datetime import date
-
-from foil.parsers import (make_converters, parse_bool, passthrough,
+from datetime import date, datetime
+from decimal import Decimal
+
+from foil.parsers import (make_bytes_converters, make_converters, memoize,
+                          memo_hit_rate,
+                          make_formatters, format_bool,
+                          format_decimal, format_float, format_int,
+                          format_iso_date, parse_bool, passthrough,
                           parse_float, parse_int, parse_int_bool,
-                          parse_iso_date, parse_numeric, parse_quoted_bool,
+                          parse_iso_date, parse_iso_datetime, parse_numeric,
+                          parse_quoted_bool,
                           parse_quoted_float, parse_quoted_int,
                           parse_quoted_string, parse_quoted_numeric,
-                          parse_broken_json)
+                          parse_broken_json, iter_broken_json)
 
 
 class TestTextParsers(unittest.TestCase):
@@ -60,6 +67,17 @@ class TestTextParsers(unittest.TestCase):
 
                 self.assertEqual(expected, result)
 
+    def test_parse_iso_datetime(self):
+        mock_data = [('2014-04-04T10:11:12', datetime(2014, 4, 4, 10, 11, 12)),
+                     ('', None), (None, None)]
+
+        for input_expected in mock_data:
+            with self.subTest(input_expect=input_expected):
+                result = parse_iso_datetime(input_expected[0])
+                expected = input_expected[1]
+
+                self.assertEqual(expected, result)
+
     def test_pass_through(self):
         expected = 123
         result = passthrough(expected)
@@ -124,6 +142,78 @@ class TestMakeConverters(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_datetime_parser_per_field(self):
+        converters = make_converters({'created': datetime, 'updated': datetime})
+        created, updated = converters['created'], converters['updated']
+
+        for _ in range(2):
+            self.assertEqual(datetime(2015, 4, 3), created('2015-04-03'))
+            self.assertEqual(datetime(2015, 4, 3, 6, 34, 22),
+                             updated('2015-04-03T06:34:22'))
+
+        self.assertIsNot(created.keywords['parser'], updated.keywords['parser'])
+        self.assertEqual(1, len(created.keywords['parser'].layout_parsers))
+        self.assertEqual(1, len(updated.keywords['parser'].layout_parsers))
+
+
+class TestMemoize(unittest.TestCase):
+    def test_memoized_converter(self):
+        converter = memoize(parse_iso_date, maxsize=2)
+        values = ['2015-03-02', '2015-03-02', '', '2015-03-02']
+
+        self.assertEqual([date(2015, 3, 2), date(2015, 3, 2), None, date(2015, 3, 2)],
+                         list(map(converter, values)))
+        self.assertEqual(0.5, memo_hit_rate(converter))
+        self.assertIs(parse_iso_date, converter.__wrapped__)
+
+    def test_unused_hit_rate(self):
+        self.assertEqual(0.0, memo_hit_rate(memoize(parse_int)))
+
+
+class TestBytesParsers(unittest.TestCase):
+    def test_numeric_bytes(self):
+        converters = make_bytes_converters([parse_int, parse_float, int], 'ascii')
+
+        self.assertEqual([42, -1.5, 7],
+                         [c(v) for c, v in zip(converters, [b'42', b'-1.5', b'7'])])
+        self.assertEqual([None, None], [c(b'') for c in converters[:2]])
+
+    def test_decoded_converters(self):
+        text, day = make_bytes_converters([passthrough, parse_iso_date], 'utf-8')
+
+        self.assertEqual('Zo\u00eb', text('Zo\u00eb'.encode('utf-8')))
+        self.assertEqual(date(2015, 3, 2), day(b'2015-03-02'))
+        self.assertIsNone(day(b''))
+
+
+class TestFormatters(unittest.TestCase):
+    def test_format_numeric(self):
+        self.assertEqual('42', format_int(42))
+        self.assertEqual('82.5', format_float(82.5))
+        self.assertEqual('0.1000000000000000055511151231',
+                         format_decimal(Decimal('0.1000000000000000055511151231')))
+        self.assertEqual('', format_float(None))
+
+    def test_format_bool(self):
+        for value in (True, False, None):
+            with self.subTest(value=value):
+                self.assertEqual(value, parse_bool(format_bool(value)))
+
+    def test_format_iso_date(self):
+        self.assertEqual('2015-03-02', format_iso_date(date(2015, 3, 2)))
+        self.assertEqual('', format_iso_date(None))
+
+        value = datetime(2015, 3, 2, 9, 30, 15, 250)
+        self.assertEqual(value, parse_iso_datetime(format_iso_date(value)))
+
+    def test_make_formatters(self):
+        inputted = {'ticker': str, 'shares': int, 'bought': bool,
+                    'custom': Klass}
+        expected = {'ticker': passthrough, 'shares': format_int,
+                    'bought': format_bool, 'custom': Klass}
+
+        self.assertEqual(expected, make_formatters(inputted))
+
 
 class TestJSONParsers(unittest.TestCase):
     def test_parse_broken_json(self):
@@ -133,3 +223,16 @@ class TestJSONParsers(unittest.TestCase):
         result = parse_broken_json(broken_json)
 
         self.assertEqual(expected, result)
+
+    def test_parse_broken_json_colon_values(self):
+        broken_json = "{time:'09:30', url:'http://a.b/c'}"
+
+        expected = {'time': '09:30', 'url': 'http://a.b/c'}
+        result = parse_broken_json(broken_json)
+
+        self.assertEqual(expected, result)
+
+    def test_iter_broken_json(self):
+        stream = io.StringIO('{a:1}\n{b:[2,],}\n')
+
+        self.assertEqual([{'a': 1}, {'b': [2]}], list(iter_broken_json(stream, 3)))
@@ -3,6 +3,7 @@ import unittest
 import zipfile
 from tempfile import NamedTemporaryFile
 
+from foil.fileio import ZipArchivePool
 from foil.paths import (match_files, match_file_listing,
                         get_file_listing_sha,
                         match_zipfile_members,
@@ -74,6 +75,14 @@ class TestZipPaths(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_match_zipfile_members_pool(self):
+        with ZipArchivePool() as pool:
+            expected = set(mock_pattern_match())
+            result = set(match_zipfile_members(self.zip_path, self.pattern, pool))
+
+            self.assertEqual(expected, result)
+            self.assertIn(self.zip_path, pool.archives)
+
     @classmethod
     def tearDownClass(cls):
         if os.path.exists(cls.zip_path):
@@ -0,0 +1,138 @@
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import unittest
+import warnings
+from tempfile import TemporaryDirectory
+
+from foil.fileio import DelimitedReader, DelimitedSubsetReader
+from foil.parsers import parse_float, parse_int, passthrough
+from foil.profiling import (ReaderStats, Timer, main, profile_file, time_iterator,
+                            timed)
+
+
+CONTENT = 'name,shares,price\nAPPL,100,12.5\nIBM,200,7.25\nMSFT,300,3.0\n'
+
+
+class TestTimers(unittest.TestCase):
+    def test_timed(self):
+        timer = Timer()
+        double = timed(lambda value: value * 2, timer)
+
+        self.assertEqual([2, 4], [double(1), double(2)])
+        self.assertEqual(2, timer.calls)
+        self.assertGreaterEqual(timer.seconds, 0)
+
+    def test_timed_counts_failures(self):
+        timer = Timer()
+
+        with self.assertRaises(ValueError):
+            timed(int, timer)('x')
+
+        self.assertEqual(1, timer.calls)
+
+    def test_time_iterator(self):
+        timer = Timer()
+
+        self.assertEqual([1, 2, 3], list(time_iterator([1, 2, 3], timer)))
+        self.assertEqual(3, timer.calls)
+
+
+class TestReaderStats(unittest.TestCase):
+    def test_delimited_reader(self):
+        stats = ReaderStats()
+        reader = DelimitedReader(io.StringIO(CONTENT), csv.excel,
+                                 ['name', 'shares', 'price'],
+                                 [passthrough, parse_int, parse_float], stats=stats)
+        records = list(reader)
+
+        self.assertEqual(('IBM', 200, 7.25), tuple(records[1]))
+        self.assertEqual(3, stats.rows)
+        self.assertEqual(len(CONTENT.encode('utf-8')), stats.bytes)
+        self.assertEqual(4, stats.read.calls)
+        self.assertEqual(['shares', 'price'], list(stats.converters))
+        self.assertEqual(3, stats.converters['price'].calls)
+        self.assertEqual(['read', 'tokenize', 'convert', 'record'],
+                         list(stats.stage_seconds()))
+        self.assertGreater(stats.rows_per_second, 0)
+
+    def test_counts_encoded_bytes(self):
+        content = 'name\nZürich\n'
+        stats = ReaderStats(encoding='utf-8')
+        list(DelimitedReader(io.StringIO(content), csv.excel, ['name'],
+                             [passthrough], stats=stats))
+
+        self.assertEqual(len(content.encode('utf-8')), stats.bytes)
+
+    def test_subset_reader(self):
+        stats = ReaderStats()
+        reader = DelimitedSubsetReader(io.StringIO(CONTENT), csv.excel, ['price'],
+                                       [parse_float], [2], stats=stats)
+
+        self.assertEqual([12.5, 7.25, 3.0], [record.price for record in reader])
+        self.assertEqual(3, stats.converters['price'].calls)
+
+    def test_disabled_by_default(self):
+        reader = DelimitedReader(io.StringIO(CONTENT), csv.excel,
+                                 ['name', 'shares', 'price'],
+                                 [passthrough, parse_int, parse_float])
+
+        self.assertIsNone(reader.stats)
+        self.assertEqual('<row converter>', reader.convert_row.__code__.co_filename)
+
+    def test_as_dict_serializable(self):
+        stats = ReaderStats()
+        list(DelimitedReader(io.StringIO(CONTENT), csv.excel, ['name', 'shares', 'price'],
+                             [passthrough, parse_int, parse_float], stats=stats))
+
+        result = json.loads(json.dumps(stats.as_dict()))
+
+        self.assertEqual(3, result['rows'])
+        self.assertEqual(3, result['converters']['shares']['calls'])
+
+
+class TestProfileFile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'prices.csv')
+
+        with open(cls.path, 'w', encoding='utf-8') as f:
+            f.write(CONTENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_inferred_schema(self):
+        stats = profile_file(self.path, 'utf-8', csv.excel)
+
+        self.assertEqual(3, stats.rows)
+        self.assertEqual(['shares', 'price'], list(stats.converters))
+
+    def test_field_subset(self):
+        stats = profile_file(self.path, 'utf-8', csv.excel, ['price'], ['float'],
+                             limit=2)
+
+        self.assertEqual(2, stats.rows)
+        self.assertEqual(['price'], list(stats.converters))
+
+    def test_closes_reader(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            profile_file(self.path, 'utf-8', csv.excel, limit=1)
+            gc.collect()
+
+        self.assertEqual([], [warning for warning in caught
+                              if issubclass(warning.category, ResourceWarning)])
+
+    def test_main_json(self):
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            main([self.path, '--fields', 'name,shares', '--json'])
+
+        self.assertEqual(3, json.loads(output.getvalue())['rows'])
@@ -0,0 +1,121 @@
+import sys
+import unittest
+from array import array
+from collections import namedtuple
+from operator import attrgetter, itemgetter
+
+from foil.filters import AttributeFilter
+from foil.order import partition_ordered
+from foil.parsers import parse_float, parse_int, passthrough
+from foil.recordtypes import (ColumnarRecords, make_record_type,
+                              make_slots_record, record_footprint)
+
+
+FIELDS = ('sport', 'team', 'rank')
+
+
+class TestSlotsRecord(unittest.TestCase):
+    def setUp(self):
+        self.Record = make_slots_record(FIELDS)
+        self.record = self.Record('baseball', 'cubs', 2)
+
+    def test_attributes(self):
+        self.assertEqual('cubs', self.record.team)
+        self.assertEqual(2, self.record[2])
+        self.assertEqual(('baseball', 'cubs', 2), tuple(self.record))
+        self.assertFalse(hasattr(self.record, '__dict__'))
+
+    def test_equals_namedtuple(self):
+        Record = namedtuple('Record', FIELDS)
+
+        self.assertEqual(Record('baseball', 'cubs', 2), self.record)
+        self.assertEqual(hash(Record('baseball', 'cubs', 2)), hash(self.record))
+
+    def test_repr(self):
+        expected = "Record(sport='baseball', team='cubs', rank=2)"
+
+        self.assertEqual(expected, repr(self.record))
+
+    def test_smaller_than_namedtuple(self):
+        Record = namedtuple('Record', FIELDS)
+
+        self.assertLess(sys.getsizeof(self.record),
+                        sys.getsizeof(Record('baseball', 'cubs', 2)))
+
+
+class TestColumnarRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = ColumnarRecords(FIELDS, [passthrough, passthrough, parse_int])
+        self.views = [self.records.append('baseball', 'cubs', 2),
+                      self.records.append('basketball', 'bulls', 1)]
+
+    def test_views(self):
+        self.assertEqual(2, len(self.records))
+        self.assertEqual('bulls', self.views[1].team)
+        self.assertEqual(('baseball', 'cubs', 2), tuple(self.records[0]))
+        self.assertEqual(list(self.views), list(self.records))
+
+    def test_typed_column(self):
+        self.assertEqual(array('q', [2, 1]), self.records.columns[2])
+
+    def test_typed_column_widens(self):
+        self.records.append('hockey', 'hawks', None)
+
+        self.assertEqual([2, 1, None], self.records.columns[2])
+        self.assertEqual(1, self.views[1].rank)
+
+
+class TestMakeRecordType(unittest.TestCase):
+    def test_record_types(self):
+        self.assertIs(tuple, make_record_type(FIELDS, 'tuple'))
+        self.assertEqual(FIELDS, make_record_type(FIELDS, 'namedtuple')._fields)
+        self.assertEqual(FIELDS, make_record_type(FIELDS, 'slots')._fields)
+        self.assertEqual(FIELDS, make_record_type(FIELDS, 'columnar').fields)
+
+    def test_unknown_record_type(self):
+        with self.assertRaises(ValueError):
+            make_record_type(FIELDS, 'dict')
+
+
+class TestRecordFootprint(unittest.TestCase):
+    def test_footprints(self):
+        values = ('basketball', 'bulls', 1.5)
+        converters = [passthrough, passthrough, parse_float]
+        namedtuple_record = namedtuple('Record', FIELDS)(*values)
+        slots_record = make_slots_record(FIELDS)(*values)
+        view = ColumnarRecords(FIELDS, converters).append(*values)
+
+        value_size = sum(map(sys.getsizeof, values))
+
+        self.assertEqual(sys.getsizeof(namedtuple_record) + value_size,
+                         record_footprint(namedtuple_record))
+        self.assertEqual(sys.getsizeof(slots_record) + value_size,
+                         record_footprint(slots_record))
+        self.assertLess(record_footprint(view), record_footprint(namedtuple_record))
+
+
+class TestKeyFunctionCompatibility(unittest.TestCase):
+    def test_filters_and_partitions(self):
+        rows = [('baseball', 'cubs', 2), ('baseball', 'mets', 1),
+                ('basketball', 'bulls', 1)]
+
+        for record_type in ('namedtuple', 'slots', 'columnar'):
+            with self.subTest(record_type=record_type):
+                Record = make_record_type(FIELDS, record_type)
+                make = getattr(Record, 'append', Record)
+                records = [make(*row) for row in rows]
+
+                included = AttributeFilter(('rank',), [1]).including(records)
+                partitions = dict(partition_ordered(records, attrgetter('sport')))
+
+                self.assertEqual(rows[1:], [tuple(r) for r in included])
+                self.assertEqual(2, len(partitions['baseball']))
+
+    def test_plain_tuples(self):
+        rows = [('baseball', 'cubs', 2), ('basketball', 'bulls', 1)]
+
+        included = AttributeFilter((2,), [1]).including(rows)
+        partitions = dict(partition_ordered(rows, itemgetter(0)))
+
+        self.assertEqual(rows[1:], list(included))
+        self.assertEqual(['baseball', 'basketball'], list(partitions))
@@ -0,0 +1,89 @@
+import io
+import unittest
+
+from foil.relaxedjson import iter_documents, loads, to_json
+
+
+class TestLoads(unittest.TestCase):
+    def test_unquoted_keys(self):
+        self.assertEqual({'success': True, 'count': 3, 'missing': None},
+                         loads('{success:true, count: 3, missing:null}'))
+
+    def test_single_quotes(self):
+        expected = {'name': 'it\'s "quoted"', 'escaped': 'line\n'}
+
+        self.assertEqual(expected,
+                         loads("{'name': 'it\\'s \"quoted\"', escaped: 'line\\n'}"))
+
+    def test_trailing_commas(self):
+        self.assertEqual({'items': [1, 2], 'nested': [{'a': 1}]},
+                         loads('{items: [1, 2,], nested: [{a: 1,},],}'))
+
+    def test_values_with_colons(self):
+        expected = {'url': 'http://example.com:80/a', 'time': '09:30:00'}
+
+        self.assertEqual(expected,
+                         loads('{url:"http://example.com:80/a", time:\'09:30:00\'}'))
+
+    def test_numbers_and_bare_values(self):
+        self.assertEqual({'e': -1500.0, 'status': 'ok', 'x1': 0.5},
+                         loads('{e: -1.5e3, status: ok, x1: 0.5}'))
+
+    def test_yaml_scalars(self):
+        cases = [
+            ('{content-type: 1}', {'content-type': 1}),
+            ('{a: .5, b: -.5}', {'a': 0.5, 'b': -0.5}),
+            ('{a: +1, b: +1.5e2}', {'a': 1, 'b': 150.0}),
+            ('{a: 1., b: 1.e3}', {'a': 1.0, 'b': 1000.0}),
+            ('{a: 2014-01-01, b: 10px, c: -Infinity}',
+             {'a': '2014-01-01', 'b': '10px', 'c': float('-inf')}),
+        ]
+
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(expected, loads(text))
+
+    def test_strict_json_unchanged(self):
+        text = '{"a": [1, "b, c", {"d": "e\\"f"}], "g": false}'
+
+        self.assertEqual(text, to_json(text))
+
+    def test_options(self):
+        self.assertEqual([('a', 1)], loads('{a: 1}', object_pairs_hook=list))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            loads('{a: }')
+
+
+class TestIterDocuments(unittest.TestCase):
+    text = ('{a: 1.25e+3, b: \'x,}\'}\n{c: [1, 2,],}\n[true, false]\n'
+            '3 \'str\' {z: "e\\"nd"} 4.5')
+    expected = [{'a': 1250.0, 'b': 'x,}'}, {'c': [1, 2]}, [True, False], 3, 'str',
+                {'z': 'e"nd'}, 4.5]
+
+    def test_chunk_boundaries(self):
+        for chunk_size in (1, 2, 3, 7, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.expected,
+                                 list(iter_documents(io.StringIO(self.text), chunk_size)))
+
+    def test_yaml_scalars_chunked(self):
+        text = '{content-type: .5}\n[+1, 1., 2014-01-01]'
+        expected = [{'content-type': 0.5}, [1, 1.0, '2014-01-01']]
+
+        for chunk_size in (1, 2, 5):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(expected,
+                                 list(iter_documents(io.StringIO(text), chunk_size)))
+
+    def test_empty(self):
+        self.assertEqual([], list(iter_documents(io.StringIO(' \n'))))
+
+    def test_comma_between_documents(self):
+        with self.assertRaises(ValueError):
+            list(iter_documents(io.StringIO('{a: 1}, {b: 2}')))
+
+    def test_unterminated(self):
+        with self.assertRaises(ValueError):
+            list(iter_documents(io.StringIO('{a: \'open}'), 4))
@@ -0,0 +1,157 @@
+import csv
+import io
+import os
+import random
+import unittest
+import zipfile
+from datetime import date
+from decimal import Decimal
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from foil.parsers import (parse_bool, parse_decimal, parse_float, parse_int,
+                          parse_iso_date, parse_quoted_string, passthrough)
+from foil.schemas import (Schema, SchemaCache, infer_file_schema, infer_schema,
+                          infer_type, infer_zipfile_schema, reservoir_sample)
+
+
+def schema_text():
+    lines = ['ID,PRICE,ACTIVE,TRADED,STAMP,NAME,EXACT']
+    for i in range(50):
+        lines.append('{},{}.25,{},2015-03-{:02d},2015-03-02T09:30:{:02d} EST,"""N{}""",'
+                     '0.12345678901234567{}'.format(i, i, 'true' if i % 2 else 'false',
+                                                    i % 28 + 1, i % 60, i, i % 10))
+    lines.append('50,,,,,"""""",')
+    return '\n'.join(lines) + '\n'
+
+
+class TestReservoirSample(unittest.TestCase):
+    def test_sample_size(self):
+        sample = reservoir_sample(range(1000), 10, random.Random(1))
+
+        self.assertEqual(10, len(sample))
+        self.assertEqual(10, len(set(sample)))
+
+    def test_short_iterable(self):
+        self.assertEqual([0, 1], reservoir_sample(range(2), 10))
+
+
+class TestInferType(unittest.TestCase):
+    def test_types(self):
+        mock_data = [
+            (['1', '-2', ''], 'int'),
+            (['1', '0'], 'int'),
+            (['1.5', '2', '3e5'], 'float'),
+            (['12345678901234567.5'], 'decimal'),
+            (['true', 'false', '1'], 'bool'),
+            (['2015-01-02', ''], 'date'),
+            (['2015-01-02T03:04:05', '2015-01-02 03:04:05.123 EDT'], 'datetime'),
+            (['abc', '1'], 'str'),
+            (['"1"', '"2"', '""'], 'quoted_int'),
+            (['"abc"', '"2015-01-02"'], 'quoted_str'),
+            (['', ''], 'str'),
+            (['2014-01-01', '2014-13-01'], 'str'),
+            (['2014-01-01 10:00:00 UTC'], 'str'),
+        ]
+
+        for values, expected in mock_data:
+            with self.subTest(values=values):
+                self.assertEqual(expected, infer_type(values))
+
+
+class TestInferSchema(unittest.TestCase):
+    def setUp(self):
+        self.dialect = csv.get_dialect('excel')
+        self.expected = Schema(
+            ['ID', 'PRICE', 'ACTIVE', 'TRADED', 'STAMP', 'NAME', 'EXACT'],
+            ['int', 'float', 'bool', 'date', 'datetime', 'quoted_str', 'decimal'])
+
+    def test_infer_schema(self):
+        result = infer_schema(io.StringIO(schema_text()), self.dialect, sample_size=20)
+
+        self.assertEqual(self.expected, result)
+
+    def test_blank_lines_skipped(self):
+        result = infer_schema(io.StringIO('a,b,c\n1,x,2.5\n\n'), self.dialect)
+
+        self.assertEqual(Schema(['a', 'b', 'c'], ['int', 'str', 'float']), result)
+
+    def test_short_row(self):
+        with self.assertRaisesRegex(ValueError, 'line 3: expected 3 fields, got 2'):
+            infer_schema(io.StringIO('a,b,c\n1,x,2.5\n2,y\n'), self.dialect)
+
+    def test_converters(self):
+        schema = Schema(['a', 'b', 'c', 'd', 'e', 'f', 'g'],
+                        ['int', 'float', 'bool', 'date', 'str', 'quoted_str', 'decimal'])
+
+        expected = [parse_int, parse_float, parse_bool, parse_iso_date,
+                    passthrough, parse_quoted_string, parse_decimal]
+
+        self.assertEqual(expected, schema.converters)
+
+    def test_converters_parse_sample(self):
+        schema = infer_schema(io.StringIO(schema_text()), self.dialect)
+        row = next(csv.reader(io.StringIO(schema_text().splitlines()[2])))
+
+        result = [convert(value) for convert, value in zip(schema.converters, row)]
+
+        self.assertEqual([1, 1.25, True, date(2015, 3, 2)], result[:4])
+        self.assertEqual('N1', result[5])
+        self.assertEqual(Decimal('0.123456789012345671'), result[6])
+
+
+class TestCachedInference(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.dialect = csv.get_dialect('excel')
+        self.path = os.path.join(self.directory.name, 'feed.csv')
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write(schema_text())
+        self.zip_path = os.path.join(self.directory.name, 'feed.zip')
+        with zipfile.ZipFile(self.zip_path, mode='w') as archive:
+            archive.writestr('feed.csv', schema_text())
+        self.cache = SchemaCache(os.path.join(self.directory.name, 'schemas'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_file_schema_cached(self):
+        first = infer_file_schema(self.path, 'utf-8', self.dialect, cache=self.cache)
+
+        with mock.patch('foil.schemas.infer_schema') as infer:
+            second = infer_file_schema(self.path, 'utf-8', self.dialect, cache=self.cache)
+
+        infer.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_changed_file_resampled(self):
+        infer_file_schema(self.path, 'utf-8', self.dialect, cache=self.cache)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('51,x,,,,,\n')
+
+        schema = infer_file_schema(self.path, 'utf-8', self.dialect, cache=self.cache)
+
+        self.assertEqual('str', schema.types[1])
+
+    def test_changed_past_fingerprint_resampled(self):
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write('ID,CODE\n1,2\n')
+        stat = os.stat(self.path)
+
+        with mock.patch('foil.schemas.FINGERPRINT_SIZE', 8):
+            infer_file_schema(self.path, 'utf-8', self.dialect, cache=self.cache)
+            with open(self.path, 'w', encoding='utf-8', newline='') as f:
+                f.write('ID,CODE\n1,x\n')
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            schema = infer_file_schema(self.path, 'utf-8', self.dialect,
+                                       cache=self.cache)
+
+        self.assertEqual(['int', 'str'], schema.types)
+
+    def test_zipfile_schema(self):
+        schema = infer_zipfile_schema(self.zip_path, 'feed.csv', 'utf-8', self.dialect,
+                                      cache=self.cache)
+
+        self.assertEqual(infer_file_schema(self.path, 'utf-8', self.dialect), schema)
+        self.assertEqual(1, len(os.listdir(self.cache.directory)))
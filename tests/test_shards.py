@@ -0,0 +1,181 @@
+import csv
+import io
+import os
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import NamedTemporaryFile
+
+from foil.fileio import DelimitedReader
+from foil.parsers import parse_int, passthrough
+from foil.shards import (ParallelZipReader, Shard, ShardedDelimitedReader,
+                         bounded_map, count_range, find_shards,
+                         parse_shard)
+
+
+class MockDialect(csv.Dialect):
+    delimiter = ','
+    quotechar = '"'
+    doublequote = True
+    skipinitialspace = False
+    lineterminator = '\n'
+    quoting = csv.QUOTE_MINIMAL
+
+
+def sharded_text():
+    lines = ['"ID","NOTE"']
+    lines.extend('{},"note {}\nspans ""lines"""'.format(i, i) for i in range(40))
+    return '\n'.join(lines) + '\n'
+
+
+class ShardFixture:
+    encoding = 'UTF-8'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dialect = MockDialect()
+        with NamedTemporaryFile(prefix='shard_', suffix='.csv', delete=False) as tmp:
+            with open(tmp.name, 'w', encoding=cls.encoding, newline='') as text_file:
+                text_file.write(sharded_text())
+            cls.path = tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.path):
+            os.unlink(cls.path)
+
+    def expected(self):
+        stream = io.StringIO(sharded_text(), newline='')
+        return list(DelimitedReader(stream, dialect=self.dialect, fields=['ID', 'NOTE'],
+                                    converters=[parse_int, passthrough]))
+
+
+class TestCountRange(ShardFixture, unittest.TestCase):
+    def test_counts(self):
+        with open(self.path, 'rb') as file:
+            content = file.read()[10:200]
+
+        expected = (content.count(b'\n'), content.count(b'"'))
+
+        self.assertEqual(expected, count_range(self.path, '"', (10, 200)))
+
+
+class TestFindShards(ShardFixture, unittest.TestCase):
+    def test_shards_cover_file(self):
+        shards = find_shards(self.path, shard_size=64)
+
+        self.assertGreater(len(shards), 1)
+        self.assertEqual(os.path.getsize(self.path), shards[-1].end)
+        for previous, shard in zip(shards, shards[1:]):
+            self.assertEqual(previous.end, shard.start)
+
+    def test_split_inside_quotes(self):
+        with NamedTemporaryFile(prefix='quoted_', suffix='.csv') as tmp:
+            tmp.write(b'a,b\n1,"x\ny"\n2,c\n')
+            tmp.flush()
+
+            expected = [Shard(4, 12, 1), Shard(12, 16, 3)]
+
+            for shard_size in (1, 5, 8):
+                with self.subTest(shard_size=shard_size):
+                    self.assertEqual(expected, find_shards(tmp.name, shard_size))
+
+    def test_executor_map(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = find_shards(self.path, shard_size=64, map=executor.map)
+
+        self.assertEqual(find_shards(self.path, shard_size=64), result)
+
+    def test_shard_line_numbers(self):
+        shards = find_shards(self.path, shard_size=64)
+
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        for shard in shards:
+            with self.subTest(shard=shard):
+                self.assertEqual(content.count(b'\n', 0, shard.start), shard.line_number)
+
+    def test_parse_error_line_number(self):
+        shard = Shard(0, os.path.getsize(self.path), 0)
+
+        with self.assertRaisesRegex(ValueError, 'line 1:'):
+            parse_shard(self.path, shard, self.encoding, self.dialect, [int, str])
+
+
+class TestShardedDelimitedReader(ShardFixture, unittest.TestCase):
+    def test_ordered(self):
+        reader = ShardedDelimitedReader(self.path, self.encoding, self.dialect,
+                                        fields=['ID', 'NOTE'],
+                                        converters=[parse_int, passthrough],
+                                        shard_size=128, processes=2)
+
+        self.assertEqual(self.expected(), list(reader))
+
+    def test_unordered(self):
+        reader = ShardedDelimitedReader(self.path, self.encoding, self.dialect,
+                                        fields=['ID', 'NOTE'],
+                                        converters=[parse_int, passthrough],
+                                        shard_size=128, processes=2, ordered=False)
+
+        self.assertEqual(sorted(self.expected()), sorted(reader))
+
+    def test_dialect_name(self):
+        reader = ShardedDelimitedReader(self.path, self.encoding, 'excel',
+                                        fields=['ID', 'NOTE'],
+                                        converters=[parse_int, passthrough],
+                                        shard_size=128, processes=2)
+
+        self.assertEqual(self.expected(), list(reader))
+
+
+class TestParallelZipReader(unittest.TestCase):
+    encoding = 'UTF-8'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dialect = MockDialect()
+        cls.members = {'b.csv': 'ID,NOTE\n3,c\n4,d\n', 'a.csv': 'ID,NOTE\n1,a\n2,b\n',
+                       'c.csv': 'ID,NOTE\n5,e\n'}
+        with NamedTemporaryFile(prefix='zipped_', suffix='.zip', delete=False) as tmp:
+            with zipfile.ZipFile(tmp.name, mode='w') as archive:
+                for name, content in cls.members.items():
+                    archive.writestr(name, content.encode(cls.encoding))
+            cls.path = tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.path):
+            os.unlink(cls.path)
+
+    def reader(self, **options):
+        return ParallelZipReader(self.path, list(self.members), self.encoding,
+                                 self.dialect, fields=['ID', 'NOTE'],
+                                 converters=[parse_int, passthrough],
+                                 processes=2, max_in_flight=2, **options)
+
+    def test_ordered(self):
+        expected = [(1, 'a'), (2, 'b'), (3, 'c'), (4, 'd'), (5, 'e')]
+        result = [tuple(record) for record in self.reader()]
+
+        self.assertEqual(expected, result)
+
+    def test_unordered_members(self):
+        members = {filename: [record.ID for record in records]
+                   for filename, records in self.reader(ordered=False).iter_members()}
+
+        expected = {'a.csv': [1, 2], 'b.csv': [3, 4], 'c.csv': [5]}
+
+        self.assertEqual(expected, members)
+
+
+class TestBoundedMap(unittest.TestCase):
+    def test_bounded_map(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for ordered in (True, False):
+                with self.subTest(ordered=ordered):
+                    results = list(bounded_map(executor, abs, [-3, 1, -2], 2, ordered))
+
+                    self.assertEqual([(-3, 3), (1, 1), (-2, 2)], sorted(
+                        results, key=lambda pair: [-3, 1, -2].index(pair[0])))
+                    if ordered:
+                        self.assertEqual([-3, 1, -2], [item for item, _ in results])
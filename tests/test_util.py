@@ -1,6 +1,6 @@
 import unittest
 
-from foil.util import natural_sort
+from foil.util import find_index, natural_sort
 
 
 class TestNaturalSort(unittest.TestCase):
@@ -11,3 +11,17 @@ class TestNaturalSort(unittest.TestCase):
         result = natural_sort(entries)
 
         self.assertEqual(expected, result)
+
+
+class TestFindIndex(unittest.TestCase):
+    def test_find_index(self):
+        header = ['NAME', 'CLASS', 'DATE', 'NAME']
+
+        expected = [2, 0]
+        result = find_index(header, ['DATE', 'NAME'])
+
+        self.assertEqual(expected, result)
+
+    def test_missing_item(self):
+        with self.assertRaises(ValueError):
+            find_index(['NAME'], ['DATE'])